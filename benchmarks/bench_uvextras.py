@@ -0,0 +1,281 @@
+"""Benchmarks of the overhead added by `uvextras` itself.
+
+A scripted fake `uv` is placed first on PATH so that results do not depend on the real `uv`, the network or the
+machine's Python installs. Its latency and the length of its `uv tool list` output are configurable.
+
+Usage:
+
+    python benchmarks/bench_uvextras.py [-o results.json] [--compare baseline.json]
+
+Results are written as JSON (to stdout by default) so runs for different commits can be compared.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+FAKE_UV = r'''#!/bin/sh
+# fake `uv` for benchmarks - see make_fake_uv()
+sleep "${FAKE_UV_LATENCY:-0}"
+
+case "$*" in
+    "python dir") echo "$FAKE_UV_HOME/python" ;;
+    "tool dir") echo "$FAKE_UV_HOME/tools" ;;
+    "cache dir") echo "$FAKE_UV_HOME/cache" ;;
+    "self version") echo "uv 0.0.0 (fake)" ;;
+    "version") echo "project 0.0.0" ;;
+    run*executable*) echo "$FAKE_UV_HOME/python/cpython-3.14/bin/python3" ;;
+    run*version*) echo "3.14.0" ;;
+    tree*) echo "project v0.0.0" ;;
+    python\ list*) echo "cpython-3.14.0-linux-x86_64-gnu    $FAKE_UV_HOME/python/cpython-3.14/bin/python3" ;;
+    tool\ list*)
+        i=0
+        while [ "$i" -lt "${FAKE_UV_TOOLS:-0}" ]; do
+            echo "tool-$i v1.0.$i ($FAKE_UV_HOME/tools/tool-$i)"
+            echo "- tool-$i ($HOME/.local/bin/tool-$i)"
+            i=$((i + 1))
+        done
+        ;;
+    run\ --script*) ;;
+    *) echo "fake uv: unsupported command: $*" >&2; exit 2 ;;
+esac
+'''
+
+
+def make_fake_uv(root: Path) -> Path:
+    bin_dir = root / 'bin'
+    bin_dir.mkdir(parents=True)
+    for d in ('python', 'tools', 'cache'):
+        (root / 'uv' / d).mkdir(parents=True)
+
+    uv = bin_dir / 'uv'
+    uv.write_text(FAKE_UV)
+    uv.chmod(0o755)
+
+    return bin_dir
+
+
+def make_project(root: Path, scripts: int, local_scripts: int, depends: int) -> Path:
+    """A project dir with a local config of scripts+depends entries and local_scripts files"""
+    local_dir = root / '.uvextras'
+    (local_dir / 'scripts').mkdir(parents=True)
+
+    lines = ['scripts:']
+    lines += ['  - name: noop', '    cmd: "true"', '    use-python: false']
+    for i in range(scripts):
+        lines += [f'  - name: script-{i}', f'    desc: generated script {i}', f'    cmd: echo {i}', '    use-python: false']
+        lines += ['    options:', f'      opt-{i}: value {i}']
+    for i in range(depends):
+        lines += [f'  - name: dep-{i}', '    cmd: "true"', '    use-python: false']
+    lines += ['  - name: chain', '    use-python: false', '    depends-on:']
+    lines += [f'    - dep-{i}' for i in range(depends)]
+    (local_dir / 'uvextras.yaml').write_text('\n'.join(lines) + '\n')
+
+    for i in range(local_scripts):
+        (local_dir / 'scripts' / f'local-{i}.py').write_text('')
+
+    return root
+
+
+def measure(fn: Callable[[], Any], repeat: int, setup: Callable[[], Any] = lambda: None) -> dict[str, Any]:
+    times = []
+    for _ in range(repeat):
+        setup()
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+
+    return {
+        'unit': 's',
+        'runs': repeat,
+        'min': min(times),
+        'median': statistics.median(times),
+        'mean': statistics.fmean(times),
+        'stdev': statistics.stdev(times) if len(times) > 1 else 0.0,
+    }
+
+
+class Bench:
+    def __init__(self, args: argparse.Namespace, root: Path) -> None:
+        self.args = args
+        self.root = root
+        self.bin_dir = make_fake_uv(root / 'fake')
+
+        self.small = make_project(root / 'small', scripts=5, local_scripts=5, depends=0)
+        self.large = make_project(root / 'large', scripts=args.scripts, local_scripts=5, depends=0)
+        self.many_files = make_project(root / 'many-files', scripts=0, local_scripts=args.scripts, depends=0)
+        self.deps = make_project(root / 'deps', scripts=0, local_scripts=0, depends=args.depends)
+
+        self.environ = dict(os.environ)
+        self.environ |= {
+            'PATH': f'{self.bin_dir}{os.pathsep}{os.environ["PATH"]}',
+            'FAKE_UV_HOME': str(root / 'fake' / 'uv'),
+            'FAKE_UV_LATENCY': str(args.latency),
+            'FAKE_UV_TOOLS': str(args.tools),
+            'PYTHONPATH': str(REPO_ROOT),
+            'UVEX_CACHE_DIR': str(root / 'cache'),
+        }
+        for name in list(self.environ):
+            if name.startswith(('UVEX_', 'UV_')) and name != 'UVEX_CACHE_DIR':
+                del self.environ[name]
+
+    def enter(self, project: Path) -> None:
+        """Reset the process state as if uvextras was started in project"""
+        import uvextras.config as config_module
+
+        os.chdir(project)
+        os.environ.clear()
+        os.environ.update(self.environ | {'PWD': str(project)})
+        config_module._uv_locations = None
+
+    def uvextras(self, project: Path, *args: str, cache: str = 'cache') -> Callable[[], None]:
+        env = self.environ | {'PWD': str(project), 'UVEX_CACHE_DIR': str(self.root / cache)}
+
+        def run() -> None:
+            subprocess.run([sys.executable, '-m', 'uvextras', *args], cwd=project, env=env, check=True, stdout=subprocess.DEVNULL)
+
+        return run
+
+    def run(self) -> dict[str, Any]:
+        from uvextras.cli import parse_args
+        from uvextras.commands import info, run
+        from uvextras.config import AppConfig, AppConfigEnvVarDict, load_config
+
+        repeat = self.args.repeat
+        results: dict[str, Any] = {}
+
+        # startup - a fresh cache dir each time vs a warm one
+        cold_dirs = iter(range(repeat))
+        results['startup_cold'] = measure(
+            lambda: self.uvextras(self.small, 'run', 'noop', cache=f'cold-{next(cold_dirs)}')(),
+            repeat,
+        )
+        warm = self.uvextras(self.small, 'run', 'noop')
+        warm()
+        results['startup_warm'] = measure(warm, repeat)
+
+        # config loading in-process
+        for name, project in (('small', self.small), ('large', self.large)):
+            results[f'load_config_{name}_parse'] = measure(lambda: load_config(refresh=True), repeat, lambda: self.enter(project))
+            self.enter(project)
+            load_config()
+            results[f'load_config_{name}_snapshot'] = measure(load_config, repeat, lambda: self.enter(project))
+
+        # merging a large local scripts dir
+        scripts_dir = str(self.many_files / '.uvextras' / 'scripts')
+        configs: list[AppConfig] = []
+
+        def fresh_config() -> None:
+            self.enter(self.many_files)
+            configs.append(AppConfig(AppConfigEnvVarDict(), {}))
+
+        results['merge_scripts_large'] = measure(lambda: configs[-1].merge_scripts(scripts_dir, 'bench'), repeat, fresh_config)
+
+        # info rendering with a long `uv tool list`
+        self.enter(self.small)
+        ctx = parse_args(['info', '--details', '--all'])
+        with contextlib.redirect_stdout(io.StringIO()):
+            results['info_details'] = measure(lambda: info.cmd(ctx), repeat, lambda: self.enter(self.small))
+
+        # per dependency overhead of run - excludes startup and config load
+        self.enter(self.deps)
+        ctx = parse_args(['run', 'chain'])
+        chain = ctx.config.find_script('chain')
+        assert chain is not None
+        per_graph = measure(lambda: run.exec_graph(ctx, run.build_graph(ctx, chain)), repeat)
+        results['run_per_dependency'] = {
+            k: v / max(self.args.depends, 1) if k in ('min', 'median', 'mean', 'stdev') else v for k, v in per_graph.items()
+        }
+
+        return results
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_ROOT, stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ''
+
+
+def compare(results: dict[str, Any], baseline: dict[str, Any], threshold: float) -> int:
+    """Print the median ratio of each benchmark to the baseline - returns the count of regressions"""
+    regressions = 0
+    print(f'{"benchmark":32} {"baseline":>12} {"current":>12} {"ratio":>8}', file=sys.stderr)
+    for name, result in results['results'].items():
+        base = baseline.get('results', {}).get(name)
+        if base is None:
+            print(f'{name:32} {"-":>12} {result["median"]:12.6f}', file=sys.stderr)
+            continue
+
+        ratio = result['median'] / base['median'] if base['median'] else float('inf')
+        flag = ''
+        if ratio > 1 + threshold:
+            regressions += 1
+            flag = '  REGRESSION'
+        print(f'{name:32} {base["median"]:12.6f} {result["median"]:12.6f} {ratio:8.2f}{flag}', file=sys.stderr)
+
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0], formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    parser.add_argument('-o', '--output', default=None, help='write results to this file instead of stdout')
+    parser.add_argument('-r', '--repeat', default=10, type=int, help='runs per benchmark')
+    parser.add_argument('--latency', default=0.0, type=float, help='seconds the fake uv sleeps per call')
+    parser.add_argument('--tools', default=500, type=int, help='number of tools in the fake `uv tool list`')
+    parser.add_argument('--scripts', default=1000, type=int, help='number of scripts in the large configs')
+    parser.add_argument('--depends', default=50, type=int, help='number of dependencies for run_per_dependency')
+    parser.add_argument('--compare', default=None, help='baseline results to compare with')
+    parser.add_argument('--threshold', default=0.1, type=float, help='median slow down reported as a regression')
+    args = parser.parse_args()
+
+    root = Path(tempfile.mkdtemp(prefix='uvextras-bench-'))
+    cwd = os.getcwd()
+    environ = dict(os.environ)
+    try:
+        results = Bench(args, root).run()
+    finally:
+        os.chdir(cwd)
+        os.environ.clear()
+        os.environ.update(environ)
+        shutil.rmtree(root, ignore_errors=True)
+
+    report = {
+        'meta': {
+            'commit': git_commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'params': vars(args),
+        },
+        'results': results,
+    }
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(text + '\n')
+    else:
+        print(text)
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(report, json.load(f), args.threshold)
+        sys.exit(1 if regressions else 0)
+
+
+if __name__ == '__main__':
+    main()
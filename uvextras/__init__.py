@@ -1 +1,15 @@
-from uvextras.__main__ import main as entrypoint  # noqa: F401
+import sys
+
+
+def entrypoint() -> None:
+    # a TAB press - answered without loading the CLI, see uvextras.completion
+    if sys.argv[1:2] == ['__complete']:
+        from uvextras.completion import main as complete
+
+        complete(sys.argv[2:])
+        return
+
+    # imported on demand so that importing a module of the package (e.g., the client) does not load the CLI
+    from uvextras.__main__ import main
+
+    main()
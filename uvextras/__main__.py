@@ -1,22 +1,33 @@
 import sys
-from typing import Mapping
+from importlib import import_module
+from typing import Mapping, Optional
 
+from uvextras import timings
 from uvextras.cli import parse_args
-from uvextras.commands import info, run
 from uvextras.commands.type import CommandType
+from uvextras.config import AppConfig
 
-cmd_map: Mapping[str, CommandType] = {
-    'info': info.cmd,
-    'run': run.cmd,
+# modules are imported on demand so a verb only pays for its own imports
+cmd_map: Mapping[str, str] = {
+    'completion': 'uvextras.commands.completion',
+    'info': 'uvextras.commands.info',
+    'run': 'uvextras.commands.run',
+    'serve': 'uvextras.commands.serve',
+    'stats': 'uvextras.commands.stats',
+    'warm': 'uvextras.commands.warm',
 }
 
 
-def main() -> None:
-    ctx = parse_args(args=sys.argv[1:])
-    ctx.log()
+def main(args: Optional[list[str]] = None, config: Optional[AppConfig] = None) -> None:
+    try:
+        ctx = parse_args(args=sys.argv[1:] if args is None else args, config=config)
+        ctx.log()
 
-    cmd = cmd_map[ctx.verb]
-    cmd(ctx)
+        cmd: CommandType = import_module(cmd_map[ctx.verb]).cmd
+        with timings.span(ctx.verb):
+            cmd(ctx)
+    finally:
+        timings.report()
 
 
 if __name__ == '__main__':
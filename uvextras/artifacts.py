@@ -0,0 +1,249 @@
+"""Content-addressed store of script outputs - shared between hosts that mount the same dir"""
+
+import fcntl
+import glob
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Iterator, Optional
+
+from uvextras import timings
+from uvextras.config import AppConfigScript
+from uvextras.context import AppContext
+from uvextras.state import expand_globs
+
+# the store is trimmed to this size after each save - $UVEX_ARTIFACT_CACHE_SIZE in MiB
+DEFAULT_MAX_MIB = 5 * 1024
+
+
+def artifact_key(script: AppConfigScript, args: list[str], script_path: Optional[Path], root: Optional[str] = None) -> str:
+    """What the outputs depend on - unlike the stamp it has no host specific paths, so it is the same on every host"""
+    digest = hashlib.sha256()
+    declaration = {
+        'cmd': script.cmd,
+        'options': script.options,
+        'env': script.env,
+        'shell': script.shell,
+        'use_python': script.use_python,
+        'args': args,
+    }
+    digest.update(json.dumps(declaration, sort_keys=True, default=str).encode('utf-8'))
+
+    for f in expand_globs(script.inputs, root):
+        digest.update(f.encode('utf-8') + b'\0')
+        digest.update(_file_digest(os.path.join(root or '', f)))
+
+    if script_path is not None:
+        digest.update(b'script\0' + _file_digest(str(script_path)))
+
+    return digest.hexdigest()
+
+
+def _file_digest(path: str) -> bytes:
+    try:
+        with open(path, 'rb') as f:
+            return hashlib.file_digest(f, 'sha256').digest()
+    except OSError:
+        return b'\0'
+
+
+def output_files(script: AppConfigScript, root: Optional[str] = None) -> list[str]:
+    """The files matching the outputs (relative to root) - including those in matching dirs"""
+    files = set()
+    for pattern in script.outputs:
+        for path in glob.glob(pattern, root_dir=root, recursive=True):
+            full = os.path.join(root or '', path)
+            if os.path.isdir(full):
+                for dir, _, names in os.walk(full):
+                    files |= {os.path.relpath(os.path.join(dir, n), root or '.') for n in names}
+            elif os.path.isfile(full):
+                files.add(os.path.normpath(path))
+    return sorted(files)
+
+
+class ArtifactStore:
+    """objects/ holds the files by sha256, manifests/ the files of each key.
+
+    Objects and manifests are written to tmp/ and renamed into place, so readers never see partial files. Saves and restores
+    hold a shared lock - eviction an exclusive one, so it does not remove objects that are in use.
+    """
+
+    def __init__(self, root: str | Path, max_bytes: int = DEFAULT_MAX_MIB * 1024 * 1024, link: bool = False) -> None:
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.link = link
+
+        for d in ('objects', 'manifests', 'tmp'):
+            (self.root / d).mkdir(parents=True, exist_ok=True)
+
+    @contextmanager
+    def _lock(self, exclusive: bool = False) -> Iterator[None]:
+        with open(self.root / 'lock', 'a') as f:
+            fcntl.flock(f, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _object(self, sha: str) -> Path:
+        return self.root / 'objects' / sha[:2] / sha
+
+    def _manifest(self, key: str) -> Path:
+        return self.root / 'manifests' / f'{key}.json'
+
+    def _tmp(self) -> Path:
+        # unique among all hosts sharing the store - and readable by all of its users
+        fd, path = tempfile.mkstemp(dir=self.root / 'tmp')
+        os.fchmod(fd, 0o644)
+        os.close(fd)
+        return Path(path)
+
+    def _add_object(self, path: str) -> dict[str, Any]:
+        """Copy path into the store - hashing it on the way"""
+        tmp = self._tmp()
+        digest = hashlib.sha256()
+        with open(path, 'rb') as src, open(tmp, 'wb') as dst:
+            while chunk := src.read(1024 * 1024):
+                digest.update(chunk)
+                dst.write(chunk)
+
+        sha = digest.hexdigest()
+        obj = self._object(sha)
+        if obj.exists():
+            tmp.unlink()
+        else:
+            # shared by all outputs with this content - and linked to by restores
+            os.chmod(tmp, 0o444)
+            obj.parent.mkdir(exist_ok=True)
+            os.replace(tmp, obj)
+
+        st = os.stat(path)
+        return {'sha256': sha, 'mode': st.st_mode & 0o777, 'size': st.st_size}
+
+    def save(self, key: str, files: list[str], root: Optional[str] = None) -> None:
+        with self._lock():
+            entries = [{'path': f} | self._add_object(os.path.join(root or '', f)) for f in files]
+            tmp = self._tmp()
+            tmp.write_text(json.dumps({'files': entries}))
+            os.replace(tmp, self._manifest(key))
+
+        self.evict()
+
+    def restore(self, key: str, root: Optional[str] = None) -> bool:
+        """Put the files saved for key back in place - False if there are none (or not all of them)"""
+        manifest = self._manifest(key)
+        with self._lock():
+            try:
+                entries = json.loads(manifest.read_text())['files']
+            except (OSError, ValueError, KeyError):
+                return False
+
+            if not all(self._object(e['sha256']).exists() for e in entries):
+                return False
+
+            for e in entries:
+                self._restore_file(self._object(e['sha256']), Path(root or '') / e['path'], e['mode'])
+
+            # the mtime of a manifest is its last use for eviction
+            os.utime(manifest)
+
+        return True
+
+    def _restore_file(self, obj: Path, dest: Path, mode: int) -> None:
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        dest.unlink(missing_ok=True)
+
+        # a link would let a write to dest change the object - only outputs as read-only as the object are linked
+        if self.link and os.stat(obj).st_mode & 0o777 == mode and not mode & 0o222:
+            try:
+                os.link(obj, dest)
+                return
+            except OSError as e:
+                # e.g., the store is on another file system
+                logging.debug(f'cannot link {dest}, copying: {e}')
+
+        tmp = dest.with_name(f'.{dest.name}.{os.getpid()}')
+        shutil.copyfile(obj, tmp)
+        os.chmod(tmp, mode)
+        os.replace(tmp, dest)
+
+    def evict(self) -> None:
+        """Remove the least recently used manifests, and the objects only they use, until the store fits max_bytes"""
+        with self._lock(exclusive=True):
+            sizes = {e.name: e.stat().st_size for d in os.scandir(self.root / 'objects') if d.is_dir() for e in os.scandir(d)}
+            total = sum(sizes.values())
+            if total <= self.max_bytes:
+                return
+
+            manifests = []
+            for e in os.scandir(self.root / 'manifests'):
+                try:
+                    shas = {f['sha256'] for f in json.loads(Path(e.path).read_text())['files']}
+                except (OSError, ValueError, KeyError):
+                    shas = set()
+                manifests.append((e.stat().st_mtime, e.path, shas))
+
+            refs = Counter(sha for _, _, shas in manifests for sha in shas)
+
+            def remove_object(sha: str) -> int:
+                self._object(sha).unlink(missing_ok=True)
+                return sizes.pop(sha, 0)
+
+            # objects of manifests that were never written - e.g., the save was interrupted
+            for sha in [sha for sha in sizes if refs[sha] == 0]:
+                total -= remove_object(sha)
+
+            for _, path, shas in sorted(manifests):
+                if total <= self.max_bytes:
+                    break
+                os.unlink(path)
+                for sha in shas:
+                    refs[sha] -= 1
+                    if refs[sha] == 0:
+                        total -= remove_object(sha)
+
+            # leftovers of writers that died
+            for e in os.scandir(self.root / 'tmp'):
+                os.unlink(e.path)
+
+
+def artifact_store(ctx: AppContext) -> Optional[ArtifactStore]:
+    """The store configured by `run --artifacts` (or $UVEX_ARTIFACT_CACHE) - None if there is none"""
+    if not ctx.artifacts:
+        return None
+
+    try:
+        max_mib = float(os.environ.get('UVEX_ARTIFACT_CACHE_SIZE', DEFAULT_MAX_MIB))
+    except ValueError:
+        logging.warning(f'ignoring $UVEX_ARTIFACT_CACHE_SIZE={os.environ["UVEX_ARTIFACT_CACHE_SIZE"]} - not a number of MiB')
+        max_mib = DEFAULT_MAX_MIB
+
+    try:
+        return ArtifactStore(ctx.artifacts, int(max_mib * 1024 * 1024), ctx.artifacts_link)
+    except OSError as e:
+        logging.warning(f'artifact cache {ctx.artifacts} is not usable: {e}')
+        return None
+
+
+def restore_outputs(store: ArtifactStore, key: str, script: AppConfigScript) -> bool:
+    try:
+        with timings.span(f'restore {script.name}', 'artifacts', key=key) as span:
+            span['restored'] = store.restore(key)
+        return span['restored']
+    except OSError as e:
+        logging.warning(f'could not restore the outputs of {script.name}: {e}')
+        return False
+
+
+def save_outputs(store: ArtifactStore, key: str, script: AppConfigScript) -> None:
+    try:
+        with timings.span(f'save {script.name}', 'artifacts', key=key):
+            store.save(key, output_files(script))
+    except OSError as e:
+        logging.warning(f'could not save the outputs of {script.name}: {e}')
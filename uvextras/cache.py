@@ -0,0 +1,65 @@
+"""Persistent on-disk caches shared between invocations"""
+
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, Optional
+
+
+def cache_dir() -> Path:
+    """The uvextras cache dir - $UVEX_CACHE_DIR, else $XDG_CACHE_HOME/uvextras"""
+    if 'UVEX_CACHE_DIR' in os.environ:
+        return Path(os.environ['UVEX_CACHE_DIR'])
+
+    xdg_cache = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return Path(xdg_cache) / 'uvextras'
+
+
+def file_stamp(path: Optional[str | Path]) -> Optional[list[int]]:
+    """(mtime_ns, size) of path or None if it does not exist"""
+    if not path:
+        return None
+
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+
+    return [st.st_mtime_ns, st.st_size]
+
+
+def cache_key(*parts: Any) -> str:
+    text = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def read_json(path: str | Path) -> Any:
+    """Returns the decoded content of path or None if missing or unreadable"""
+    try:
+        with open(path, 'rb') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def write_json(path: str | Path, data: Any) -> None:
+    """Atomically replaces path so concurrent readers never see a partial file.
+
+    Failures are logged and ignored - a cache must never break the command using it, e.g., data that JSON cannot encode.
+    """
+    import tempfile
+
+    path = Path(path)
+    tmp = None
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f'.{path.name}.', suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        os.replace(tmp, path)
+    except (OSError, TypeError, ValueError) as e:
+        logging.debug(f'could not write cache {path}: {e}')
+        if tmp is not None and os.path.exists(tmp):
+            os.unlink(tmp)
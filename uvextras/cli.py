@@ -2,37 +2,129 @@
 
 import argparse
 import os
+from typing import Optional
 
-from uvextras.config import UVEX_CONFIG, load_config
+from uvextras import timings
+from uvextras.config import UVEX_CONFIG, AppConfig, load_config
 from uvextras.context import AppContext
-from uvextras.stylize import replace_dir
+from uvextras.paths import replace_dir
 
 
-def parse_args(args: list[str]) -> AppContext:
-    config = load_config()
+def preparse_args(args: list[str]) -> argparse.Namespace:
+    """Parse the options that are needed before the config is loaded"""
+    parser = argparse.ArgumentParser(add_help=False, allow_abbrev=False)
+    parser.add_argument('--refresh', default=False, action='store_true')
+    parser.add_argument('--timings', default=False, action='store_true')
+    parser.add_argument('--trace', default=None)
+
+    pargs, _ = parser.parse_known_args(args=args)
+    return pargs
+
+
+def key_value(text: str) -> tuple[str, str]:
+    key, sep, value = text.partition('=')
+    if not key or not sep:
+        raise argparse.ArgumentTypeError(f'expected KEY=VALUE, got {text!r}')
+    return key, value
+
+
+def parse_args(args: list[str], config: Optional[AppConfig] = None) -> AppContext:
+    """Parse args - the config is loaded unless it is given, e.g., by `uvextras serve`"""
+    preargs = preparse_args(args)
+    if preargs.timings or preargs.trace:
+        timings.enable(trace_file=preargs.trace)
+
+    if config is None:
+        with timings.span('load config', refresh=preargs.refresh):
+            config = load_config(refresh=preargs.refresh)
+
+    with timings.span('parse args'):
+        return _parse_args(args, config)
+
+
+def _parse_args(args: list[str], config: AppConfig) -> AppContext:
     config_text = replace_dir(config.envvars[UVEX_CONFIG], os.environ['HOME'], '$HOME')
 
+    pargs = build_parser(config_text).parse_args(args=args)
+    ctx = AppContext(args=pargs, config=config)
+
+    return ctx
+
+
+def build_parser(config_text: str) -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(formatter_class=argparse.ArgumentDefaultsHelpFormatter)
     parser.add_argument('-f', '--file', default=config_text, help='path to the config file')
+    parser.add_argument('--refresh', default=False, action='store_true', help='bypass cached `uv` locations and config')
+    parser.add_argument('--timings', default=False, action='store_true', help='print the time spent in each phase ($UVEX_TIMINGS)')
+    parser.add_argument('--trace', default=None, metavar='FILE', help='write a Chrome trace of the phases to FILE ($UVEX_TRACE)')
+
+    verbs = parser.add_subparsers(title='verbs', required=True, dest='verb', metavar='(completion | info | run | serve | stats | warm)')
 
-    verbs = parser.add_subparsers(title='verbs', required=True, dest='verb', metavar='(info | run)')
+    completion_desc = 'print the shell completion script - e.g., `eval "$(uvextras completion bash)"`'
+    completion = verbs.add_parser(
+        'completion', description=completion_desc, help=completion_desc, formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+    completion.add_argument('shell', choices=['bash', 'zsh', 'fish'], help='shell to complete in')
 
     info_desc = 'show info about `uvextras` sub-system and `uv`'
     info = verbs.add_parser('info', description=info_desc, help=info_desc, formatter_class=argparse.ArgumentDefaultsHelpFormatter)
     info.add_argument('--all', default=False, action='store_true', help='show local and global scripts')
     info.add_argument('-d', '--details', default=False, action='store_true', help='show details')
+    info.add_argument('--format', default='table', choices=['table', 'json', 'yaml'], help='output format - json and yaml are machine-readable')
     info.add_argument('-i', '--info', default=False, action='store_true', help='hide info table')
     info.add_argument('-l', '--locations', default=False, action='store_true', help='hide locations')
     info.add_argument('-s', '--scripts', default=False, action='store_true', help='hide scripts')
+    info.add_argument('-t', '--timeout', default=30.0, type=float, help='seconds to wait for each `uv` probe')
+    # converted by argparse - only when `info` is parsed, and a bad value is a usage error
+    info.add_argument(
+        '--ttl', default=os.environ.get('UVEX_INFO_TTL', '300'), type=float, help='seconds to reuse `uv` probe results ($UVEX_INFO_TTL)'
+    )
     info.add_argument('-v', '--verbose', default=False, action='store_true', help='enable verbose output')
 
     run_desc = 'run script'
     run = verbs.add_parser('run', description=run_desc, help=run_desc, formatter_class=argparse.ArgumentDefaultsHelpFormatter)
     run.add_argument('script', default=None, help='name of script to execute')
+    run.add_argument('--force', default=False, action='store_true', help='run scripts even if they are up to date')
+    run.add_argument(
+        '--artifacts', default=os.environ.get('UVEX_ARTIFACT_CACHE'), metavar='DIR', help='restore and save script outputs in DIR ($UVEX_ARTIFACT_CACHE)'
+    )
+    run.add_argument('--artifacts-link', default=False, action='store_true', help='restore read-only outputs as hard links instead of copies')
+    run.add_argument('-e', '--each', default=False, action='store_true', help='run the script in each uv workspace member')
+    run.add_argument(
+        '--no-history', dest='history', default=argparse.SUPPRESS, action='store_false',
+        help='do not record the runs for `uvextras stats` in a project with a `.uvextras` dir ($UVEX_HISTORY=0)',
+    )
+    run.add_argument(
+        '-j', '--jobs', default=argparse.SUPPRESS, type=int,
+        help='number of independent scripts (members with --each) to run in parallel (default: 1, the CPU count with --each)',
+    )
+    run.add_argument(
+        '-r', '--resource', dest='resources', default=argparse.SUPPRESS, action='append', type=key_value, metavar='KEY=VALUE',
+        help='resource setting overriding those of the config for all scripts, e.g., nice=19 (repeatable)',
+    )
+    run.add_argument('-w', '--watch', default=False, action='store_true', help='run again when watched files change')
+    run.add_argument('--debounce', default=0.2, type=float, help='seconds without changes before a watch runs again')
     run.add_argument('-v', '--verbose', default=False, action='store_true', help='enable verbose output')
     run.add_argument('args', nargs='*')
 
-    pargs = parser.parse_args(args=args)
-    ctx = AppContext(args=pargs, config=config)
+    serve_desc = 'keep the config warm and run the commands sent by `uvextras-client`'
+    serve = verbs.add_parser('serve', description=serve_desc, help=serve_desc, formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    serve.add_argument('--socket', default=None, help='path of the Unix socket to listen on (default: $UVEX_SOCKET or in $XDG_RUNTIME_DIR)')
+    serve.add_argument('-v', '--verbose', default=False, action='store_true', help='enable verbose output')
 
-    return ctx
+    stats_desc = 'show the run times of scripts recorded by `uvextras run` and flag regressions'
+    stats = verbs.add_parser('stats', description=stats_desc, help=stats_desc, formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    stats.add_argument('names', nargs='*', metavar='script', help='scripts to show (default: all recorded scripts)')
+    stats.add_argument('-n', '--window', default=10, type=int, help='number of recent runs compared with the runs before them')
+    stats.add_argument('-t', '--threshold', default=20.0, type=float, help='percent the recent p50 may exceed the earlier one before it is flagged')
+    stats.add_argument('-v', '--verbose', default=False, action='store_true', help='enable verbose output')
+
+    warm_desc = 'build the environments of python scripts ahead of their first run'
+    warm = verbs.add_parser('warm', description=warm_desc, help=warm_desc, formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    warm.add_argument('names', nargs='*', metavar='script', help='scripts to warm (default: all python scripts)')
+    warm.add_argument('-j', '--jobs', default=4, type=int, help='number of environments to build in parallel')
+    warm.add_argument('--lock', default=False, action='store_true', help='also lock each script (`uv lock --script`)')
+    warm.add_argument('-t', '--timeout', default=600.0, type=float, help='seconds to wait for each `uv` command')
+    warm.add_argument('-v', '--verbose', default=False, action='store_true', help='enable verbose output')
+
+    return parser
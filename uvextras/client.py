@@ -0,0 +1,104 @@
+"""Thin client of `uvextras serve` - forwards argv, CWD and env over a Unix socket and returns the exit status.
+
+Only the standard library is imported so that a call costs little more than the interpreter startup. When no server is
+listening the command is run in-process instead.
+"""
+
+import json
+import os
+import signal
+import socket
+import struct
+import sys
+from typing import Optional
+
+# The client sends a header with the fds of its stdin, stdout and stderr then a JSON request of the header length.
+# While the command runs the client sends the numbers of the signals it receives and the server replies the exit code.
+HEADER = struct.Struct('!I')
+INT = struct.Struct('!i')
+
+FORWARDED_SIGNALS = (signal.SIGINT, signal.SIGTERM, signal.SIGHUP)
+
+
+def socket_path() -> str:
+    """$UVEX_SOCKET, else in $XDG_RUNTIME_DIR, else in the uvextras cache dir"""
+    if 'UVEX_SOCKET' in os.environ:
+        return os.environ['UVEX_SOCKET']
+
+    if os.environ.get('XDG_RUNTIME_DIR'):
+        return os.path.join(os.environ['XDG_RUNTIME_DIR'], 'uvextras.sock')
+
+    # same as uvextras.cache.cache_dir() - not imported to keep the client light
+    if 'UVEX_CACHE_DIR' in os.environ:
+        return os.path.join(os.environ['UVEX_CACHE_DIR'], 'serve.sock')
+
+    xdg_cache = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(xdg_cache, 'uvextras', 'serve.sock')
+
+
+def recv_exact(sock: socket.socket, size: int) -> bytes:
+    """size bytes from sock - fewer only if the peer closed the connection"""
+    data = b''
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            break
+        data += chunk
+    return data
+
+
+def std_fds() -> list[int]:
+    """stdin, stdout and stderr - with /dev/null in place of closed ones as they cannot be sent"""
+    fds = []
+    for fd in (0, 1, 2):
+        try:
+            os.fstat(fd)
+            fds.append(fd)
+        except OSError:
+            fds.append(os.open(os.devnull, os.O_RDWR))
+    return fds
+
+
+def request(args: list[str], path: Optional[str] = None) -> Optional[int]:
+    """Run `uvextras args` in the server - returns its exit code or None if no server is listening"""
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(path or socket_path())
+    except OSError:
+        sock.close()
+        return None
+
+    with sock:
+        body = json.dumps({'argv': args, 'cwd': os.getcwd(), 'env': dict(os.environ)}).encode('utf-8')
+        socket.send_fds(sock, [HEADER.pack(len(body))], std_fds())
+        sock.sendall(body)
+
+        # the command does not run in this process group - pass on what the terminal sends to it
+        def forward(signum: int, _frame) -> None:
+            sock.sendall(INT.pack(signum))
+
+        for signum in FORWARDED_SIGNALS:
+            signal.signal(signum, forward)
+
+        reply = recv_exact(sock, INT.size)
+
+    if len(reply) < INT.size:
+        print('uvextras-client: the server closed the connection', file=sys.stderr)
+        return 1
+
+    return INT.unpack(reply)[0]
+
+
+def main() -> None:
+    rc = request(sys.argv[1:])
+    if rc is None:
+        from uvextras.__main__ import main as uvextras_main
+
+        uvextras_main()
+        return
+
+    sys.exit(rc)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,6 @@
+from uvextras.completion import script
+from uvextras.context import AppContext
+
+
+def cmd(ctx: AppContext) -> None:
+    print(script(ctx.shell), end='')
@@ -0,0 +1,173 @@
+"""`uvextras run --each` - a script run in every uv workspace member, with the config loaded once"""
+
+import logging
+import os
+import selectors
+import signal
+import sys
+import time
+import traceback
+from dataclasses import dataclass
+from pathlib import Path
+from typing import NoReturn, Optional
+
+from uvextras.commands.run import build_graph, exec_graph
+from uvextras.config import AppConfigScript, member_config
+from uvextras.context import AppContext
+from uvextras.workspace import workspace_members, workspace_root
+
+
+@dataclass
+class MemberResult:
+    name: str
+    rc: Optional[int] = None
+    seconds: float = 0.0
+
+
+@dataclass
+class _Running:
+    result: MemberResult
+    pid: int
+    start: float
+    pending: bytes = b''
+
+
+def run_member(ctx: AppContext, script: AppConfigScript, dir: Path) -> NoReturn:
+    """Run the script graph in dir with the config of that member - in a forked process, exits with the script"""
+    rc = 1
+    try:
+        os.chdir(dir)
+        os.environ['PWD'] = str(dir)
+
+        # members run in parallel - the scripts of each one run in order
+        ctx.args.jobs = 1
+        member_ctx = AppContext(ctx.args, member_config(ctx.config))
+        rc = exec_graph(member_ctx, build_graph(member_ctx, member_ctx.config.find_script(script.name) or script), final=script.name)
+    except SystemExit as e:
+        rc = e.code if isinstance(e.code, int) else 1
+    except KeyboardInterrupt:
+        rc = 130
+    except BaseException:
+        traceback.print_exc()
+    finally:
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os._exit(rc)
+
+
+def fork_member(ctx: AppContext, script: AppConfigScript, dir: Path) -> tuple[int, int]:
+    """(pid, fd of its combined stdout and stderr)"""
+    r, w = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.close(r)
+        devnull = os.open(os.devnull, os.O_RDONLY)
+        os.dup2(devnull, 0)
+        os.dup2(w, 1)
+        os.dup2(w, 2)
+        os.close(w)
+        os.close(devnull)
+        run_member(ctx, script, dir)
+
+    os.close(w)
+    return pid, r
+
+
+def write_lines(prefix: bytes, data: bytes) -> None:
+    out = sys.stdout.buffer
+    for line in data.splitlines(keepends=True):
+        out.write(prefix + line + (b'' if line.endswith(b'\n') else b'\n'))
+    out.flush()
+
+
+def run_each(ctx: AppContext, script: AppConfigScript) -> int:
+    """Run script in every member - ctx.jobs at a time, their output prefixed with the member name"""
+    # a cycle is reported once rather than by every member
+    build_graph(ctx, script).prepare()
+
+    root = workspace_root(Path.cwd())
+    if root is None:
+        logging.error('No uv workspace found - `run --each` needs `[tool.uv.workspace]` in a pyproject.toml.')
+        return 1
+
+    members = workspace_members(root)
+    names = {m: str(m.relative_to(root)) for m in members}
+    width = max((len(n) for n in names.values()), default=0)
+    results = [MemberResult(names[m]) for m in members]
+
+    pending = list(zip(members, results))
+    running: dict[int, _Running] = {}
+    sel = selectors.DefaultSelector()
+    sys.stdout.flush()
+
+    try:
+        while pending or running:
+            while pending and len(running) < max(ctx.jobs, 1):
+                dir, result = pending.pop(0)
+                pid, fd = fork_member(ctx, script, dir)
+                running[fd] = _Running(result, pid, time.monotonic())
+                sel.register(fd, selectors.EVENT_READ)
+
+            for key, _ in sel.select():
+                fd = key.fd
+                member = running[fd]
+                prefix = f'{member.result.name:<{width}} | '.encode()
+                data = os.read(fd, 64 * 1024)
+                if data:
+                    # only whole lines so that those of the members do not interleave
+                    complete, newline, member.pending = (member.pending + data).rpartition(b'\n')
+                    if newline:
+                        write_lines(prefix, complete + newline)
+                    continue
+
+                if member.pending:
+                    write_lines(prefix, member.pending)
+                sel.unregister(fd)
+                os.close(fd)
+                del running[fd]
+
+                _, status = os.waitpid(member.pid, 0)
+                # negative for a member killed by a signal - as the shell reports it
+                rc = os.waitstatus_to_exitcode(status)
+                member.result.rc = rc if rc >= 0 else 128 - rc
+                member.result.seconds = time.monotonic() - member.start
+    except KeyboardInterrupt:
+        # the members are in the same process group - they got the SIGINT too
+        for member in running.values():
+            try:
+                os.kill(member.pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+            os.waitpid(member.pid, 0)
+            member.result.rc = 130
+        print_results(results)
+        return 130
+
+    print_results(results)
+
+    # the exit code of the first member that failed
+    return next((r.rc for r in results if r.rc), 0)
+
+
+def print_results(results: list[MemberResult]) -> None:
+    from rich import box
+    from rich.console import Console
+    from rich.table import Table
+    from rich.text import Text
+
+    from uvextras.stylize import STYLE_CHECKMARK, STYLE_FAILED, STYLE_SCRIPT_NAME, STYLE_UNAVAILABLE
+
+    table = Table(title='Members', title_justify='left', box=box.ROUNDED)
+    table.add_column('Member', style=STYLE_SCRIPT_NAME)
+    table.add_column('Exit', justify='right')
+    table.add_column('Time', justify='right')
+
+    for r in results:
+        if r.rc is None:
+            table.add_row(r.name, Text('not run', style=STYLE_UNAVAILABLE), '')
+        else:
+            table.add_row(r.name, Text(str(r.rc), style=STYLE_CHECKMARK if r.rc == 0 else STYLE_FAILED), f'{r.seconds:.1f}s')
+
+    console = Console()
+    console.print()
+    console.print(table)
@@ -1,201 +1,247 @@
+import json
 import logging
 import os
+import shutil
+import subprocess
 import sys
-from functools import partial
-from typing import Mapping
-
-from rich import box
-from rich.console import Console, Group
-from rich.table import Table
-from rich.text import Text
-
-from uvextras.config import (
-    UV_PYTHON_INSTALL_DIR,
-    UV_TOOL_DIR,
-    UVEX_HOME,
-    UVEX_LOCALDIR,
-    UVEX_LOCALSCRIPTS,
-    UVEX_SCRIPTS
-)
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import IO, Any, Mapping, Optional
+
+from uvextras import timings
+from uvextras.cache import cache_dir, cache_key, file_stamp, read_json, write_json
 from uvextras.context import AppContext
 from uvextras.shell import shell_cli_output
-from uvextras.stylize import (
-    STYLE_CHECKMARK,
-    STYLE_ENV_VAR,
-    STYLE_HIGHLIGHT,
-    STYLE_KEYWORD,
-    STYLE_SCRIPT_LOCAL_NAME,
-    STYLE_SCRIPT_NAME,
-    STYLE_UV_KEY,
-    STYLE_UV_SEC,
-    RichRenderable,
-    checkmark_if,
-    highlight_envvar_name,
-    stylize_dirs_from_ev
-)
-
-locations = [
-    # These are in priority order -> more specific to less specific
-    UVEX_LOCALSCRIPTS,
-    UVEX_LOCALDIR,
-    UVEX_SCRIPTS,
-    UVEX_HOME,
-    UV_TOOL_DIR,
-    UV_PYTHON_INSTALL_DIR,
-]
-
-_stylize_dirs_with_ev = partial(stylize_dirs_from_ev, binds=locations)
-
-
-def uv_info(ctx: AppContext) -> Mapping[str, Mapping[str, RichRenderable]]:
+
+
+@dataclass
+class Probe:
+    cmd: str
+    details: bool = False
+    redirect_stderr: bool = False
+
+
+probes: Mapping[str, Probe] = {
+    'project_version': Probe('unset VIRTUAL_ENV;uv version'),
+    'project_python_version': Probe("unset VIRTUAL_ENV;uv run python -c 'import sys; print(sys.version.split()[0])'"),
+    'project_python_location': Probe("unset VIRTUAL_ENV;uv run python -c 'import sys; print(sys.executable)'"),
+    'project_dependencies': Probe('unset VIRTUAL_ENV;uv tree --all-groups --depth 1', details=True),
+    'uv_version': Probe('uv self version'),
+    'uv_cache_dir': Probe('uv cache dir'),
+    'uv_python_list': Probe('uv python list --only-installed --managed-python', details=True, redirect_stderr=True),
+    'uv_tool_list': Probe('uv tool list --show-paths', details=True, redirect_stderr=True),
+}
+
+
+# seconds a failed probe is cached - it may have timed out under load, so it is probed again soon
+FAILED_TTL = 10.0
+
+
+def run_probe(probe: Probe, timeout: float) -> Optional[str]:
+    try:
+        return shell_cli_output(probe.cmd, redirect_stderr=probe.redirect_stderr, timeout=timeout)
+    except (subprocess.SubprocessError, OSError) as e:
+        logging.debug(f'probe failed: {e}')
+        return None
+
+
+def probes_key(ctx: AppContext) -> str:
+    """What the probe results depend on - the uv binary, its python and tool dirs and the project in the CWD"""
+    uv = shutil.which('uv')
+    return cache_key(
+        uv,
+        file_stamp(uv),
+        file_stamp(ctx.config.uv_py_dir),
+        file_stamp(ctx.config.uv_tool_dir),
+        [file_stamp(f) for f in ('pyproject.toml', 'uv.lock', '.venv', '.venv/pyvenv.cfg')],
+        sorted((k, v) for k, v in os.environ.items() if k.startswith('UV_') or k == 'VIRTUAL_ENV'),
+    )
+
+
+def collect_probes(ctx: AppContext) -> dict[str, Optional[str]]:
+    """Run the probes concurrently - the cost is that of the slowest probe rather than the sum of them.
+
+    Results are cached for ctx.ttl seconds (failures for at most FAILED_TTL) unless what they depend on changes - see probes_key().
+    """
+    selected = {k: p for k, p in probes.items() if ctx.details or not p.details}
+
+    cache_file = cache_dir() / 'info' / f'{cache_key(os.getcwd())}.json'
+    key = probes_key(ctx) if ctx.ttl > 0 else None
+
+    entries: dict[str, Any] = {}
+    if key is not None and not ctx.refresh:
+        cached = read_json(cache_file)
+        if isinstance(cached, dict) and cached.get('key') == key:
+            now = time.time()
+            failed_ttl = min(ctx.ttl, FAILED_TTL)
+            entries = {k: e for k, e in cached['results'].items() if now - e['time'] < (ctx.ttl if e['value'] is not None else failed_ttl)}
+
+    results = {k: entries[k]['value'] for k in selected if k in entries}
+    missing = {k: p for k, p in selected.items() if k not in results}
+    if missing:
+        with timings.span('collect probes', count=len(missing)), ThreadPoolExecutor(max_workers=len(missing)) as pool:
+            futures = {k: pool.submit(run_probe, p, ctx.timeout) for k, p in missing.items()}
+        results |= {k: f.result() for k, f in futures.items()}
+
+        if key is not None:
+            # failures are cached too, for a short while - e.g., the project probes outside of a project
+            now = time.time()
+            entries |= {k: {'time': now, 'value': results[k]} for k in missing}
+            write_json(cache_file, {'key': key, 'results': entries})
+
+    return {k: results[k] for k in selected}
+
+
+def relative_paths(ctx: AppContext, key: str, paths: str | list[str] | None) -> dict[str, Any]:
+    """The path(s) as key and with the locations replaced by their $ENVVAR as key_relative"""
+    if isinstance(paths, list):
+        relative: Any = list(ctx.path_rewriter.lines(paths))
+    else:
+        relative = ctx.path_rewriter(paths) if paths is not None else None
+    return {key: paths, f'{key}_relative': relative}
+
+
+def info_data(ctx: AppContext, results: Mapping[str, Optional[str]]) -> dict[str, dict[str, Any]]:
+    def lines(key: str) -> Optional[list[str]]:
+        result = results[key]
+        return result.splitlines() if result is not None else None
+
+    def realpath(key: str) -> Optional[str]:
+        result = results[key]
+        return os.path.realpath(result) if result is not None else None
+
     project = {
-        'Version': shell_cli_output('unset VIRTUAL_ENV;uv version'),
-        'Python Version': shell_cli_output("unset VIRTUAL_ENV;uv run python -c 'import sys; print(sys.version.split()[0])'"),
-        'Python Location': _stylize_dirs_with_ev(
-            ctx,
-            os.path.realpath(
-                shell_cli_output("unset VIRTUAL_ENV;uv run python -c 'import sys; print(sys.executable)'"),
-            ),
-        ),
+        'version': results['project_version'],
+        'python_version': results['project_python_version'],
+        **relative_paths(ctx, 'python_location', realpath('project_python_location')),
     }
 
     if ctx.details:
-        project |= {
-            'Dependencies': shell_cli_output('unset VIRTUAL_ENV;uv tree --all-groups --depth 1'),
-        }
+        project['dependencies'] = lines('project_dependencies')
 
     uv = {
-        'Version': shell_cli_output('uv self version'),
-        'Cache Dir': _stylize_dirs_with_ev(ctx, shell_cli_output('uv cache dir')),
-        'Python Install Dir': _stylize_dirs_with_ev(ctx, ctx.config.uv_py_dir),
-        'Tool Dir': _stylize_dirs_with_ev(ctx, ctx.config.uv_tool_dir),
+        'version': results['uv_version'],
+        **relative_paths(ctx, 'cache_dir', results['uv_cache_dir']),
+        **relative_paths(ctx, 'python_install_dir', ctx.config.uv_py_dir),
+        **relative_paths(ctx, 'tool_dir', ctx.config.uv_tool_dir),
     }
 
     if ctx.details:
-        py_vers = shell_cli_output('uv python list --only-installed --managed-python', redirect_stderr=True)
-        uv_python_vers = [_stylize_dirs_with_ev(ctx, ln) for ln in py_vers.splitlines()]
-
-        uv |= {
-            'Python Version(s) Installed': Group(*uv_python_vers),
-            'Tool(s) Installed': _stylize_dirs_with_ev(ctx, shell_cli_output('uv tool list --show-paths', redirect_stderr=True)),
-        }
+        uv |= relative_paths(ctx, 'python_list', lines('uv_python_list'))
+        uv |= relative_paths(ctx, 'tool_list', lines('uv_tool_list'))
 
     uvextras = {
-        'Version': '0.1.0',
-        'Python Version': sys.version.split()[0],
-        'Python Location': _stylize_dirs_with_ev(ctx, os.path.realpath(sys.executable)),
+        'version': '0.1.0',
+        'python_version': sys.version.split()[0],
+        **relative_paths(ctx, 'python_location', os.path.realpath(sys.executable)),
     }
 
     return {
         'uv': uv,
         'uvextras': uvextras,
-        'Project': project,
+        'project': project,
     }
 
 
-def print_locations(ctx: AppContext, console: Console) -> None:
-    console.print()
+def locations_data(ctx: AppContext) -> list[dict[str, Any]]:
+    ctx.config.envvars.resolve_all()
 
-    table = Table(title='Locations', title_justify='left', show_lines=True, box=box.ROUNDED)
+    return [
+        {'bind': ev.bind, 'name': ev.name, 'set_in_env': ev.set_in_env, **relative_paths(ctx, 'path', ctx.config.envvars[ev.bind])}
+        for ev in ctx.config.envvars.envvars
+    ]
 
-    table.add_column('Item', style=STYLE_ENV_VAR)
 
-    if ctx.details:
-        table.add_column('Override', STYLE_KEYWORD)
-
-    table.add_column('Path')
-
-    for ev in ctx.config.envvars.envvars:
-        loc = ev.bind
-
-        if ctx.details:
-            table.add_row(
-                loc,
-                highlight_envvar_name(
-                    ev.name,
-                    ev.set_in_env,
-                    style_if_not_set=f'{STYLE_KEYWORD} not bold dim',
-                    highlight_if_set=f'default {STYLE_KEYWORD} bold on wheat1',
-                ),
-                _stylize_dirs_with_ev(ctx, ctx.config.envvars[loc]),
-            )
-        else:
-            table.add_row(loc, _stylize_dirs_with_ev(ctx, ctx.config.envvars[loc]))
-
-    console.print(table)
+def scripts_data(ctx: AppContext) -> list[dict[str, Any]]:
+    scripts = list(ctx.config.scripts.values())
+    if not ctx.all:
+        scripts = [s for s in scripts if s.is_local]
 
+    return [
+        {
+            'name': s.name,
+            'desc': s.desc,
+            'depends_on': s.depends_on,
+            'cmd': s.cmd,
+            'is_local': s.is_local,
+            'use_python': s.use_python,
+            'shell': s.shell,
+            **relative_paths(ctx, 'path', str(s.path(ctx.config.envvars)) if s.use_python else None),
+            'options': s.options,
+            'env': s.env,
+            'inputs': s.inputs,
+            'outputs': s.outputs,
+            'watch': s.watch,
+            'resources': s.resources,
+        }
+        for s in sorted(scripts, key=lambda s: s.name)
+    ]
 
-def print_scripts(ctx: AppContext, console: Console) -> None:
-    console.print()
 
-    table = Table(title='Scripts', title_justify='left', show_lines=True, box=box.ROUNDED)
+class SectionWriter:
+    """Writes one top level mapping section by section - each is flushed as soon as it is ready"""
 
-    table.add_column('Name', style=STYLE_SCRIPT_NAME)
-    table.add_column('Depends')
-    table.add_column('Desc')
-    table.add_column('Local', justify='center', style=STYLE_CHECKMARK)
+    def __init__(self, format: str, file: IO[str]) -> None:
+        self.format = format
+        self.file = file
+        self._count = 0
 
-    if ctx.details:
-        table.add_column('Cmd')
+    def write(self, name: str, data: Any) -> None:
+        if self.format == 'json':
+            prefix = '{' if self._count == 0 else ','
+            self.file.write(f'{prefix}\n  {json.dumps(name)}: {json.dumps(data, default=str)}')
+        else:
+            from yaml import dump
 
-    table.add_column('Python ', justify='center', style=STYLE_CHECKMARK)
+            try:
+                from yaml import CSafeDumper as Dumper
+            except ImportError:
+                from yaml import SafeDumper as Dumper  # type: ignore[assignment]
 
-    if ctx.details:
-        table.add_column('Path')
-        table.add_column('Options')
+            self.file.write(dump({name: data}, Dumper=Dumper, sort_keys=False, default_flow_style=False))
 
-    scripts = ctx.config.scripts
-    if not ctx.all:
-        scripts = [s for s in scripts if s.is_local]
+        self._count += 1
+        self.file.flush()
 
-    for s in sorted(scripts, key=lambda s: s.name):
-        name = Text(s.name, style=STYLE_SCRIPT_LOCAL_NAME) if s.is_local else s.name
-        depends = Text('\n'.join(s.depends_on), style=STYLE_HIGHLIGHT) if s.depends_on else ''
-
-        if ctx.details:
-            script_path = _stylize_dirs_with_ev(ctx=ctx, text=str(s.path(ctx.config.envvars))) if s.use_python else ''
-            options = '\n--'.join(s.options_str.split(' --'))
-            if s.env:
-                options += '\n\nEnv Vars:'
-                for e in  s.env:
-                    options += f'\n${e}={s.env[e]}'
-                options = _stylize_dirs_with_ev(ctx=ctx, text=options)
-            table.add_row(name, depends, s.desc, checkmark_if(s.is_local), s.cmd, checkmark_if(s.use_python), script_path, options)
-        else:
-            table.add_row(name, depends, s.desc, checkmark_if(s.is_local), checkmark_if(s.use_python))
+    def close(self) -> None:
+        if self.format == 'json':
+            self.file.write('\n}\n' if self._count else '{}\n')
+            self.file.flush()
 
-    console.print(table)
 
+def print_data(ctx: AppContext, file: IO[str] = sys.stdout) -> None:
+    """The sections as json or yaml - without building any rich renderables"""
+    writer = SectionWriter(ctx.format, file)
 
-def print_uv_table(map: Mapping[str, Mapping[str, RichRenderable]], console: Console) -> None:
-    console.print()
+    # bind the locations before the probes read some of them from another thread
+    ctx.config.envvars.resolve_all()
 
-    table = Table(title='Info', title_justify='left', show_lines=True, box=box.ROUNDED)
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        # the probes are the slow part - the other sections are written while they run
+        probes_future = pool.submit(collect_probes, ctx) if not ctx.hide_uv else None
 
-    table.add_column('Item', style=STYLE_UV_KEY)
-    table.add_column('Value')
+        if not ctx.hide_locations:
+            writer.write('locations', locations_data(ctx))
 
-    for s, m in map.items():
-        table.add_row(Text(s.upper(), style=STYLE_UV_SEC), end_section=True)
+        if not ctx.hide_scripts:
+            writer.write('scripts', scripts_data(ctx))
 
-        for k, v in m.items():
-            table.add_row('  ' + k, v)
+        if probes_future is not None:
+            writer.write('info', info_data(ctx, probes_future.result()))
 
-    console.print(table)
+    writer.close()
 
 
 def cmd(ctx: AppContext) -> None:
     logging.debug('starting...')
 
-    console = Console()
-
-    if not ctx.hide_uv:
-        print_uv_table(uv_info(ctx), console)
-
-    if not ctx.hide_locations:
-        print_locations(ctx, console)
+    if ctx.format == 'table':
+        from uvextras.commands.info_tables import print_tables
 
-    if not ctx.hide_scripts:
-        print_scripts(ctx, console)
+        print_tables(ctx)
+    else:
+        with timings.span(f'render {ctx.format}', 'render'):
+            print_data(ctx)
 
     logging.debug('done.')
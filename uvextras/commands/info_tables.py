@@ -0,0 +1,189 @@
+"""The rich tables of `uvextras info` - the default format"""
+
+import os
+import sys
+from typing import Callable, Mapping
+
+from rich import box
+from rich.console import Console, Group
+from rich.table import Table
+from rich.text import Text
+
+from uvextras import timings
+from uvextras.commands.info import collect_probes
+from uvextras.context import AppContext
+from uvextras.stylize import (
+    STYLE_CHECKMARK,
+    STYLE_ENV_VAR,
+    STYLE_HIGHLIGHT,
+    STYLE_KEYWORD,
+    STYLE_SCRIPT_LOCAL_NAME,
+    STYLE_SCRIPT_NAME,
+    STYLE_UNAVAILABLE,
+    STYLE_UV_KEY,
+    STYLE_UV_SEC,
+    RichRenderable,
+    checkmark_if,
+    highlight_envvar_name,
+    stylize_dirs_from_ev
+)
+
+
+def uv_info(ctx: AppContext) -> Mapping[str, Mapping[str, RichRenderable]]:
+    results = collect_probes(ctx)
+
+    def value(key: str, stylize: Callable[[str], RichRenderable] = str) -> RichRenderable:
+        result = results[key]
+        return stylize(result) if result is not None else Text('unavailable', style=STYLE_UNAVAILABLE)
+
+    def dirs(text: str) -> RichRenderable:
+        return stylize_dirs_from_ev(ctx, text)
+
+    def lines(text: str) -> RichRenderable:
+        return Group(*[stylize_dirs_from_ev(ctx, ln) for ln in text.splitlines()])
+
+    project = {
+        'Version': value('project_version'),
+        'Python Version': value('project_python_version'),
+        'Python Location': value('project_python_location', lambda text: dirs(os.path.realpath(text))),
+    }
+
+    if ctx.details:
+        project |= {
+            'Dependencies': value('project_dependencies'),
+        }
+
+    uv = {
+        'Version': value('uv_version'),
+        'Cache Dir': value('uv_cache_dir', dirs),
+        'Python Install Dir': dirs(ctx.config.uv_py_dir),
+        'Tool Dir': dirs(ctx.config.uv_tool_dir),
+    }
+
+    if ctx.details:
+        uv |= {
+            'Python Version(s) Installed': value('uv_python_list', lines),
+            'Tool(s) Installed': value('uv_tool_list', dirs),
+        }
+
+    uvextras = {
+        'Version': '0.1.0',
+        'Python Version': sys.version.split()[0],
+        'Python Location': dirs(os.path.realpath(sys.executable)),
+    }
+
+    return {
+        'uv': uv,
+        'uvextras': uvextras,
+        'Project': project,
+    }
+
+
+def print_locations(ctx: AppContext, console: Console) -> None:
+    console.print()
+
+    table = Table(title='Locations', title_justify='left', show_lines=True, box=box.ROUNDED)
+
+    table.add_column('Item', style=STYLE_ENV_VAR)
+
+    if ctx.details:
+        table.add_column('Override', STYLE_KEYWORD)
+
+    table.add_column('Path')
+
+    ctx.config.envvars.resolve_all()
+
+    for ev in ctx.config.envvars.envvars:
+        loc = ev.bind
+
+        if ctx.details:
+            table.add_row(
+                loc,
+                highlight_envvar_name(
+                    ev.name,
+                    ev.set_in_env,
+                    style_if_not_set=f'{STYLE_KEYWORD} not bold dim',
+                    highlight_if_set=f'default {STYLE_KEYWORD} bold on wheat1',
+                ),
+                stylize_dirs_from_ev(ctx, ctx.config.envvars[loc]),
+            )
+        else:
+            table.add_row(loc, stylize_dirs_from_ev(ctx, ctx.config.envvars[loc]))
+
+    console.print(table)
+
+
+def print_scripts(ctx: AppContext, console: Console) -> None:
+    console.print()
+
+    table = Table(title='Scripts', title_justify='left', show_lines=True, box=box.ROUNDED)
+
+    table.add_column('Name', style=STYLE_SCRIPT_NAME)
+    table.add_column('Depends')
+    table.add_column('Desc')
+    table.add_column('Local', justify='center', style=STYLE_CHECKMARK)
+
+    if ctx.details:
+        table.add_column('Cmd')
+
+    table.add_column('Python ', justify='center', style=STYLE_CHECKMARK)
+
+    if ctx.details:
+        table.add_column('Path')
+        table.add_column('Options')
+
+    scripts = list(ctx.config.scripts.values())
+    if not ctx.all:
+        scripts = [s for s in scripts if s.is_local]
+
+    for s in sorted(scripts, key=lambda s: s.name):
+        name = Text(s.name, style=STYLE_SCRIPT_LOCAL_NAME) if s.is_local else s.name
+        depends = Text('\n'.join(s.depends_on), style=STYLE_HIGHLIGHT) if s.depends_on else ''
+
+        if ctx.details:
+            script_path = stylize_dirs_from_ev(ctx=ctx, text=str(s.path(ctx.config.envvars))) if s.use_python else ''
+            options = '\n--'.join(s.options_str.split(' --'))
+            if s.env:
+                options += '\n\nEnv Vars:'
+                for e in  s.env:
+                    options += f'\n${e}={s.env[e]}'
+                options = stylize_dirs_from_ev(ctx=ctx, text=options)
+            table.add_row(name, depends, s.desc, checkmark_if(s.is_local), s.cmd, checkmark_if(s.use_python), script_path, options)
+        else:
+            table.add_row(name, depends, s.desc, checkmark_if(s.is_local), checkmark_if(s.use_python))
+
+    console.print(table)
+
+
+def print_uv_table(map: Mapping[str, Mapping[str, RichRenderable]], console: Console) -> None:
+    console.print()
+
+    table = Table(title='Info', title_justify='left', show_lines=True, box=box.ROUNDED)
+
+    table.add_column('Item', style=STYLE_UV_KEY)
+    table.add_column('Value')
+
+    for s, m in map.items():
+        table.add_row(Text(s.upper(), style=STYLE_UV_SEC), end_section=True)
+
+        for k, v in m.items():
+            table.add_row('  ' + k, v)
+
+    console.print(table)
+
+
+def print_tables(ctx: AppContext) -> None:
+    console = Console()
+
+    if not ctx.hide_uv:
+        rows = uv_info(ctx)
+        with timings.span('render info', 'render'):
+            print_uv_table(rows, console)
+
+    if not ctx.hide_locations:
+        with timings.span('render locations', 'render'):
+            print_locations(ctx, console)
+
+    if not ctx.hide_scripts:
+        with timings.span('render scripts', 'render'):
+            print_scripts(ctx, console)
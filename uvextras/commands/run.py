@@ -1,29 +1,109 @@
 import logging
 import os
-import subprocess
+import shlex
+import signal
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from graphlib import CycleError, TopologicalSorter
+from resource import struct_rusage
+from typing import Optional
 
+from uvextras import timings
 from uvextras.config import AppConfigScript
 from uvextras.context import AppContext
+from uvextras.resources import Resources, apply, parse_resources
+from uvextras.state import outputs_exist, read_stamp, script_stamp, write_stamp
 
 
-def exec_dependencies(ctx: AppContext, script: AppConfigScript) -> None:
-    for name in script.depends_on:
-        dscript = ctx.config.find_script(name)
-        if dscript is not None:
-            exec_script(ctx, dscript)
-        else:
-            logging.error(f'Script {name} is not known.')
+def build_graph(ctx: AppContext, script: AppConfigScript) -> TopologicalSorter[str]:
+    """The graph of script and everything it transitively depends on - each script appears once"""
+    graph: TopologicalSorter[str] = TopologicalSorter()
 
+    pending = [script]
+    seen: set[str] = set()
+    while pending:
+        s = pending.pop()
+        if s.name in seen:
+            continue
+        seen.add(s.name)
 
-def exec_script(ctx: AppContext, script: AppConfigScript) -> None:
-    preamble = 'uv run --script' if script.use_python else script.cmd
-    extra_args = ' '.join(ctx.args.args) if ctx.args.args else ''
-    script_path = script.path(ctx.config.envvars) if script.use_python else ''
-    cmd = f'{preamble} {script_path} {script.options_str} {extra_args}'
+        depends_on = []
+        for name in s.depends_on:
+            dscript = ctx.config.find_script(name)
+            if dscript is not None:
+                depends_on.append(name)
+                pending.append(dscript)
+            else:
+                logging.error(f'Script {name} is not known.')
 
-    if ctx.verbose:
-        print(cmd)
+        graph.add(s.name, *depends_on)
+
+    return graph
+
+
+def exec_graph(ctx: AppContext, graph: TopologicalSorter[str], final: Optional[str] = None, cancel: Optional[threading.Event] = None) -> int:
+    """Execute the scripts in dependency order running up to ctx.jobs independent scripts at a time.
+
+    No more scripts are started once one fails or cancel is set. Returns the exit code of the first failure, else 0.
+    When the final script is the only one left, it replaces this process if nothing needs to be done after it.
+    """
+    graph.prepare()
+
+    rc = 0
+    with ThreadPoolExecutor(max_workers=max(ctx.jobs, 1)) as pool:
+        running: dict[Future[int], str] = {}
+        try:
+            while graph.is_active():
+                if rc == 0 and not (cancel is not None and cancel.is_set()):
+                    for name in graph.get_ready():
+                        script = ctx.config.find_script(name)
+                        if name == final and not running and script is not None and can_replace_process(ctx, script):
+                            return replace_process(ctx, script)
+                        running[pool.submit(exec_node, ctx, name)] = name
+
+                if not running:
+                    break
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for f in done:
+                    name = running.pop(f)
+                    code = f.result()
+                    if code == 0:
+                        graph.done(name)
+                    else:
+                        if cancel is None or not cancel.is_set():
+                            logging.error(f'Script {name} failed with exit code {code}.')
+                        rc = rc or code
+        except KeyboardInterrupt:
+            rc = 130
+
+    return rc
 
+
+def exec_node(ctx: AppContext, name: str) -> int:
+    script = ctx.config.find_script(name)
+    if script is not None and script.is_runnable:
+        return exec_script(ctx, script)
+    return 0
+
+
+def script_argv(ctx: AppContext, script: AppConfigScript) -> list[str]:
+    extra_args = ctx.args.args or []
+
+    if script.use_python:
+        return ['uv', 'run', '--script', str(script.path(ctx.config.envvars)), *script.options_argv, *extra_args]
+
+    if script.shell:
+        # extra args are passed as positional params so that they are not interpreted by the shell
+        cmd = f'{script.cmd} {script.options_str} "$@"' if extra_args else f'{script.cmd} {script.options_str}'
+        return ['/bin/sh', '-c', cmd, script.name, *extra_args]
+
+    return [*shlex.split(script.cmd), *script.options_argv, *extra_args]
+
+
+def script_environ(script: AppConfigScript) -> dict[str, str]:
     # disable venv
     environ = os.environ.copy()
     if 'PYTHONPATH' in environ:
@@ -35,23 +115,258 @@ def exec_script(ctx: AppContext, script: AppConfigScript) -> None:
     for e in script.env:
         environ[e] = str(script.env[e])
 
+    return environ
+
+
+# process groups of the running scripts - so that a watch can cancel them
+_children: set[int] = set()
+_children_lock = threading.Lock()
+
+
+# the shell a script with resource settings is spawned through - it stops until they are applied, exec keeps them
+_STOPPED_EXEC = 'kill -STOP $$ && exec "$@"'
+
+
+def spawn(
+    argv: list[str], env: dict[str, str], new_group: bool = False, resources: Optional[Resources] = None
+) -> tuple[int, Optional[struct_rusage]]:
+    """Run argv and wait for it - posix_spawn does not copy the Python process.
+
+    With new_group the script gets its own process group, so that it can be terminated along with its children. With
+    resources, argv is spawned through a shell that stops itself - they are applied to its process from here, then it is
+    continued and execs argv. Returns the exit code and the resource usage of the script - None if it could not be started.
+    """
+    spawn_argv = ['/bin/sh', '-c', _STOPPED_EXEC, argv[0], *argv] if resources else argv
+    # another group than the foreground one of the terminal is stopped (SIGTTIN) when it reads it - so stdin is /dev/null
+    kwargs = {'setpgroup': 0, 'file_actions': [(os.POSIX_SPAWN_OPEN, 0, os.devnull, os.O_RDONLY, 0)]} if new_group else {}
+    try:
+        pid = os.posix_spawnp(spawn_argv[0], spawn_argv, env, **kwargs)
+    except OSError as e:
+        logging.error(f'Cannot run {argv[0]}: {e}')
+        return 127, None
+
+    if new_group:
+        with _children_lock:
+            _children.add(pid)
+    try:
+        if resources:
+            _, status, rusage = os.wait4(pid, os.WUNTRACED)
+            if not os.WIFSTOPPED(status):
+                return _exit_code(status), rusage
+            try:
+                apply(resources, pid)
+            except OSError as e:
+                logging.error(f'Cannot apply the resources of {argv[0]}: {e}')
+                os.kill(pid, signal.SIGKILL)
+                os.wait4(pid, 0)
+                return 126, None
+            os.kill(pid, signal.SIGCONT)
+
+        _, status, rusage = os.wait4(pid, 0)
+    except KeyboardInterrupt:
+        # the script got the SIGINT too - it must not be left running
+        os.kill(pid, signal.SIGCONT)
+        _, _, rusage = os.wait4(pid, 0)
+        return 130, rusage
+    finally:
+        with _children_lock:
+            _children.discard(pid)
+
+    return _exit_code(status), rusage
+
+
+def _exit_code(status: int) -> int:
+    rc = os.waitstatus_to_exitcode(status)
+    return rc if rc >= 0 else 128 - rc
+
+
+def terminate_children(sig: int = signal.SIGTERM) -> None:
+    with _children_lock:
+        for pgid in _children:
+            try:
+                os.killpg(pgid, sig)
+            except ProcessLookupError:
+                pass
+
+
+# seconds the scripts of a cancelled run get to exit after SIGTERM - then they are killed
+TERMINATE_GRACE = 5.0
+
+
+def cancel_run(runner: threading.Thread, cancel: threading.Event) -> None:
+    cancel.set()
+    terminate_children()
+    runner.join(TERMINATE_GRACE)
+    if runner.is_alive():
+        logging.warning(f'Killing the scripts that did not exit within {TERMINATE_GRACE:g}s.')
+        terminate_children(signal.SIGKILL)
+        runner.join()
+
+
+def can_replace_process(ctx: AppContext, script: AppConfigScript) -> bool:
+    """Whether running script is the last thing to do - no stamp to record for its inputs and no run for the history"""
+    return script.is_runnable and not script.inputs and not ctx.history
+
+
+def script_resources(ctx: AppContext, script: AppConfigScript) -> Optional[Resources]:
+    """The resource settings of the process of script - None if there are none, ValueError if one is invalid.
+
+    The settings given with `run --resource` override those of the script, which override those of the config.
+    """
+    settings = {**ctx.config.resources, **script.resources, **ctx.resources}
+    if not settings:
+        return None
+
+    resources = parse_resources(settings)
+    return resources if resources else None
+
+
+def replace_process(ctx: AppContext, script: AppConfigScript) -> int:
+    """exec script in place of this process so that it does not stay resident - returns only if that fails"""
+    argv = script_argv(ctx, script)
+    if ctx.verbose:
+        print(shlex.join(argv))
+
+    try:
+        resources = script_resources(ctx, script)
+        if resources is not None:
+            apply(resources)
+    except (ValueError, OSError) as e:
+        logging.error(f'Cannot apply the resources of {script.name}: {e}')
+        return 126
+
+    timings.report()
+    sys.stdout.flush()
+    sys.stderr.flush()
+
+    try:
+        os.execvpe(argv[0], argv, script_environ(script))
+    except OSError as e:
+        logging.error(f'Cannot run {argv[0]}: {e}')
+    return 127
+
+
+def exec_script(ctx: AppContext, script: AppConfigScript) -> int:
+    argv = script_argv(ctx, script)
+    cmd = shlex.join(argv)
+
+    stamp = None
+    store = None
+    key = None
+    if script.inputs:
+        script_path = script.path(ctx.config.envvars) if script.use_python else None
+        stamp = script_stamp(script, cmd, script_path)
+        if not ctx.force and outputs_exist(script) and read_stamp(ctx.config.envvars, script.name) == stamp:
+            logging.info(f'Script {script.name} is up to date.')
+            return 0
+
+        if ctx.artifacts and script.outputs:
+            from uvextras.artifacts import artifact_key, artifact_store, restore_outputs, save_outputs
+
+            store = artifact_store(ctx)
+            key = artifact_key(script, ctx.args.args or [], script_path)
+            if store is not None and not ctx.force and restore_outputs(store, key, script):
+                write_stamp(ctx.config.envvars, script.name, stamp)
+                logging.info(f'Script {script.name} was restored from the artifact cache.')
+                return 0
+
+    try:
+        resources = script_resources(ctx, script)
+    except ValueError as e:
+        logging.error(f'Cannot apply the resources of {script.name}: {e}')
+        return 126
+
+    if ctx.verbose:
+        print(cmd)
+
+    started, start = time.time(), time.monotonic()
+    with timings.span(f'exec {script.name}', 'script', cmd=cmd) as span:
+        rc, rusage = spawn(argv, script_environ(script), new_group=ctx.watch, resources=resources)
+        span['exit_code'] = rc
+
+    if ctx.history:
+        from uvextras.history import from_rusage, record
+
+        record(ctx.config.envvars, from_rusage(script.name, started, time.monotonic() - start, rc, cmd, rusage))
+
+    if rc == 0 and stamp is not None:
+        write_stamp(ctx.config.envvars, script.name, stamp)
+        if store is not None and key is not None:
+            save_outputs(store, key, script)
+
+    return rc
+
+
+def watch_paths(ctx: AppContext, script: AppConfigScript) -> tuple[list[str], list[str]]:
+    """The globs to watch for script and its dependencies, and the paths to ignore"""
+    scripts = [s for name in build_graph(ctx, script).static_order() if (s := ctx.config.find_script(name)) is not None]
+    globs = [g for s in scripts for g in s.watch or s.inputs]
+
+    # what `clean` deletes is produced by the scripts - as are their outputs
+    clean = ctx.config.find_script('clean')
+    items = clean.options.get('items_to_delete') if clean is not None else None
+    ignore = str(items).split() if items else []
+    ignore += [o for s in scripts for o in s.outputs]
+
+    return globs, ignore
+
+
+def watch(ctx: AppContext, script: AppConfigScript) -> int:
+    """Run script, then again each time a watched file changes - a run in progress is cancelled"""
+    from uvextras.watch import make_watcher, wait_for_changes
+
+    globs, ignore = watch_paths(ctx, script)
+    watcher = make_watcher(os.getcwd(), globs, ignore)
+
+    def run_once(cancel: threading.Event) -> None:
+        rc = exec_graph(ctx, build_graph(ctx, script), cancel=cancel)
+        if not cancel.is_set():
+            logging.info(f'Script {script.name} {"succeeded" if rc == 0 else f"failed with exit code {rc}"} - watching for changes.')
+
+    cancel = threading.Event()
+    runner = None
     try:
-        subprocess.call(cmd, shell=True, env=environ, text=ctx.verbose)
+        while True:
+            runner = threading.Thread(target=run_once, args=(cancel,), daemon=True)
+            runner.start()
+
+            changed = wait_for_changes(watcher, ctx.debounce)
+            logging.info(f'Changed: {", ".join(sorted(changed)[:5])}{" ..." if len(changed) > 5 else ""}')
+
+            if runner.is_alive():
+                logging.info(f'Cancelling the run of {script.name}.')
+                cancel_run(runner, cancel)
+            cancel = threading.Event()
     except KeyboardInterrupt:
-        pass
+        if runner is not None and runner.is_alive():
+            cancel_run(runner, cancel)
+        return 130
+    finally:
+        watcher.close()
 
 
 def cmd(ctx: AppContext) -> None:
     logging.debug('starting...')
 
+    rc = 0
     script = ctx.config.find_script(ctx.script)
     if script is not None:
-        if script.depends_on:
-            exec_dependencies(ctx, script)
+        try:
+            if ctx.each:
+                from uvextras.commands.each import run_each
 
-        if script.cmd is not None or script.use_python:
-            exec_script(ctx, script)
+                rc = run_each(ctx, script)
+            elif ctx.watch:
+                rc = watch(ctx, script)
+            else:
+                rc = exec_graph(ctx, build_graph(ctx, script), final=script.name)
+        except CycleError as e:
+            logging.error(f'Script dependencies form a cycle: {" -> ".join(reversed(e.args[1]))}')
+            rc = 1
     else:
         logging.error(f'Script {ctx.args.script} is not known.')
 
     logging.debug('done.')
+
+    if rc != 0:
+        sys.exit(rc)
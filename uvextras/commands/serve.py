@@ -0,0 +1,266 @@
+import json
+import logging
+import os
+import selectors
+import signal
+import socket
+import sys
+import traceback
+from contextlib import contextmanager
+from typing import Any, Iterator, NoReturn, Optional
+
+from uvextras import timings
+from uvextras.cli import preparse_args
+from uvextras.client import HEADER, INT, recv_exact, socket_path
+from uvextras.config import AppConfig, AppConfigEnvVarDict, forget_uv_locations, load_config, reload_config, resolve_envvar
+from uvextras.context import AppContext
+
+# warm configs by (config file, CWD) - least recently used first
+_configs: dict[tuple[str, str], AppConfig] = {}
+MAX_CONFIGS = 64
+
+
+def warm_config(refresh: bool = False) -> AppConfig:
+    """The merged config for the current env and CWD - loaded again only when its sources changed"""
+    # uv may have been upgraded since the server started
+    forget_uv_locations()
+
+    _, config_file = resolve_envvar(AppConfigEnvVarDict.config_ev())
+    key = (config_file, os.getcwd())
+
+    config = _configs.pop(key, None)
+    if config is not None and not refresh:
+        with timings.span('reload config'):
+            config = reload_config(config)
+    if config is None:
+        config = load_config(refresh=refresh)
+
+    _configs[key] = config
+    while len(_configs) > MAX_CONFIGS:
+        del _configs[next(iter(_configs))]
+
+    return config
+
+
+@contextmanager
+def client_environ(request: dict[str, Any]) -> Iterator[None]:
+    """Switch to the env and CWD of the client for the duration of the with block"""
+    saved_environ = dict(os.environ)
+    saved_cwd = os.getcwd()
+    try:
+        os.environ.clear()
+        os.environ.update(request['env'])
+        os.chdir(request['cwd'])
+        yield
+    finally:
+        os.chdir(saved_cwd)
+        os.environ.clear()
+        os.environ.update(saved_environ)
+
+
+def receive_request(conn: socket.socket) -> tuple[dict[str, Any], list[int]]:
+    data, fds, _, _ = socket.recv_fds(conn, HEADER.size, 3)
+    if len(data) < HEADER.size or len(fds) != 3:
+        for fd in fds:
+            os.close(fd)
+        raise ValueError('incomplete request header')
+
+    try:
+        (size,) = HEADER.unpack(data)
+        request = json.loads(recv_exact(conn, size))
+    except ValueError:
+        for fd in fds:
+            os.close(fd)
+        raise
+
+    return request, fds
+
+
+def run_request(args: list[str], fds: list[int], config: Optional[AppConfig]) -> NoReturn:
+    """Run `uvextras args` with the stdio of the client - in a forked process, exits with the command"""
+    from uvextras.__main__ import main
+
+    rc = 1
+    try:
+        # own process group so that signals forwarded by the client reach the scripts too
+        os.setpgid(0, 0)
+        for signum in (signal.SIGINT, signal.SIGTERM, signal.SIGHUP):
+            signal.signal(signum, signal.default_int_handler if signum == signal.SIGINT else signal.SIG_DFL)
+
+        for target, fd in enumerate(fds):
+            if fd != target:
+                os.dup2(fd, target)
+                os.close(fd)
+        for stream in (sys.stdout, sys.stderr):
+            if stream is not None:
+                stream.reconfigure(line_buffering=stream.isatty())
+
+        # set up again for this request - see AppContext._setup_logging
+        logging.root.handlers.clear()
+        timings.reset()
+
+        sys.argv = ['uvextras', *args]
+        main(args, config)
+        rc = 0
+    except SystemExit as e:
+        if isinstance(e.code, str):
+            print(e.code, file=sys.stderr)
+        rc = e.code if isinstance(e.code, int) else 0 if e.code is None else 1
+    except KeyboardInterrupt:
+        rc = 130
+    except BaseException:
+        traceback.print_exc()
+    finally:
+        for stream in (sys.stdout, sys.stderr):
+            if stream is not None:
+                stream.flush()
+        os._exit(rc)
+
+
+def relay(conn: socket.socket, pid: int) -> int:
+    """Forward the signals sent by the client to the process group of pid until it exits - returns its exit code"""
+    sel = selectors.DefaultSelector()
+    sel.register(conn, selectors.EVENT_READ)
+
+    pidfd = os.pidfd_open(pid) if hasattr(os, 'pidfd_open') else None
+    if pidfd is not None:
+        sel.register(pidfd, selectors.EVENT_READ)
+
+    try:
+        while True:
+            for key, _ in sel.select(timeout=None if pidfd is not None else 0.1):
+                if key.fileobj is not conn:
+                    continue
+
+                data = recv_exact(conn, INT.size)
+                if len(data) < INT.size:
+                    # the client is gone, e.g., its terminal was closed
+                    sel.unregister(conn)
+                    signum = signal.SIGHUP
+                else:
+                    (signum,) = INT.unpack(data)
+
+                try:
+                    os.killpg(pid, signum)
+                except ProcessLookupError:
+                    pass
+
+            wpid, status = os.waitpid(pid, os.WNOHANG)
+            if wpid:
+                rc = os.waitstatus_to_exitcode(status)
+                return rc if rc >= 0 else 128 - rc
+    finally:
+        sel.close()
+        if pidfd is not None:
+            os.close(pidfd)
+
+
+def handle(server: socket.socket, conn: socket.socket) -> None:
+    request, fds = receive_request(conn)
+    args = request['argv']
+
+    try:
+        with client_environ(request):
+            config = None
+            try:
+                config = warm_config(refresh=preparse_args(args).refresh)
+            except Exception as e:
+                # let the command load it again and report the error to the client
+                logging.debug(f'could not load the config: {e}')
+
+            # the env and CWD of the client are inherited
+            if os.fork() == 0:
+                serve_forked(server, conn, args, fds, config)
+    finally:
+        for fd in fds:
+            os.close(fd)
+
+
+def serve_forked(server: socket.socket, conn: socket.socket, args: list[str], fds: list[int], config: Optional[AppConfig]) -> NoReturn:
+    """Run the command in a child process and relay its exit code to the client"""
+    rc = 1
+    try:
+        server.close()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(signum, signal.SIG_IGN)
+
+        pid = os.fork()
+        if pid == 0:
+            conn.close()
+            run_request(args, fds, config)
+
+        for fd in fds:
+            os.close(fd)
+        rc = relay(conn, pid)
+    finally:
+        try:
+            conn.sendall(INT.pack(rc))
+        except OSError:
+            pass
+        os._exit(0)
+
+
+def reap() -> None:
+    """Collect the forked processes that are done"""
+    try:
+        while os.waitpid(-1, os.WNOHANG)[0]:
+            pass
+    except ChildProcessError:
+        pass
+
+
+def listen(path: str) -> socket.socket:
+    if os.path.exists(path):
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(path)
+            raise RuntimeError(f'a server is already listening on {path}')
+        except (ConnectionRefusedError, FileNotFoundError):
+            # left over by a server that did not exit cleanly
+            os.unlink(path)
+        finally:
+            probe.close()
+
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    old_umask = os.umask(0o177)
+    try:
+        server.bind(path)
+    finally:
+        os.umask(old_umask)
+    server.listen()
+
+    return server
+
+
+def cmd(ctx: AppContext) -> None:
+    logging.debug('starting...')
+
+    path = ctx.socket or socket_path()
+    try:
+        server = listen(path)
+    except (OSError, RuntimeError) as e:
+        logging.error(f'Cannot serve on {path}: {e}')
+        sys.exit(1)
+
+    # exit cleanly, i.e., remove the socket, when terminated
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+
+    logging.info(f'Serving on {path}')
+    try:
+        with server:
+            while True:
+                conn, _ = server.accept()
+                with conn:
+                    try:
+                        handle(server, conn)
+                    except (OSError, ValueError, KeyError) as e:
+                        logging.warning(f'Invalid request: {e}')
+                reap()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if os.path.exists(path):
+            os.unlink(path)
+
+    logging.debug('done.')
@@ -0,0 +1,80 @@
+import logging
+from typing import Optional
+
+from rich import box
+from rich.console import Console
+from rich.table import Table
+from rich.text import Text
+
+from uvextras.context import AppContext
+from uvextras.history import ScriptStats, history_file, load_runs, script_stats
+from uvextras.stylize import STYLE_CHECKMARK, STYLE_FAILED, STYLE_SCRIPT_LOCAL_NAME, STYLE_SCRIPT_NAME, STYLE_UNAVAILABLE
+
+
+def seconds_text(seconds: Optional[float]) -> str:
+    if seconds is None:
+        return ''
+    return f'{seconds:.2f}s' if seconds < 10 else f'{seconds:.1f}s'
+
+
+def bytes_text(size: Optional[int]) -> str:
+    if size is None:
+        return ''
+    return f'{size / (1024 * 1024):.0f} MiB' if size >= 1024 * 1024 else f'{size / 1024:.0f} KiB'
+
+
+def trend_text(stats: ScriptStats) -> Text:
+    if stats.trend is None:
+        return Text('-', style=STYLE_UNAVAILABLE)
+
+    text = Text(f'{stats.trend:+.0%}', style=STYLE_FAILED if stats.regressed else STYLE_CHECKMARK if stats.trend < 0 else '')
+    if stats.regressed:
+        text.append(' regressed', style=STYLE_FAILED)
+    return text
+
+
+def print_stats(ctx: AppContext, stats: list[ScriptStats]) -> None:
+    table = Table(title='Script Runs', title_justify='left', box=box.ROUNDED)
+
+    table.add_column('Name', style=STYLE_SCRIPT_NAME)
+    table.add_column('Runs', justify='right')
+    table.add_column('Failed', justify='right')
+    table.add_column('p50', justify='right')
+    table.add_column('p95', justify='right')
+    table.add_column('Max', justify='right')
+    table.add_column('CPU p50', justify='right')
+    table.add_column('Max RSS', justify='right')
+    table.add_column(f'Trend (last {ctx.window})', justify='right')
+
+    for s in stats:
+        script = ctx.config.find_script(s.script)
+        name = Text(s.script, style=STYLE_SCRIPT_LOCAL_NAME) if script is not None and script.is_local else Text(s.script)
+        if s.cmd_changed:
+            name.append(' *', style=STYLE_UNAVAILABLE)
+
+        table.add_row(
+            name,
+            str(s.runs),
+            Text(str(s.failed), style=STYLE_FAILED) if s.failed else '0',
+            seconds_text(s.p50),
+            seconds_text(s.p95),
+            seconds_text(s.max),
+            seconds_text(s.cpu_p50),
+            bytes_text(s.max_rss),
+            trend_text(s),
+        )
+
+    console = Console()
+    console.print(table)
+    if any(s.cmd_changed for s in stats):
+        console.print(Text('* the command changed with the last run', style=STYLE_UNAVAILABLE))
+
+
+def cmd(ctx: AppContext) -> None:
+    path = history_file(ctx.config.envvars, create=False)
+    runs = load_runs(path, ctx.names)
+    if not runs:
+        logging.info(f'No runs recorded in {path}.')
+        return
+
+    print_stats(ctx, [script_stats(name, r, max(ctx.window, 1), ctx.threshold / 100) for name, r in runs.items()])
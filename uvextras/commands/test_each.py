@@ -0,0 +1,56 @@
+import subprocess
+import sys
+from pathlib import Path
+
+
+def run_each(tmp_path: Path, *args: str) -> subprocess.CompletedProcess[str]:
+    env = {
+        'HOME': str(tmp_path),
+        'PATH': '/usr/bin:/bin',
+        'PWD': str(tmp_path),
+        'PYTHONPATH': str(Path(__file__).parent.parent.parent),
+        'UVEX_CACHE_DIR': str(tmp_path / 'cache'),
+    }
+    return subprocess.run([sys.executable, '-m', 'uvextras', 'run', *args, '--each'], cwd=tmp_path, env=env, capture_output=True, text=True)
+
+
+def test_run_each_runs_script_in_every_member_with_its_overrides(tmp_path) -> None:
+    (tmp_path / '.git').mkdir()
+    (tmp_path / 'pyproject.toml').write_text('[tool.uv.workspace]\nmembers = ["packages/*"]\n')
+    (tmp_path / '.uvextras').mkdir()
+    (tmp_path / '.uvextras' / 'uvextras.yaml').write_text(
+        'scripts:\n  - name: hello\n    cmd: \'echo "hello $WHO"; test "$WHO" != c\'\n'
+        '    shell: true\n    use-python: false\n    env:\n      WHO: all\n'
+    )
+    for name in ('a', 'b', 'c'):
+        member = tmp_path / 'packages' / name
+        member.mkdir(parents=True)
+        (member / 'pyproject.toml').write_text(f'[project]\nname = "{name}"\n')
+    for name in ('b', 'c'):
+        (tmp_path / 'packages' / name / '.uvextras').mkdir()
+        (tmp_path / 'packages' / name / '.uvextras' / 'uvextras.yaml').write_text(
+            f'scripts:\n  - name: hello\n    is-local: false\n    env:\n      WHO: {name}\n'
+        )
+
+    proc = run_each(tmp_path, 'hello', '-j', '2')
+
+    assert proc.returncode == 1
+    lines = proc.stdout.splitlines()
+    assert 'packages/a | hello all' in lines
+    assert 'packages/b | hello b' in lines
+    assert 'packages/c | hello c' in lines
+
+
+def test_run_each_reports_a_member_killed_by_a_signal_as_the_shell_does(tmp_path) -> None:
+    (tmp_path / 'pyproject.toml').write_text('[tool.uv.workspace]\nmembers = ["packages/*"]\n')
+    (tmp_path / '.uvextras').mkdir()
+    (tmp_path / '.uvextras' / 'uvextras.yaml').write_text(
+        'scripts:\n  - name: stop\n    cmd: kill -TERM $$\n    shell: true\n    use-python: false\n'
+    )
+    (tmp_path / 'packages' / 'a').mkdir(parents=True)
+    (tmp_path / 'packages' / 'a' / 'pyproject.toml').write_text('[project]\nname = "a"\n')
+
+    proc = run_each(tmp_path, 'stop')
+
+    assert proc.returncode == 128 + 15
+    assert '143' in proc.stdout
@@ -0,0 +1,139 @@
+import argparse
+import io
+import json
+import os
+import subprocess
+import time
+from types import SimpleNamespace
+
+import uvextras.commands.info as info
+import uvextras.config as config_module
+from uvextras.config import UV_PYTHON_INSTALL_DIR, UV_TOOL_DIR, load_config
+from uvextras.context import AppContext
+from uvextras.paths import PathRewriter
+
+
+def test_collect_probes_runs_concurrently_and_tolerates_failures(monkeypatch) -> None:
+    def fake_shell_cli_output(cmd: str, redirect_stderr=False, timeout=None) -> str:
+        if cmd == 'uv self version':
+            raise subprocess.CalledProcessError(1, cmd)
+        time.sleep(0.2)
+        return cmd
+
+    monkeypatch.setattr(info, 'shell_cli_output', fake_shell_cli_output)
+    ctx = SimpleNamespace(details=True, timeout=5.0, ttl=0)
+
+    start = time.monotonic()
+    results = info.collect_probes(ctx)  # type: ignore[arg-type]
+    elapsed = time.monotonic() - start
+
+    assert set(results) == set(info.probes)
+    assert results['uv_version'] is None
+    assert results['uv_cache_dir'] == 'uv cache dir'
+    assert elapsed < 0.2 * (len(info.probes) - 1)
+
+
+def test_collect_probes_skips_details(monkeypatch) -> None:
+    monkeypatch.setattr(info, 'shell_cli_output', lambda cmd, redirect_stderr=False, timeout=None: cmd)
+    ctx = SimpleNamespace(details=False, timeout=5.0, ttl=0)
+
+    results = info.collect_probes(ctx)  # type: ignore[arg-type]
+
+    assert 'uv_tool_list' not in results
+    assert 'uv_version' in results
+
+
+def test_collect_probes_caches_results_until_key_changes(monkeypatch, tmp_path) -> None:
+    calls: list[str] = []
+
+    def fake_shell_cli_output(cmd: str, redirect_stderr=False, timeout=None) -> str:
+        calls.append(cmd)
+        return cmd
+
+    key = ['uv 1']
+    monkeypatch.setenv('UVEX_CACHE_DIR', str(tmp_path))
+    monkeypatch.setattr(info, 'shell_cli_output', fake_shell_cli_output)
+    monkeypatch.setattr(info, 'probes_key', lambda ctx: key[0])
+    ctx = SimpleNamespace(details=False, timeout=5.0, ttl=60.0, refresh=False)
+
+    first = info.collect_probes(ctx)  # type: ignore[arg-type]
+    probed = len(calls)
+    assert info.collect_probes(ctx) == first  # type: ignore[arg-type]
+    assert len(calls) == probed
+
+    # details only probes the ones that are not cached yet
+    ctx.details = True
+    info.collect_probes(ctx)  # type: ignore[arg-type]
+    assert len(calls) == len(info.probes)
+
+    key[0] = 'uv 2'
+    info.collect_probes(ctx)  # type: ignore[arg-type]
+    assert len(calls) == 2 * len(info.probes)
+
+    ctx.refresh = True
+    info.collect_probes(ctx)  # type: ignore[arg-type]
+    assert len(calls) == 3 * len(info.probes)
+
+
+def test_collect_probes_caches_failures_for_a_short_while(monkeypatch, tmp_path) -> None:
+    calls: list[str] = []
+
+    def fake_shell_cli_output(cmd: str, redirect_stderr=False, timeout=None) -> str:
+        calls.append(cmd)
+        if cmd == 'uv self version':
+            raise subprocess.TimeoutExpired(cmd, timeout)
+        return cmd
+
+    now = [1000.0]
+    monkeypatch.setenv('UVEX_CACHE_DIR', str(tmp_path))
+    monkeypatch.setattr(info, 'shell_cli_output', fake_shell_cli_output)
+    monkeypatch.setattr(info, 'probes_key', lambda ctx: 'uv 1')
+    monkeypatch.setattr(info.time, 'time', lambda: now[0])
+    ctx = SimpleNamespace(details=False, timeout=5.0, ttl=300.0, refresh=False)
+
+    assert info.collect_probes(ctx)['uv_version'] is None  # type: ignore[arg-type]
+    probed = len(calls)
+
+    now[0] += info.FAILED_TTL / 2
+    info.collect_probes(ctx)  # type: ignore[arg-type]
+    assert len(calls) == probed
+
+    # only the failed probe is run again
+    now[0] += info.FAILED_TTL
+    info.collect_probes(ctx)  # type: ignore[arg-type]
+    assert calls[probed:] == ['uv self version']
+
+
+def test_print_data_writes_one_json_document(monkeypatch, tmp_path) -> None:
+    (tmp_path / '.uvextras').mkdir()
+    (tmp_path / '.uvextras' / 'uvextras.yaml').write_text('scripts:\n  - name: tool\n    cmd: "true"\n    use-python: false\n')
+
+    monkeypatch.setattr(os, 'environ', dict(os.environ))
+    for name in ('UVEX_LOCAL', 'UVEX_LOCAL_CONFIG', 'UVEX_LOCAL_SCRIPTS'):
+        os.environ.pop(name, None)
+    os.environ |= {'HOME': str(tmp_path), 'PWD': str(tmp_path), 'UVEX_CACHE_DIR': str(tmp_path / 'cache')}
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(info, 'collect_probes', lambda ctx: dict.fromkeys(info.probes) | {'uv_cache_dir': f'{tmp_path}/uv'})
+    # no `uv` needed for its locations either
+    locations = {UV_PYTHON_INSTALL_DIR: str(tmp_path / 'python'), UV_TOOL_DIR: str(tmp_path / 'tools')}
+    monkeypatch.setattr(config_module, 'uv_locations', lambda refresh=False: locations)
+
+    config = load_config(refresh=True)
+    ctx = AppContext(argparse.Namespace(format='json', locations=True, verbose=False), config)
+
+    out = io.StringIO()
+    info.print_data(ctx, out)
+    data = json.loads(out.getvalue())
+
+    assert list(data) == ['scripts', 'info']
+    assert [s['name'] for s in data['scripts']] == ['tool']
+    assert data['info']['uv']['version'] is None
+    assert data['info']['uv']['cache_dir_relative'] == '$HOME/uv'
+
+
+def test_path_rewriter_prefers_the_longest_dir() -> None:
+    rewrite = PathRewriter({'/home/me/proj/.uvextras': '$UVEX_LOCAL', '/home/me/a+b': '$AB', '/home/me': '$HOME'})
+
+    assert rewrite('/home/me/proj/.uvextras/scripts /home/me/proj/x') == '$UVEX_LOCAL/scripts $HOME/proj/x'
+    assert rewrite('/home/me/a+b/c /home/me/aab/c /home/me') == '$AB/c $HOME/aab/c /home/me'
+    assert list(rewrite.lines(['/home/me/x', 'none'])) == ['$HOME/x', 'none']
@@ -0,0 +1,250 @@
+import argparse
+import signal
+import threading
+import time
+from graphlib import CycleError
+from types import SimpleNamespace
+
+import pytest
+
+import uvextras.commands.run as run
+from uvextras.config import AppConfig
+from uvextras.context import AppContext
+from uvextras.history import history_file, load_runs
+
+
+def make_ctx(scripts: list[dict], jobs: int = 1) -> SimpleNamespace:
+    config = AppConfig.from_yaml({'scripts': [{'cmd': 'true', 'use-python': False} | s for s in scripts]})
+    return SimpleNamespace(
+        config=config, jobs=jobs, verbose=False, watch=False, artifacts=None, history=False, resources={}, args=SimpleNamespace(args=[])
+    )
+
+
+def record_exec_script(monkeypatch, failing: tuple[str, ...] = (), delay: float = 0.0) -> list[str]:
+    executed: list[str] = []
+    lock = threading.Lock()
+
+    def fake_exec_script(ctx, script) -> int:
+        time.sleep(delay)
+        with lock:
+            executed.append(script.name)
+        return 1 if script.name in failing else 0
+
+    monkeypatch.setattr(run, 'exec_script', fake_exec_script)
+    return executed
+
+
+def test_exec_graph_runs_diamond_dependency_once(monkeypatch) -> None:
+    executed = record_exec_script(monkeypatch)
+    ctx = make_ctx([
+        {'name': 'ci', 'depends-on': ['lint', 'test']},
+        {'name': 'lint', 'depends-on': ['sync']},
+        {'name': 'test', 'depends-on': ['sync']},
+        {'name': 'sync'},
+    ])
+
+    rc = run.exec_graph(ctx, run.build_graph(ctx, ctx.config.find_script('ci')))
+
+    assert rc == 0
+    assert sorted(executed) == ['ci', 'lint', 'sync', 'test']
+    assert executed[0] == 'sync'
+    assert executed[-1] == 'ci'
+
+
+def test_exec_graph_runs_independent_scripts_in_parallel(monkeypatch) -> None:
+    executed = record_exec_script(monkeypatch, delay=0.2)
+    ctx = make_ctx([
+        {'name': 'ci', 'depends-on': ['lint', 'typecheck', 'test'], 'cmd': None},
+        {'name': 'lint'},
+        {'name': 'typecheck'},
+        {'name': 'test'},
+    ], jobs=3)
+
+    start = time.monotonic()
+    rc = run.exec_graph(ctx, run.build_graph(ctx, ctx.config.find_script('ci')))
+    elapsed = time.monotonic() - start
+
+    assert rc == 0
+    assert sorted(executed) == ['lint', 'test', 'typecheck']
+    assert elapsed < 0.5
+
+
+def test_exec_graph_stops_after_failure(monkeypatch) -> None:
+    executed = record_exec_script(monkeypatch, failing=('lint',))
+    ctx = make_ctx([
+        {'name': 'ci', 'depends-on': ['lint']},
+        {'name': 'lint'},
+    ])
+
+    rc = run.exec_graph(ctx, run.build_graph(ctx, ctx.config.find_script('ci')))
+
+    assert rc == 1
+    assert executed == ['lint']
+
+
+def test_build_graph_detects_cycle() -> None:
+    ctx = make_ctx([
+        {'name': 'a', 'depends-on': ['b']},
+        {'name': 'b', 'depends-on': ['a']},
+    ])
+
+    with pytest.raises(CycleError):
+        run.build_graph(ctx, ctx.config.find_script('a')).prepare()
+
+
+def test_exec_script_skips_up_to_date_script(monkeypatch, tmp_path) -> None:
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / 'in.txt').write_text('a')
+    ctx = make_ctx([{'name': 'build', 'cmd': 'echo built >> out.txt', 'shell': True, 'inputs': ['in*.txt'], 'outputs': ['out.txt']}])
+    ctx.force = False
+    script = ctx.config.find_script('build')
+
+    def runs() -> int:
+        return len((tmp_path / 'out.txt').read_text().splitlines())
+
+    assert run.exec_script(ctx, script) == 0
+    assert run.exec_script(ctx, script) == 0
+    assert runs() == 1
+
+    (tmp_path / 'in.txt').write_text('b')
+    assert run.exec_script(ctx, script) == 0
+    assert runs() == 2
+
+    ctx.force = True
+    assert run.exec_script(ctx, script) == 0
+    assert runs() == 3
+
+
+def test_script_argv_does_not_use_a_shell_unless_asked() -> None:
+    ctx = make_ctx([
+        {'name': 'log', 'cmd': 'git log "origin/main"', 'options': {'oneline': None, 'format': '%h %s'}},
+        {'name': 'piped', 'cmd': 'git log | head', 'shell': True},
+    ])
+    ctx.args.args = ['-n', '2 3']
+
+    assert run.script_argv(ctx, ctx.config.find_script('log')) == ['git', 'log', 'origin/main', '--oneline', '--format', '%h %s', '-n', '2 3']
+    assert run.script_argv(ctx, ctx.config.find_script('piped')) == ['/bin/sh', '-c', 'git log | head  "$@"', 'piped', '-n', '2 3']
+
+
+def test_exec_graph_replaces_process_with_final_script(monkeypatch) -> None:
+    executed = record_exec_script(monkeypatch)
+    replaced: list[list[str]] = []
+
+    def fake_execvpe(file, args, env) -> None:
+        replaced.append(args)
+        raise SystemExit(0)
+
+    monkeypatch.setattr(run.os, 'execvpe', fake_execvpe)
+    ctx = make_ctx([
+        {'name': 'ci', 'depends-on': ['lint'], 'cmd': 'echo done'},
+        {'name': 'lint'},
+    ])
+
+    with pytest.raises(SystemExit):
+        run.exec_graph(ctx, run.build_graph(ctx, ctx.config.find_script('ci')), final='ci')
+
+    assert executed == ['lint']
+    assert replaced == [['echo', 'done']]
+
+
+def test_exec_graph_records_runs_in_history(monkeypatch, tmp_path) -> None:
+    monkeypatch.chdir(tmp_path)
+    ctx = make_ctx([
+        {'name': 'ci', 'depends-on': ['lint'], 'cmd': 'exit 3', 'shell': True},
+        {'name': 'lint'},
+    ])
+    ctx.force = False
+    ctx.history = True
+
+    # the final script is waited for rather than exec'd - its run must be recorded
+    assert run.exec_graph(ctx, run.build_graph(ctx, ctx.config.find_script('ci')), final='ci') == 3
+
+    runs = load_runs(history_file(ctx.config.envvars))
+    assert [r.exit_code for r in runs['lint']] == [0]
+    assert [r.exit_code for r in runs['ci']] == [3]
+    assert runs['ci'][0].max_rss > 0 and runs['ci'][0].user_cpu is not None
+
+
+def test_history_is_only_recorded_in_projects_with_a_uvextras_dir(monkeypatch, tmp_path) -> None:
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv('PWD', str(tmp_path))
+    monkeypatch.delenv('UVEX_HISTORY', raising=False)
+    data = {
+        'envvars': [{'bind': 'uvexlocaldir', 'name': 'UVEX_LOCAL', 'resolve': ['$PWD/.uvextras']}],
+        'scripts': [{'name': 'hello', 'cmd': 'echo hello', 'use-python': False}],
+    }
+
+    def make_context(**args) -> AppContext:
+        # binding exports $UVEX_LOCAL - set (and so removed again after the test) before it is unset to resolve it again
+        monkeypatch.setenv('UVEX_LOCAL', '')
+        monkeypatch.delenv('UVEX_LOCAL')
+        return AppContext(argparse.Namespace(verbose=False, **args), AppConfig.from_yaml(data))
+
+    # elsewhere the final script replaces uvextras - and no state dir is created
+    ctx = make_context()
+    assert not ctx.history
+    assert run.can_replace_process(ctx, ctx.config.find_script('hello'))
+    assert not (tmp_path / '.uvextras').exists()
+
+    (tmp_path / '.uvextras').mkdir()
+    ctx = make_context()
+    assert ctx.history
+    assert not run.can_replace_process(ctx, ctx.config.find_script('hello'))
+    assert not make_context(history=False).history
+
+
+# the settings are applied without forking the threaded process
+@pytest.mark.filterwarnings('error::DeprecationWarning')
+def test_exec_script_applies_resources(monkeypatch, tmp_path) -> None:
+    monkeypatch.chdir(tmp_path)
+    ctx = make_ctx([{'name': 'limits', 'cmd': 'ulimit -n > limits.txt; nice >> limits.txt', 'shell': True, 'resources': {'nice': 5}}])
+    ctx.force = False
+    ctx.config.resources = {'nice': 1, 'open-files': 64}
+    script = ctx.config.find_script('limits')
+
+    assert run.exec_graph(ctx, run.build_graph(ctx, script)) == 0
+    assert (tmp_path / 'limits.txt').read_text().split() == ['64', '5']
+    assert run.exec_script(ctx, script) == 0
+    assert (tmp_path / 'limits.txt').read_text().split() == ['64', '5']
+
+    # those of the CLI win
+    ctx.resources = {'nice': '7'}
+    assert run.exec_script(ctx, script) == 0
+    assert (tmp_path / 'limits.txt').read_text().split() == ['64', '7']
+
+    ctx.resources = {'nice': 'low'}
+    assert run.exec_script(ctx, script) == 126
+
+
+def test_watch_cancels_the_run_and_runs_again_when_an_input_changes(monkeypatch, tmp_path) -> None:
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(run, 'TERMINATE_GRACE', 0.5)
+    (tmp_path / 'in.txt').write_text('1')
+    # SIGTERM is ignored - the script is killed once the grace period is over
+    ctx = make_ctx([
+        {'name': 'slow', 'cmd': "trap '' TERM; echo start >> runs.log; sleep 5; echo end >> runs.log", 'shell': True, 'watch': ['in.txt']},
+    ])
+    ctx.force, ctx.watch, ctx.debounce = False, True, 0.1
+
+    def runs() -> list[str]:
+        log = tmp_path / 'runs.log'
+        return log.read_text().split() if log.exists() else []
+
+    def wait_for_runs(n: int) -> None:
+        deadline = time.monotonic() + 10
+        while len(runs()) < n and time.monotonic() < deadline:
+            time.sleep(0.05)
+
+    def change_input() -> None:
+        wait_for_runs(1)
+        (tmp_path / 'in.txt').write_text('2')
+        wait_for_runs(2)
+        # as if Ctrl-C was pressed
+        signal.pthread_kill(threading.main_thread().ident, signal.SIGINT)
+
+    threading.Thread(target=change_input, daemon=True).start()
+    start = time.monotonic()
+
+    assert run.watch(ctx, ctx.config.find_script('slow')) == 130
+    assert runs() == ['start', 'start']
+    assert time.monotonic() - start < 5
@@ -0,0 +1,58 @@
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from uvextras.client import request
+
+
+@pytest.fixture
+def server(tmp_path, monkeypatch):
+    local_dir = tmp_path / '.uvextras'
+    local_dir.mkdir()
+    (local_dir / 'uvextras.yaml').write_text(
+        'scripts:\n'
+        '  - name: hello\n    cmd: echo hello from server\n    use-python: false\n'
+        '  - name: fail\n    cmd: exit 3\n    shell: true\n    use-python: false\n'
+    )
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv('PWD', str(tmp_path))
+    monkeypatch.setenv('UVEX_CACHE_DIR', str(tmp_path / 'cache'))
+    monkeypatch.setenv('PYTHONPATH', str(Path(__file__).parent.parent.parent))
+
+    path = str(tmp_path / 'serve.sock')
+    proc = subprocess.Popen([sys.executable, '-m', 'uvextras', 'serve', '--socket', path], env=os.environ.copy())
+
+    deadline = time.monotonic() + 10
+    while not os.path.exists(path) and time.monotonic() < deadline:
+        time.sleep(0.05)
+
+    yield path
+
+    proc.terminate()
+    proc.wait(timeout=10)
+
+
+def test_request_relays_output_and_exit_code(server, capfd) -> None:
+    assert request(['run', 'hello'], server) == 0
+    assert request(['run', 'fail'], server) == 3
+
+    assert 'hello from server' in capfd.readouterr().out
+
+
+def test_request_reloads_changed_config(server, tmp_path, capfd) -> None:
+    assert request(['run', 'hello'], server) == 0
+
+    config = tmp_path / '.uvextras' / 'uvextras.yaml'
+    config.write_text(config.read_text() + '  - name: added\n    cmd: echo added later\n    use-python: false\n')
+
+    assert request(['run', 'added'], server) == 0
+    assert 'added later' in capfd.readouterr().out
+
+
+def test_request_without_server(tmp_path) -> None:
+    assert request(['run', 'hello'], str(tmp_path / 'missing.sock')) is None
@@ -0,0 +1,36 @@
+import subprocess
+from types import SimpleNamespace
+
+import uvextras.commands.warm as warm
+from uvextras.config import AppConfig
+
+
+def test_sync_status_from_uv_output() -> None:
+    assert warm.sync_status('Creating script environment at: /x\nResolved 1 package in 1ms\n') == warm.CREATED
+    assert warm.sync_status('Using script environment at: /x\nInstalled 2 packages in 3ms\n') == warm.UPDATED
+    assert warm.sync_status('Using script environment at: /x\nResolved in 1ms\nChecked in 0.01ms\n') == warm.UNCHANGED
+
+
+def test_warm_script_reports_status_and_lock_change(monkeypatch, tmp_path) -> None:
+    script_file = tmp_path / 'tool.py'
+    script_file.write_text('print(1)\n')
+    config = AppConfig.from_yaml({'scripts': [{'name': 'tool'}, {'name': 'gone'}]})
+    for s in config.scripts.values():
+        s.scripts_dir = str(tmp_path)
+    ctx = SimpleNamespace(config=config, lock=True, timeout=1.0)
+
+    calls: list[list[str]] = []
+
+    def fake_uv(args, script, timeout) -> subprocess.CompletedProcess[str]:
+        calls.append(args)
+        if args[0] == 'lock':
+            (tmp_path / 'tool.py.lock').write_text('locked\n')
+        return subprocess.CompletedProcess(args, 0, '', 'Creating script environment at: /x\n')
+
+    monkeypatch.setattr(warm, 'uv', fake_uv)
+
+    result = warm.warm_script(ctx, config.find_script('tool'))
+    assert (result.status, result.lock_changed) == (warm.CREATED, True)
+    assert calls == [['lock', '--script', str(script_file)], ['sync', '--script', str(script_file)]]
+
+    assert warm.warm_script(ctx, config.find_script('gone')).status == warm.MISSING
@@ -0,0 +1,154 @@
+import hashlib
+import logging
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+from rich import box
+from rich.console import Console
+from rich.table import Table
+from rich.text import Text
+
+from uvextras import timings
+from uvextras.commands.run import script_environ
+from uvextras.config import AppConfigScript
+from uvextras.context import AppContext
+from uvextras.stylize import STYLE_CHECKMARK, STYLE_FAILED, STYLE_SCRIPT_LOCAL_NAME, STYLE_SCRIPT_NAME, STYLE_UNAVAILABLE
+
+CREATED = 'created'
+UPDATED = 'updated'
+UNCHANGED = 'unchanged'
+FAILED = 'failed'
+MISSING = 'missing'
+
+_status_styles = {
+    CREATED: STYLE_CHECKMARK,
+    UPDATED: STYLE_CHECKMARK,
+    UNCHANGED: STYLE_UNAVAILABLE,
+    FAILED: STYLE_FAILED,
+    MISSING: STYLE_FAILED,
+}
+
+
+@dataclass
+class WarmResult:
+    script: AppConfigScript
+    status: str
+    seconds: float = 0.0
+    lock_changed: bool = False
+    detail: str = ''
+
+
+def sync_status(output: str) -> str:
+    """Whether `uv sync --script` created, updated or only checked the environment - from what it reports"""
+    lines = output.splitlines()
+    if any(line.startswith('Creating script environment') for line in lines):
+        return CREATED
+    if any(line.startswith(('Installed ', 'Uninstalled ')) for line in lines):
+        return UPDATED
+    return UNCHANGED
+
+
+def file_digest(path: Path) -> Optional[str]:
+    try:
+        with open(path, 'rb') as f:
+            return hashlib.file_digest(f, 'sha256').hexdigest()
+    except OSError:
+        return None
+
+
+def uv(args: list[str], script: AppConfigScript, timeout: float) -> subprocess.CompletedProcess[str]:
+    return subprocess.run(['uv', *args], env=script_environ(script), capture_output=True, text=True, timeout=timeout)
+
+
+def warm_script(ctx: AppContext, script: AppConfigScript) -> WarmResult:
+    path = script.path(ctx.config.envvars)
+    if not path.is_file():
+        return WarmResult(script, MISSING, detail=str(path))
+
+    start = time.monotonic()
+    with timings.span(f'warm {script.name}', 'script', path=str(path)) as span:
+        try:
+            lock_changed = False
+            if ctx.lock:
+                lock_file = path.with_name(f'{path.name}.lock')
+                before = file_digest(lock_file)
+                proc = uv(['lock', '--script', str(path)], script, ctx.timeout)
+                if proc.returncode != 0:
+                    return WarmResult(script, FAILED, time.monotonic() - start, detail=last_line(proc.stderr))
+                lock_changed = file_digest(lock_file) != before
+
+            proc = uv(['sync', '--script', str(path)], script, ctx.timeout)
+        except (subprocess.SubprocessError, OSError) as e:
+            return WarmResult(script, FAILED, time.monotonic() - start, detail=str(e))
+
+        status = sync_status(proc.stderr) if proc.returncode == 0 else FAILED
+        span['status'] = status
+
+    logging.debug(f'{script.name}: {proc.stderr}')
+    detail = last_line(proc.stderr) if status == FAILED else ''
+    return WarmResult(script, status, time.monotonic() - start, lock_changed, detail)
+
+
+def last_line(text: str) -> str:
+    lines = [line for line in text.splitlines() if line.strip()]
+    return lines[-1].strip() if lines else ''
+
+
+def selected_scripts(ctx: AppContext) -> list[AppConfigScript]:
+    """The python scripts to warm - those named on the command line, else all of them"""
+    scripts = [s for s in ctx.config.scripts.values() if s.use_python]
+    if ctx.names:
+        unknown = set(ctx.names) - {s.name for s in scripts}
+        for name in sorted(unknown):
+            logging.error(f'Script {name} is not a known python script.')
+        scripts = [s for s in scripts if s.name in ctx.names]
+
+    return sorted(scripts, key=lambda s: s.name)
+
+
+def print_results(ctx: AppContext, results: list[WarmResult], console: Console) -> None:
+    console.print()
+
+    table = Table(title='Script Environments', title_justify='left', show_lines=True, box=box.ROUNDED)
+
+    table.add_column('Name', style=STYLE_SCRIPT_NAME)
+    table.add_column('Status')
+    if ctx.lock:
+        table.add_column('Lock')
+    table.add_column('Time', justify='right')
+    table.add_column('Details')
+
+    for r in results:
+        name = Text(r.script.name, style=STYLE_SCRIPT_LOCAL_NAME) if r.script.is_local else r.script.name
+        status = Text(r.status, style=_status_styles[r.status])
+        seconds = f'{r.seconds:.1f}s' if r.status != MISSING else ''
+        if ctx.lock:
+            lock = Text('updated', style=STYLE_CHECKMARK) if r.lock_changed else ''
+            table.add_row(name, status, lock, seconds, r.detail)
+        else:
+            table.add_row(name, status, seconds, r.detail)
+
+    console.print(table)
+
+
+def cmd(ctx: AppContext) -> None:
+    logging.debug('starting...')
+
+    scripts = selected_scripts(ctx)
+
+    # each `uv` invocation is mostly waiting on the network or the disk
+    with ThreadPoolExecutor(max_workers=max(ctx.jobs, 1)) as pool:
+        results = list(pool.map(lambda s: warm_script(ctx, s), scripts))
+
+    print_results(ctx, results, Console())
+
+    logging.debug('done.')
+
+    unknown = set(ctx.names) - {s.name for s in scripts}
+    if unknown or any(r.status in (FAILED, MISSING) for r in results):
+        sys.exit(1)
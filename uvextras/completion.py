@@ -0,0 +1,189 @@
+"""Shell completion - answered from the small index written along with the config snapshot.
+
+The shells run `uvextras __complete CWORD WORDS...` on TAB. The config is only loaded (and yaml imported) when the index is
+missing, one of its config files or scripts dirs changed or the env vars that locate them resolve differently - the load then
+writes a new index. rich is never imported.
+"""
+
+import os
+import sys
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from uvextras.cache import read_json
+from uvextras.config import (
+    AppConfigEnvVarDict, completion_index_file, completion_index_is_current, load_config, resolve_envvar, save_completion_index,
+    snapshot_file,
+)
+
+# the options of the verbs and whether they take a value - kept in sync with `cli.build_parser` by test_completion
+GLOBAL_OPTIONS = {'-h': False, '--help': False, '-f': True, '--file': True, '--refresh': False, '--timings': False, '--trace': True}
+
+VERBS = {
+    'completion': 'print the shell completion script - e.g., `eval "$(uvextras completion bash)"`',
+    'info': 'show info about `uvextras` sub-system and `uv`',
+    'run': 'run script',
+    'serve': 'keep the config warm and run the commands sent by `uvextras-client`',
+    'stats': 'show the run times of scripts recorded by `uvextras run` and flag regressions',
+    'warm': 'build the environments of python scripts ahead of their first run',
+}
+
+VERB_OPTIONS = {
+    'completion': {'-h': False, '--help': False},
+    'info': {
+        '-h': False, '--help': False, '--all': False, '-d': False, '--details': False, '--format': True, '-i': False,
+        '--info': False, '-l': False, '--locations': False, '-s': False, '--scripts': False, '-t': True, '--timeout': True, '--ttl': True,
+        '-v': False, '--verbose': False,
+    },
+    'run': {
+        '-h': False, '--help': False, '--force': False, '--artifacts': True, '--artifacts-link': False, '-e': False, '--each': False,
+        '--no-history': False, '-j': True, '--jobs': True, '-r': True, '--resource': True, '-w': False, '--watch': False, '--debounce': True,
+        '-v': False, '--verbose': False,
+    },
+    'serve': {'-h': False, '--help': False, '--socket': True, '-v': False, '--verbose': False},
+    'stats': {
+        '-h': False, '--help': False, '-n': True, '--window': True, '-t': True, '--threshold': True, '-v': False, '--verbose': False,
+    },
+    'warm': {
+        '-h': False, '--help': False, '-j': True, '--jobs': True, '--lock': False, '-t': True, '--timeout': True, '-v': False,
+        '--verbose': False,
+    },
+}
+
+SHELLS = ('bash', 'zsh', 'fish')
+
+# (candidate, description)
+Candidates = list[tuple[str, str]]
+
+
+def _scan(words: list[str], options: dict[str, bool]) -> tuple[list[str], bool, bool]:
+    """(positionals, whether the next word is the value of an option, whether `--` was seen)"""
+    positionals: list[str] = []
+    expects_value = False
+    for i, word in enumerate(words):
+        if expects_value:
+            expects_value = False
+        elif word == '--':
+            return positionals + words[i + 1:], False, True
+        elif word.startswith('-') and word != '-':
+            expects_value = '=' not in word and options.get(word, False)
+        else:
+            positionals.append(word)
+    return positionals, expects_value, False
+
+
+def _matching(current: str, candidates: Candidates) -> Candidates:
+    return [(c, desc) for c, desc in candidates if c.startswith(current)]
+
+
+def _options(options: dict[str, bool]) -> Candidates:
+    return [(o, '') for o in options]
+
+
+def candidates(words: list[str], cword: int, load: Callable[[Optional[str]], Optional[dict[str, Any]]]) -> Candidates:
+    """What may replace words[cword] - empty when the shell should complete file names instead, e.g., for `-f FILE`.
+
+    load returns the index of the config given with `-f FILE` (None if there is none) - it is only called when the scripts are needed.
+    """
+    current = words[cword] if cword < len(words) else ''
+    before = words[1:cword]
+
+    # the global options come before the verb
+    verb_at = 0
+    expects_value = False
+    config_file: Optional[str] = None
+    while verb_at < len(before):
+        word = before[verb_at]
+        if expects_value:
+            expects_value = False
+            if before[verb_at - 1] in ('-f', '--file'):
+                config_file = word
+        elif word.startswith('--file='):
+            config_file = word.split('=', 1)[1]
+        elif word.startswith('-'):
+            expects_value = '=' not in word and GLOBAL_OPTIONS.get(word, False)
+        else:
+            break
+        verb_at += 1
+
+    if expects_value:
+        return []
+    if verb_at == len(before):
+        if current.startswith('-'):
+            return _matching(current, _options(GLOBAL_OPTIONS))
+        return _matching(current, list(VERBS.items()))
+
+    verb = before[verb_at]
+    options = VERB_OPTIONS.get(verb)
+    if options is None:
+        return []
+
+    positionals, expects_value, dashdash = _scan(before[verb_at + 1:], options)
+    if expects_value:
+        return []
+
+    def scripts() -> list[dict[str, Any]]:
+        index = load(config_file)
+        return index.get('scripts', []) if index else []
+
+    if verb == 'run':
+        if not positionals:
+            if current.startswith('-'):
+                return _matching(current, _options(options))
+            return _matching(current, [(s['name'], s['desc']) for s in scripts()])
+        # the options of the script follow `--` - those of run come before it
+        if dashdash:
+            if not current.startswith('-'):
+                return []
+            script = next((s for s in scripts() if s['name'] == positionals[0]), None)
+            return _matching(current, [(o, '') for o in script['options']]) if script else []
+        return _matching(current, _options(options) + [('--', 'options of the script follow')]) if current.startswith('-') else []
+
+    if current.startswith('-') and not dashdash:
+        return _matching(current, _options(options))
+    if verb == 'warm':
+        return _matching(current, [(s['name'], s['desc']) for s in scripts() if s['use_python'] and s['name'] not in positionals])
+    if verb == 'stats':
+        return _matching(current, [(s['name'], s['desc']) for s in scripts() if s['name'] not in positionals])
+    if verb == 'completion' and not positionals:
+        return _matching(current, [(s, '') for s in SHELLS])
+    return []
+
+
+def load_index(config_file: Optional[str] = None) -> Optional[dict[str, Any]]:
+    """The index of the config in the CWD - the config is loaded (and the index written again) only if it is not current
+
+    config_file is the one given with `-f FILE` - it takes the place of UVEX_CONFIG.
+    """
+    if config_file:
+        os.environ['UVEX_CONFIG'] = str(Path(config_file).expanduser().resolve())
+    _, config_file = resolve_envvar(AppConfigEnvVarDict.config_ev())
+    path = completion_index_file(snapshot_file(config_file))
+
+    index = read_json(path)
+    if completion_index_is_current(index):
+        return index
+
+    try:
+        config = load_config()
+    except Exception:
+        return None
+
+    # a current snapshot is not saved again - e.g., when the index was removed or written by an older version
+    save_completion_index(path, config)
+    return read_json(path)
+
+
+def main(args: list[str]) -> None:
+    """`uvextras __complete CWORD WORDS...` - a candidate per line, followed by a tab and its description if it has one"""
+    try:
+        cword = int(args[0])
+    except (IndexError, ValueError):
+        sys.exit(2)
+
+    for candidate, desc in candidates(args[1:], cword, load_index):
+        print(f'{candidate}\t{desc}' if desc else candidate)
+
+
+def script(shell: str) -> str:
+    return (Path(__file__).parent / 'completions' / f'uvextras.{shell}').read_text()
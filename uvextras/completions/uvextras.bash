@@ -0,0 +1,12 @@
+# bash completion for uvextras - enable with `eval "$(uvextras completion bash)"` in ~/.bashrc
+
+_uvextras() {
+    local IFS=$'\n'
+    local out
+    out=$(command uvextras __complete "$COMP_CWORD" "${COMP_WORDS[@]}" 2>/dev/null) || return
+    # the descriptions follow a tab - bash cannot show them
+    COMPREPLY=($(printf '%s\n' "$out" | cut -f1))
+}
+
+# nothing to complete falls back to file names - e.g., for `-f FILE` or the args of a script
+complete -o default -F _uvextras uvextras uvextras-client
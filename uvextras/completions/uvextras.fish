@@ -0,0 +1,16 @@
+# fish completion for uvextras - enable with `uvextras completion fish | source` in ~/.config/fish/config.fish
+
+function __uvextras_complete
+    set -l words (commandline -opc)
+    set -l current (commandline -ct)
+    set -l out (command uvextras __complete (count $words) $words "$current" 2>/dev/null)
+    if test (count $out) -gt 0
+        printf '%s\n' $out
+    else
+        # e.g., for `-f FILE` or the args of a script
+        __fish_complete_path "$current"
+    end
+end
+
+complete -c uvextras -f -a '(__uvextras_complete)'
+complete -c uvextras-client -f -a '(__uvextras_complete)'
@@ -1,10 +1,16 @@
 """The configuration concepts"""
 
+import copy
+import logging
 import os
-from dataclasses import dataclass, field
+import re
+import shutil
+from dataclasses import asdict, dataclass, field
 from pathlib import Path
-from typing import Any, Optional, Self
+from typing import Any, Callable, Optional, Self
 
+from uvextras import timings
+from uvextras.cache import cache_dir, cache_key, file_stamp, read_json, write_json
 from uvextras.shell import shell_cli_output
 
 
@@ -12,9 +18,19 @@ from uvextras.shell import shell_cli_output
 class AppConfigEnvVar:
     bind: str
     name: str
-    resolve: list[str]
+    # a rule is a path that may reference env vars, or a callable producing one on demand
+    resolve: list[str | Callable[[], str]]
     set_in_env: bool = field(default=False, init=False)
 
+    @property
+    def references(self) -> list[str]:
+        """Names of the env vars referenced by the resolution rules"""
+        rules = [r for r in self.resolve or [] if isinstance(r, str)]
+        return [a or b for r in rules for a, b in _env_var_ref_re.findall(r)]
+
+
+_env_var_ref_re = re.compile(r'\$(\w+)|\$\{(\w+)\}')
+
 
 def resolve_envvar(ev: AppConfigEnvVar) -> tuple[str, str]:
     bind = ev.bind
@@ -28,7 +44,7 @@ def resolve_envvar(ev: AppConfigEnvVar) -> tuple[str, str]:
     elif ev.resolve is not None:
         # loop through the resolution rules and accept the first one that exists
         for r in ev.resolve:
-            expanded = os.path.expandvars(r)
+            expanded = os.path.expandvars(r() if callable(r) else r)
             path = Path(expanded).resolve()
             if path.exists(follow_symlinks=True):
                 resolved = str(path)
@@ -57,12 +73,65 @@ _env_var_keys = [
 ]
 
 
+# binds added by AppConfigEnvVarDict itself rather than by a config file
+_builtin_binds = (UVEX_CONFIG, UV_PYTHON_INSTALL_DIR, UV_TOOL_DIR)
+
+_uv_location_cmds = {
+    UV_PYTHON_INSTALL_DIR: 'uv python dir',
+    UV_TOOL_DIR: 'uv tool dir',
+}
+
+_uv_locations: Optional[dict[str, str]] = None
+
+
+def uv_locations(refresh: bool = False) -> dict[str, str]:
+    """The dirs reported by `uv` - cached on disk to avoid spawning `uv` on every invocation.
+
+    The cache is keyed on the uv binary (path and mtime), the env vars uv consults and the global config file.
+    When refresh is True the in-process memo and the on-disk cache are bypassed, and both are rewritten.
+    """
+    global _uv_locations
+
+    if _uv_locations is not None and not refresh:
+        return _uv_locations
+
+    uv = shutil.which('uv')
+    _, config_file = resolve_envvar(AppConfigEnvVarDict.config_ev())
+    key = cache_key(
+        uv,
+        file_stamp(uv),
+        file_stamp(config_file),
+        sorted((k, v) for k, v in os.environ.items() if k.startswith(('UV_', 'XDG_')) or k == 'HOME'),
+    )
+
+    cache_file = cache_dir() / 'locations.json'
+    cached = read_json(cache_file) if not refresh else None
+    with timings.span('uv locations', cached=False) as span:
+        if isinstance(cached, dict) and cached.get('key') == key:
+            _uv_locations = cached['locations']
+            span['cached'] = True
+        else:
+            _uv_locations = {bind: shell_cli_output(cmd) for bind, cmd in _uv_location_cmds.items()}
+            if uv is not None:
+                write_json(cache_file, {'key': key, 'locations': _uv_locations})
+
+    return _uv_locations
+
+
+def forget_uv_locations() -> None:
+    """Drop the in-process memo so the next lookup checks the on-disk cache - for long running processes"""
+    global _uv_locations
+
+    _uv_locations = None
+
+
 @dataclass
 class AppConfigEnvVarDict(dict[str, Any]):
     envvars: list[AppConfigEnvVar] = field(default_factory=list[AppConfigEnvVar], repr=False)
+    refresh: bool = field(default=False, repr=False)
 
     def __post_init__(self):
-        self._bound = {}
+        self._bound: dict[str, str] = {}
 
         # define $uvex_root so it can be used
         root = os.path.dirname(os.path.dirname(__file__))
@@ -73,28 +142,58 @@ class AppConfigEnvVarDict(dict[str, Any]):
         config = AppConfigEnvVarDict.config_ev()
         self.envvars.insert(0, config)
 
-        for ev in AppConfigEnvVarDict.uv_envs():
+        for ev in AppConfigEnvVarDict.uv_envs(self.refresh):
             self.envvars.append(ev)
 
+        # binds are resolved on demand - see __getitem__
+        self._by_bind: dict[str, AppConfigEnvVar] = {}
+        self._by_name: dict[str, AppConfigEnvVar] = {}
         for ev in self.envvars:
-            _ = self[ev.bind]
+            self._by_bind.setdefault(ev.bind, ev)
+            self._by_name.setdefault(ev.name, ev)
 
     def __getitem__(self, key: str) -> Any:
         if key not in _env_var_keys:
             raise KeyError(f'{key} not allowed. Possibile values are one of {", ".join(_env_var_keys)}')
 
         if key not in self._bound:
-            evs = [e for e in filter(lambda ev: ev.bind == key, self.envvars)]
-            if evs and len(evs) > 0:
-                ev = evs[0]
-                bind, resolved = resolve_envvar(ev)
-                self._bound[bind] = resolved
-
-                # Enable ev.name to be used for future invocations of resolve_envvar(ev)
-                os.environ[ev.name] = resolved
+            ev = self._by_bind.get(key)
+            if ev is not None:
+                self._bind(ev, resolving=set())
 
         return self._bound.get(key, None)
 
+    def _bind(self, ev: AppConfigEnvVar, resolving: set[str]) -> None:
+        resolving.add(ev.bind)
+
+        # bind the env vars referenced by the rules first (e.g., $UVEX_HOME) so they can be expanded
+        for name in ev.references:
+            dep = self._by_name.get(name)
+            if dep is not None and dep.bind not in self._bound and dep.bind not in resolving:
+                self._bind(dep, resolving)
+
+        with timings.span(f'resolve {ev.bind}', 'envvar') as span:
+            bind, resolved = resolve_envvar(ev)
+            span['value'] = resolved
+        self._bound[bind] = resolved
+
+        # Enable ev.name to be used for future invocations of resolve_envvar(ev)
+        os.environ[ev.name] = resolved
+
+    def resolve_all(self) -> None:
+        """Bind every env var - e.g., to display them all"""
+        for ev in self.envvars:
+            _ = self[ev.bind]
+
+    def exported(self) -> list[str]:
+        """Names of the env vars exported by binding them - not those that were set in the env already"""
+        return [ev.name for ev in self.envvars if ev.bind in self._bound and not ev.set_in_env]
+
+    def unbound(self) -> 'AppConfigEnvVarDict':
+        """A dict with the same rules and nothing bound yet - to resolve them again in another env"""
+        envvars = [AppConfigEnvVar(bind=ev.bind, name=ev.name, resolve=ev.resolve) for ev in self.envvars if ev.bind not in _builtin_binds]
+        return AppConfigEnvVarDict(envvars=envvars, refresh=self.refresh)
+
     def __setitem__(self, key: str, value: Any) -> None:
         if key not in _env_var_keys:
             raise KeyError(f'{key} not allowed. Possibile values are one of {", ".join(_env_var_keys)}')
@@ -110,7 +209,7 @@ class AppConfigEnvVarDict(dict[str, Any]):
             yield k, v
 
     def find_bind(self, bind: str) -> AppConfigEnvVar:
-        return [ev for ev in self.envvars if ev.bind == bind][0]
+        return self._by_bind[bind]
 
     @staticmethod
     def config_ev() -> AppConfigEnvVar:
@@ -123,20 +222,21 @@ class AppConfigEnvVarDict(dict[str, Any]):
         )
 
     @staticmethod
-    def uv_envs() -> list[AppConfigEnvVar]:
+    def uv_envs(refresh: bool = False) -> list[AppConfigEnvVar]:
+        # `uv` is only consulted if the bind is actually used and not overridden in the env
         return [
             AppConfigEnvVar(
                 bind=UV_PYTHON_INSTALL_DIR,
                 name='UV_PYTHON_INSTALL_DIR',
                 resolve=[
-                    shell_cli_output('uv python dir'),
+                    lambda: uv_locations(refresh)[UV_PYTHON_INSTALL_DIR],
                 ],
             ),
             AppConfigEnvVar(
                 bind=UV_TOOL_DIR,
                 name='UV_TOOL_DIR',
                 resolve=[
-                    shell_cli_output('uv tool dir'),
+                    lambda: uv_locations(refresh)[UV_TOOL_DIR],
                 ],
             ),
         ]
@@ -152,6 +252,17 @@ class AppConfigScript:
     is_local: bool
     env: dict[str, Any]
     options: dict[str, Any]
+    # globs used to decide whether the script is up to date
+    inputs: list[str] = field(default_factory=list[str])
+    outputs: list[str] = field(default_factory=list[str])
+    # globs of the files that trigger a run with `run --watch` - defaults to inputs
+    watch: list[str] = field(default_factory=list[str])
+    # run cmd with /bin/sh - only needed for shell syntax, e.g., pipes or redirections
+    shell: bool = False
+    # nice, affinity, ionice and rlimits applied to the process of the script - see uvextras.resources
+    resources: dict[str, Any] = field(default_factory=dict[str, Any])
+    # the local scripts dir of the `.uvextras` level that defined a local script
+    scripts_dir: Optional[str] = None
 
     def __rich_repr__(self):
         yield 'name', self.name
@@ -162,6 +273,17 @@ class AppConfigScript:
         yield 'is_local', self.is_local
         yield 'env', self.env
         yield 'options', self.options
+        yield 'inputs', self.inputs
+        yield 'outputs', self.outputs
+        yield 'watch', self.watch
+        yield 'shell', self.shell
+        yield 'resources', self.resources
+        yield 'scripts_dir', self.scripts_dir
+
+    @property
+    def is_runnable(self) -> bool:
+        """False for scripts that only declare dependencies"""
+        return self.cmd is not None or self.use_python
 
     @property
     def options_str(self) -> str:
@@ -171,6 +293,15 @@ class AppConfigScript:
             options.append(f'--{o}{v}')
         return ' '.join(options)
 
+    @property
+    def options_argv(self) -> list[str]:
+        argv = []
+        for o, v in self.options.items():
+            argv.append(f'--{o}')
+            if v is not None:
+                argv.append(str(v))
+        return argv
+
     def merge(self, other: Self) -> None:
         for e in other.env:
             # override any specified env var settings
@@ -180,23 +311,63 @@ class AppConfigScript:
             # override any specified options
             self.options[o] = other.options[o]
 
+        # override any specified resource settings
+        self.resources.update(other.resources)
+
         if other.depends_on:
             self.depends_on.extend(other.depends_on)
 
+        if other.inputs:
+            self.inputs = other.inputs
+
+        if other.outputs:
+            self.outputs = other.outputs
+
+        if other.watch:
+            self.watch = other.watch
+
     def path(self, envvars: AppConfigEnvVarDict) -> Path:
-        script_path = f'{envvars[UVEX_LOCALSCRIPTS]}/{self.name}' if self.is_local else f'{envvars[UVEX_SCRIPTS]}/{self.name}'
+        local_scripts = self.scripts_dir or envvars[UVEX_LOCALSCRIPTS]
+        script_path = f'{local_scripts}/{self.name}' if self.is_local else f'{envvars[UVEX_SCRIPTS]}/{self.name}'
         script_path = f'{script_path}.py' if not script_path.endswith('.py') else script_path
         return Path(script_path)
 
 
+@dataclass
+class ConfigSources:
+    """What a merged config was built from - to tell whether it is still current"""
+
+    # the binds used to locate the sources - they depend on the env and on which paths exist
+    binds: dict[str, str]
+    # file stamps of the config files
+    sources: dict[str, Optional[list[int]]]
+    # local scripts of the scripts dirs
+    listings: dict[str, Optional[list[str]]]
+
+    def is_current(self, envvars: AppConfigEnvVarDict) -> bool:
+        return all(envvars[bind] == value for bind, value in self.binds.items()) and self.files_are_current()
+
+    def files_are_current(self) -> bool:
+        """Whether the config files and the scripts dirs are unchanged - without binding any env var"""
+        return (
+            all(file_stamp(file) == stamp for file, stamp in self.sources.items())
+            and all(_scripts_listing(dir) == listing for dir, listing in self.listings.items())
+        )
+
+
 @dataclass
 class AppConfig:
     envvars: AppConfigEnvVarDict
-    scripts: list[AppConfigScript]
+    # keyed by name
+    scripts: dict[str, AppConfigScript]
+    sources: Optional[ConfigSources] = field(default=None, repr=False, compare=False)
+    # the resource settings of all scripts - those of a script override them
+    resources: dict[str, Any] = field(default_factory=dict[str, Any])
 
     def __rich_repr__(self):
         yield 'envvars', self.envvars
         yield 'scripts', self.scripts
+        yield 'resources', self.resources
 
     @property
     def uv_py_dir(self) -> str:
@@ -207,16 +378,12 @@ class AppConfig:
         return self.envvars[UV_TOOL_DIR]
 
     def find_script(self, name: str) -> Optional[AppConfigScript]:
-        rc = None
+        return self.scripts.get(name)
 
-        filtered = [s for s in self.scripts if s.name == name]
-        if len(filtered) > 0:
-            rc = filtered[0]
+    def merge(self, other: Self, scripts_dir: Optional[str] = None) -> None:
+        self.resources.update(other.resources)
 
-        return rc
-
-    def merge(self, other: Self) -> None:
-        for s in other.scripts:
+        for s in other.scripts.values():
             if not s.is_local:
                 # merge env, options and depends_on
                 gs = self.find_script(s.name)
@@ -225,40 +392,38 @@ class AppConfig:
                 else:
                     print(f'merge: script {s.name} not found')
             else:
-                self.scripts.append(s)
+                # a local script replaces one of the same name from a farther level
+                s.scripts_dir = s.scripts_dir or scripts_dir
+                self.scripts[s.name] = s
 
     def merge_scripts(self, dir: Optional[str], desc: str) -> None:
         if not dir or dir is None:
             return
 
-        def script_norm_name(p: Path) -> str:
-            return str(p).removeprefix(str(path)).removeprefix('/').removesuffix('.py')
-
-        path = Path(dir)
-        if path.exists() and path.is_dir():
-            filtered_script_names = [
-                script_norm_name(p)
-                for p in path.iterdir()
-                if p.is_file() and str(p).endswith('.py') and not self.find_script(script_norm_name(p))
-            ]
-
-            self.scripts.extend(
-                AppConfigScript(
-                    name=name,
-                    desc=desc,
-                    depends_on=[],
-                    cmd='',
-                    use_python=True,
-                    is_local=True,
-                    env={},
-                    options={},
-                )
-                for name in filtered_script_names
+        for name in _scripts_listing(dir) or []:
+            name = name.removesuffix('.py')
+
+            # scripts declared in config and those from the same level win - those from farther levels do not
+            existing = self.find_script(name)
+            if existing is not None and (not existing.is_local or existing.scripts_dir == dir):
+                continue
+
+            self.scripts[name] = AppConfigScript(
+                name=name,
+                desc=desc,
+                depends_on=[],
+                cmd='',
+                use_python=True,
+                is_local=True,
+                env={},
+                options={},
+                scripts_dir=dir,
             )
 
     @staticmethod
-    def from_yaml(data: dict[str, Any]) -> AppConfig:
+    def from_yaml(data: dict[str, Any], refresh: bool = False) -> AppConfig:
         envvars = AppConfigEnvVarDict(
+            refresh=refresh,
             envvars=[
                 AppConfigEnvVar(
                     bind=ev.get('bind', ''),
@@ -269,7 +434,8 @@ class AppConfig:
             ]
         )
 
-        scripts = [
+        scripts: dict[str, AppConfigScript] = {}
+        for script in (
             AppConfigScript(
                 name=s.get('name'),
                 cmd=s.get('cmd'),
@@ -279,32 +445,220 @@ class AppConfig:
                 is_local=s.get('is-local', True),
                 env=s.get('env', {}),
                 options=s.get('options', {}),
+                inputs=s.get('inputs', []),
+                outputs=s.get('outputs', []),
+                watch=s.get('watch', []),
+                shell=s.get('shell', False),
+                resources=s.get('resources') or {},
             )
             for s in data.get('scripts', [])
-        ]
-        return AppConfig(envvars, scripts)
+        ):
+            # the first declaration of a name wins
+            scripts.setdefault(script.name, script)
+
+        return AppConfig(envvars, scripts, resources=data.get('resources') or {})
 
 
-def load_config() -> AppConfig:
+# bump when the snapshot layout or the meaning of its content changes
+SNAPSHOT_VERSION = 5
+
+
+def load_config(refresh: bool = False) -> AppConfig:
     config_ev = AppConfigEnvVarDict.config_ev()
     _, config_file = resolve_envvar(config_ev)
-    config = load_config_for(config_file)
 
-    local_config = config.envvars[UVEX_LOCALCONFIG]
-    if os.path.exists(local_config):
-        lcfg = load_config_for(local_config)
-        config.merge(lcfg)
+    snapshot = snapshot_file(config_file)
+    if not refresh:
+        with timings.span('load snapshot') as span:
+            config = _load_snapshot(snapshot)
+            span['current'] = config is not None
+        if config is not None:
+            return config
+
+    config = load_config_for(config_file, refresh)
+    sources = {config_file: file_stamp(config_file)}
+    listings = {}
 
-    config.merge_scripts(config.envvars[UVEX_LOCALSCRIPTS], desc='merged from local')
+    # merge each level in turn so that the nearest one wins
+    for local_config, local_scripts in local_levels(config.envvars):
+        sources[local_config] = file_stamp(local_config)
+        if os.path.exists(local_config):
+            lcfg = load_config_for(local_config, refresh)
+            config.merge(lcfg, scripts_dir=local_scripts)
+
+        listings[local_scripts] = _scripts_listing(local_scripts)
+        config.merge_scripts(local_scripts, desc='merged from local')
+
+    config.sources = ConfigSources(binds=dict(config.envvars._bound), sources=sources, listings=listings)
+    _save_snapshot(snapshot, config)
 
     return config
 
 
-def load_config_for(file: str) -> AppConfig:
-    from yaml import Loader, load
+def snapshot_file(config_file: str) -> Path:
+    """Where the merged config of config_file in the CWD is stored"""
+    return cache_dir() / 'config' / f'{cache_key(SNAPSHOT_VERSION, config_file, os.getcwd())}.json'
+
+
+def completion_index_file(snapshot: Path) -> Path:
+    return snapshot.with_suffix('.complete.json')
+
+
+def reload_config(config: AppConfig) -> Optional[AppConfig]:
+    """config with its env vars bound again in the current env and CWD - or None if it is no longer current"""
+    if config.sources is None:
+        return None
+
+    # binding exports env vars - they must not leak into a full load if the config turns out to be stale
+    saved_environ = dict(os.environ)
+
+    envvars = config.envvars.unbound()
+    if config.sources.is_current(envvars):
+        return AppConfig(envvars, config.scripts, config.sources, config.resources)
+
+    _restore_environ(saved_environ)
+    return None
 
-    with open(file, 'rb') as f:
+
+def local_levels(envvars: AppConfigEnvVarDict) -> list[tuple[str, str]]:
+    """(config file, scripts dir) of each `.uvextras` level from the repo root down to the CWD - nearest last.
+
+    Outside of a git repo only the CWD level is used. The CWD level is located by the local binds.
+    Levels that do not exist are included so that creating one invalidates a config snapshot.
+    """
+    ancestors: list[Path] = []
+
+    cwd = Path.cwd()
+    if not (cwd / '.git').exists():
+        for parent in cwd.parents:
+            ancestors.append(parent)
+            if (parent / '.git').exists():
+                break
+        else:
+            # not in a repo
+            ancestors = []
+
+    levels = [(str(p / '.uvextras' / 'uvextras.yaml'), str(p / '.uvextras' / 'scripts')) for p in reversed(ancestors)]
+    levels.append((envvars[UVEX_LOCALCONFIG], envvars[UVEX_LOCALSCRIPTS]))
+
+    return levels
+
+
+def load_config_for(file: str, refresh: bool = False) -> AppConfig:
+    from yaml import load
+
+    try:
+        from yaml import CSafeLoader as Loader
+    except ImportError:
+        from yaml import SafeLoader as Loader  # type: ignore[assignment]
+
+    with timings.span('parse yaml', file=file), open(file, 'rb') as f:
         data = load(f, Loader=Loader)
-    config = AppConfig.from_yaml(data)
+    config = AppConfig.from_yaml(data, refresh)
 
     return config
+
+
+def _scripts_listing(dir: Optional[str]) -> Optional[list[str]]:
+    try:
+        return sorted(e.name for e in os.scandir(dir) if e.name.endswith('.py') and e.is_file()) if dir else None
+    except OSError:
+        return None
+
+
+def _save_snapshot(path: Path, config: AppConfig) -> None:
+    """Store the merged config along with what is needed to tell whether it is still current"""
+    assert config.sources is not None
+    snapshot = {
+        'version': SNAPSHOT_VERSION,
+        **asdict(config.sources),
+        'envvars': _envvar_rules(config.envvars),
+        'scripts': [asdict(s) for s in config.scripts.values()],
+        'resources': config.resources,
+    }
+    write_json(path, snapshot)
+    save_completion_index(completion_index_file(path), config)
+
+
+def _envvar_rules(envvars: AppConfigEnvVarDict) -> list[dict[str, Any]]:
+    return [{'bind': ev.bind, 'name': ev.name, 'resolve': ev.resolve} for ev in envvars.envvars if ev.bind not in _builtin_binds]
+
+
+def save_completion_index(path: Path, config: AppConfig) -> None:
+    """The scripts as needed by the shell completion - a small file it reads without loading the config"""
+    assert config.sources is not None
+    index = {
+        'version': SNAPSHOT_VERSION,
+        # the binds that locate the config - not those of `uv`, checking them would spawn it
+        'envvars': _envvar_rules(config.envvars),
+        'binds': {bind: value for bind, value in config.sources.binds.items() if bind not in _uv_location_cmds},
+        'sources': config.sources.sources,
+        'listings': config.sources.listings,
+        'scripts': [
+            {'name': s.name, 'desc': s.desc, 'options': [f'--{o}' for o in s.options], 'use_python': s.use_python}
+            for s in config.scripts.values()
+        ],
+    }
+    write_json(path, index)
+
+
+def completion_index_is_current(index: Any) -> bool:
+    """Whether index was written for the config that would be loaded in the current env and CWD"""
+    if not isinstance(index, dict) or index.get('version') != SNAPSHOT_VERSION:
+        return False
+
+    # binding exports env vars - they must not leak into a full load if the index turns out to be stale
+    saved_environ = dict(os.environ)
+
+    try:
+        envvars = AppConfigEnvVarDict(envvars=[AppConfigEnvVar(**ev) for ev in index['envvars']])
+        if ConfigSources(binds=index['binds'], sources=index['sources'], listings=index['listings']).is_current(envvars):
+            return True
+    except (KeyError, TypeError) as e:
+        logging.debug(f'ignoring invalid completion index: {e}')
+
+    _restore_environ(saved_environ)
+    return False
+
+
+def _load_snapshot(path: Path) -> Optional[AppConfig]:
+    snapshot = read_json(path)
+    if not isinstance(snapshot, dict) or snapshot.get('version') != SNAPSHOT_VERSION:
+        return None
+
+    # binding exports env vars - they must not leak into a full load if the snapshot turns out to be stale
+    saved_environ = dict(os.environ)
+
+    try:
+        envvars = AppConfigEnvVarDict(envvars=[AppConfigEnvVar(**ev) for ev in snapshot['envvars']])
+        sources = ConfigSources(binds=snapshot['binds'], sources=snapshot['sources'], listings=snapshot['listings'])
+
+        if sources.is_current(envvars):
+            scripts = {s['name']: AppConfigScript(**s) for s in snapshot['scripts']}
+            return AppConfig(envvars, scripts, sources, snapshot['resources'])
+    except (KeyError, TypeError) as e:
+        logging.debug(f'ignoring invalid config snapshot {path}: {e}')
+
+    _restore_environ(saved_environ)
+    return None
+
+
+def member_config(config: AppConfig) -> AppConfig:
+    """config for a workspace member in the CWD (and $PWD) - its own `.uvextras` level merged on top"""
+    for name in config.envvars.exported():
+        os.environ.pop(name, None)
+
+    envvars = config.envvars.unbound()
+    member = AppConfig(envvars, copy.deepcopy(config.scripts), resources=copy.deepcopy(config.resources))
+
+    local_config, local_scripts = envvars[UVEX_LOCALCONFIG], envvars[UVEX_LOCALSCRIPTS]
+    if os.path.exists(local_config):
+        member.merge(load_config_for(local_config, envvars.refresh), scripts_dir=local_scripts)
+    member.merge_scripts(local_scripts, desc='merged from local')
+
+    return member
+
+
+def _restore_environ(saved_environ: dict[str, str]) -> None:
+    os.environ.clear()
+    os.environ.update(saved_environ)
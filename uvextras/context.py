@@ -1,11 +1,12 @@
 import argparse
 import logging
+import os
 from dataclasses import dataclass
+from functools import cached_property
+from typing import Optional
 
-from rich.logging import RichHandler
-from rich.pretty import pprint
-
-from uvextras.config import AppConfig
+from uvextras.config import UVEX_LOCALDIR, AppConfig
+from uvextras.paths import PathRewriter
 
 
 @dataclass
@@ -24,10 +25,34 @@ class AppContext:
     def all(self) -> bool:
         return self.args.all if hasattr(self.args, 'all') else False
 
+    @property
+    def artifacts(self) -> Optional[str]:
+        return self.args.artifacts if hasattr(self.args, 'artifacts') else None
+
+    @property
+    def artifacts_link(self) -> bool:
+        return self.args.artifacts_link if hasattr(self.args, 'artifacts_link') else False
+
+    @property
+    def debounce(self) -> float:
+        return self.args.debounce if hasattr(self.args, 'debounce') else 0.2
+
     @property
     def details(self) -> bool:
         return self.args.details if hasattr(self.args, 'details') else False
 
+    @property
+    def each(self) -> bool:
+        return self.args.each if hasattr(self.args, 'each') else False
+
+    @property
+    def force(self) -> bool:
+        return self.args.force if hasattr(self.args, 'force') else False
+
+    @property
+    def format(self) -> str:
+        return self.args.format if hasattr(self.args, 'format') else 'table'
+
     @property
     def hide_locations(self) -> bool:
         return self.args.locations if hasattr(self.args, 'locations') else False
@@ -40,28 +65,106 @@ class AppContext:
     def hide_uv(self) -> bool:
         return self.args.info if hasattr(self.args, 'info') else False
 
+    @property
+    def history(self) -> bool:
+        """Whether runs are recorded - only in projects that have a `.uvextras` dir, so that no state dir is created elsewhere"""
+        enabled = self.args.history if hasattr(self.args, 'history') else os.environ.get('UVEX_HISTORY', '1') != '0'
+        return enabled and bool(self.config.envvars[UVEX_LOCALDIR])
+
+    @property
+    def jobs(self) -> int:
+        jobs = self.args.jobs if hasattr(self.args, 'jobs') else None
+        if jobs is None:
+            # the members of a workspace are independent of each other
+            return (os.cpu_count() or 1) if self.each else 1
+        return jobs
+
+    @property
+    def lock(self) -> bool:
+        return self.args.lock if hasattr(self.args, 'lock') else False
+
+    @property
+    def names(self) -> list[str]:
+        return self.args.names if hasattr(self.args, 'names') else []
+
+    @cached_property
+    def path_rewriter(self) -> PathRewriter:
+        """Built once - the locations are resolved and checked only on first use"""
+        return PathRewriter.from_envvars(self.config.envvars)
+
+    @property
+    def refresh(self) -> bool:
+        return self.args.refresh if hasattr(self.args, 'refresh') else False
+
+    @property
+    def resources(self) -> dict[str, str]:
+        return dict(self.args.resources) if hasattr(self.args, 'resources') else {}
+
     @property
     def script(self) -> str:
         return self.args.script
 
+    @property
+    def shell(self) -> str:
+        return self.args.shell if hasattr(self.args, 'shell') else 'bash'
+
+    @property
+    def socket(self) -> Optional[str]:
+        return self.args.socket if hasattr(self.args, 'socket') else None
+
+    @property
+    def threshold(self) -> float:
+        return self.args.threshold if hasattr(self.args, 'threshold') else 20.0
+
+    @property
+    def timeout(self) -> float:
+        return self.args.timeout if hasattr(self.args, 'timeout') else 30.0
+
+    @property
+    def ttl(self) -> float:
+        return self.args.ttl if hasattr(self.args, 'ttl') else 0.0
+
     @property
     def verb(self) -> str:
         return self.args.verb
 
     @property
     def verbose(self) -> bool:
-        return self.args.verbose
+        return self.args.verbose if hasattr(self.args, 'verbose') else False
+
+    @property
+    def watch(self) -> bool:
+        return self.args.watch if hasattr(self.args, 'watch') else False
+
+    @property
+    def window(self) -> int:
+        return self.args.window if hasattr(self.args, 'window') else 10
 
     def _setup_logging(self) -> None:
         log_level = logging.DEBUG if self.verbose else logging.INFO
+
+        # rich is only imported when it will be used - it dominates startup time otherwise
+        handler: logging.Handler
+        if self.verbose:
+            from rich.logging import RichHandler
+
+            handler = RichHandler(omit_repeated_times=False, rich_tracebacks=True, tracebacks_show_locals=True)
+            log_format = '{asctime} - {module} - {funcName} - {message}'
+        else:
+            # user facing messages - where they come from is only of interest with --verbose
+            handler = logging.StreamHandler()
+            log_format = '{message}'
+
         logging.basicConfig(
             level=log_level,
-            format='{asctime} - {module} - {funcName} - {message}',
+            format=log_format,
             style='{',
-            handlers=[RichHandler(omit_repeated_times=False, rich_tracebacks=True, tracebacks_show_locals=True)],
+            handlers=[handler],
         )
 
     def log(self) -> None:
         if self.verbose:
+            from rich.pretty import pprint
+
             logging.debug(self.__class__.__name__)
             pprint(self)
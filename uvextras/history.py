@@ -0,0 +1,181 @@
+"""Run history of the scripts of a project - an SQLite db in the `.uvextras/state` dir"""
+
+import hashlib
+import logging
+import sqlite3
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Optional
+
+from uvextras.config import AppConfigEnvVarDict
+from uvextras.state import state_dir
+
+# bump along with a migration in _connect when the schema changes
+SCHEMA_VERSION = 1
+
+_schema = '''
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    script TEXT NOT NULL,
+    started REAL NOT NULL,
+    wall REAL NOT NULL,
+    user_cpu REAL,
+    sys_cpu REAL,
+    max_rss INTEGER,
+    exit_code INTEGER NOT NULL,
+    cmd_hash TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_by_script ON runs (script, started);
+'''
+
+
+@dataclass
+class ScriptRun:
+    script: str
+    # seconds since the epoch
+    started: float
+    wall: float
+    exit_code: int
+    cmd_hash: str
+    # None when the script could not be started
+    user_cpu: Optional[float] = None
+    sys_cpu: Optional[float] = None
+    # bytes
+    max_rss: Optional[int] = None
+
+    @property
+    def cpu(self) -> Optional[float]:
+        return self.user_cpu + self.sys_cpu if self.user_cpu is not None and self.sys_cpu is not None else None
+
+
+def history_file(envvars: AppConfigEnvVarDict, create: bool = True) -> Path:
+    return state_dir(envvars, create) / 'history.sqlite'
+
+
+def cmd_hash(cmd: str) -> str:
+    return hashlib.sha256(cmd.encode('utf-8')).hexdigest()[:16]
+
+
+def from_rusage(script: str, started: float, wall: float, exit_code: int, cmd: str, rusage: Any) -> ScriptRun:
+    """A run from the resource usage reported by `wait4` - ru_maxrss is in KiB on Linux, in bytes on macOS"""
+    if rusage is None:
+        return ScriptRun(script, started, wall, exit_code, cmd_hash(cmd))
+
+    max_rss = rusage.ru_maxrss if sys.platform == 'darwin' else rusage.ru_maxrss * 1024
+    return ScriptRun(script, started, wall, exit_code, cmd_hash(cmd), rusage.ru_utime, rusage.ru_stime, max_rss)
+
+
+def _connect(path: Path) -> sqlite3.Connection:
+    # scripts run in parallel record concurrently - wait for the lock of another writer rather than fail
+    db = sqlite3.connect(path, timeout=10)
+    if db.execute('PRAGMA user_version').fetchone()[0] < SCHEMA_VERSION:
+        db.executescript(_schema)
+        db.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+    return db
+
+
+def record(envvars: AppConfigEnvVarDict, run: ScriptRun) -> None:
+    """Failures are logged and ignored - the history must never fail a run"""
+    try:
+        db = _connect(history_file(envvars))
+        try:
+            with db:
+                db.execute(
+                    'INSERT INTO runs (script, started, wall, user_cpu, sys_cpu, max_rss, exit_code, cmd_hash)'
+                    ' VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                    (run.script, run.started, run.wall, run.user_cpu, run.sys_cpu, run.max_rss, run.exit_code, run.cmd_hash),
+                )
+        finally:
+            db.close()
+    except (OSError, sqlite3.Error) as e:
+        logging.warning(f'could not record the run of {run.script} in the history: {e}')
+
+
+def load_runs(path: Path, scripts: Optional[list[str]] = None) -> dict[str, list[ScriptRun]]:
+    """The recorded runs by script - oldest first. A history that cannot be read is logged and taken as empty."""
+    if not path.exists():
+        return {}
+
+    query = 'SELECT script, started, wall, exit_code, cmd_hash, user_cpu, sys_cpu, max_rss FROM runs'
+    params: list[str] = []
+    if scripts:
+        query += f' WHERE script IN ({", ".join("?" * len(scripts))})'
+        params = scripts
+
+    try:
+        db = _connect(path)
+        try:
+            rows = db.execute(query + ' ORDER BY script, started', params).fetchall()
+        finally:
+            db.close()
+    except (OSError, sqlite3.Error) as e:
+        logging.warning(f'could not read the history {path}: {e}')
+        return {}
+
+    runs: dict[str, list[ScriptRun]] = {}
+    for row in rows:
+        runs.setdefault(row[0], []).append(ScriptRun(*row))
+    return runs
+
+
+def percentile(values: list[float], p: float) -> float:
+    """Linear interpolation between the closest ranks - p in [0, 100]"""
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * p / 100
+    lower = int(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+
+@dataclass
+class ScriptStats:
+    script: str
+    runs: int
+    failed: int
+    # of the successful runs - None if there are none
+    p50: Optional[float] = None
+    p95: Optional[float] = None
+    max: Optional[float] = None
+    cpu_p50: Optional[float] = None
+    max_rss: Optional[int] = None
+    # change of the p50 of the last window of successful runs over the windows before - None without enough runs
+    trend: Optional[float] = None
+    regressed: bool = False
+    # the resolved command differs between the last run and the runs before
+    cmd_changed: bool = False
+
+
+# fewer runs than that on either side make too noisy a trend
+MIN_TREND_RUNS = 3
+
+
+def script_stats(script: str, runs: list[ScriptRun], window: int = 10, threshold: float = 0.2) -> ScriptStats:
+    """Stats of the runs of script - oldest first.
+
+    It regressed when the p50 of the last window of successful runs is more than threshold above that of up to 5 windows before.
+    """
+    stats = ScriptStats(script, runs=len(runs), failed=sum(1 for r in runs if r.exit_code != 0))
+
+    ok = [r for r in runs if r.exit_code == 0]
+    if not ok:
+        return stats
+
+    walls = [r.wall for r in ok]
+    stats.p50 = percentile(walls, 50)
+    stats.p95 = percentile(walls, 95)
+    stats.max = max(walls)
+
+    cpus = [c for r in ok if (c := r.cpu) is not None]
+    stats.cpu_p50 = percentile(cpus, 50) if cpus else None
+    stats.max_rss = max((r.max_rss for r in ok if r.max_rss is not None), default=None)
+
+    recent, baseline = ok[-window:], ok[-6 * window:-window]
+    if len(recent) >= MIN_TREND_RUNS and len(baseline) >= MIN_TREND_RUNS:
+        before = percentile([r.wall for r in baseline], 50)
+        if before > 0:
+            stats.trend = percentile([r.wall for r in recent], 50) / before - 1
+            stats.regressed = stats.trend > threshold
+
+    stats.cmd_changed = len(runs) > 1 and runs[-1].cmd_hash != runs[-2].cmd_hash
+    return stats
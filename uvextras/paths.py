@@ -0,0 +1,59 @@
+"""Path helpers that do not depend on `rich`"""
+
+import os
+import re
+from typing import Iterable, Iterator, Mapping
+
+from uvextras.config import (
+    UV_PYTHON_INSTALL_DIR,
+    UV_TOOL_DIR,
+    UVEX_HOME,
+    UVEX_LOCALDIR,
+    UVEX_LOCALSCRIPTS,
+    UVEX_SCRIPTS,
+    AppConfigEnvVarDict
+)
+
+locations = [
+    # These are in priority order -> more specific to less specific
+    UVEX_LOCALSCRIPTS,
+    UVEX_LOCALDIR,
+    UVEX_SCRIPTS,
+    UVEX_HOME,
+    UV_TOOL_DIR,
+    UV_PYTHON_INSTALL_DIR,
+]
+
+
+def replace_dir(text: str, dir: str, replacement: str) -> str:
+    return PathRewriter({dir: replacement})(text)
+
+
+class PathRewriter:
+    """Replaces dirs in text by a reference to their env var - in one pass, the longest dir matching wins"""
+
+    def __init__(self, replacements: Mapping[str, str]) -> None:
+        self._replacements = {dir: repl for dir, repl in replacements.items() if dir}
+        dirs = sorted(self._replacements, key=len, reverse=True)
+        self._re = re.compile(f'({"|".join(re.escape(d) for d in dirs)})/') if dirs else None
+
+    @classmethod
+    def from_envvars(cls, envvars: AppConfigEnvVarDict, binds: list[str] = locations) -> 'PathRewriter':
+        """For the binds (in priority order) that are existing dirs, and $HOME"""
+        replacements = {}
+        for bind in binds:
+            loc = envvars[bind]
+            if loc and loc not in replacements and os.path.isdir(loc):
+                replacements[loc] = f'${envvars.find_bind(bind).name}'
+        replacements.setdefault(os.environ['HOME'], '$HOME')
+
+        return cls(replacements)
+
+    def __call__(self, text: str) -> str:
+        if self._re is None:
+            return text
+        return self._re.sub(lambda m: f'{self._replacements[m.group(1)]}/', text)
+
+    def lines(self, lines: Iterable[str]) -> Iterator[str]:
+        """Rewrites each line as it is read - for long outputs, e.g. `uv tool list`"""
+        return map(self, lines)
@@ -0,0 +1,134 @@
+"""Resource settings of the process of a script.
+
+They are applied from uvextras to the process of the script before it execs the command - see `run.spawn`. Nothing is done
+in a forked child: uvextras runs scripts from threads, and the child of a threaded process must not run Python code.
+"""
+
+import os
+import re
+import resource
+import sys
+from dataclasses import dataclass, field
+from typing import Any, Mapping, Optional
+
+# ionice classes - as in ioprio_set(2)
+IOPRIO_CLASSES = {'realtime': 1, 'best-effort': 2, 'idle': 3}
+_IOPRIO_CLASS_SHIFT = 13
+_IOPRIO_WHO_PROCESS = 1
+_SYS_IOPRIO_SET = {'x86_64': 251, 'aarch64': 30, 'i686': 289, 'armv7l': 314, 'ppc64le': 273, 's390x': 282, 'riscv64': 30}
+
+# the settings that are rlimits - the soft limit is set, the hard one is kept
+RLIMITS = {'memory': resource.RLIMIT_AS, 'cpu-time': resource.RLIMIT_CPU, 'open-files': resource.RLIMIT_NOFILE}
+
+SETTINGS = ('nice', 'affinity', 'ionice', *RLIMITS)
+
+_size_re = re.compile(r'(\d+(?:\.\d+)?)\s*([KMGT]?)i?B?', re.IGNORECASE)
+_size_units = {'': 1, 'K': 1024, 'M': 1024**2, 'G': 1024**3, 'T': 1024**4}
+
+
+@dataclass
+class Resources:
+    nice: Optional[int] = None
+    affinity: Optional[set[int]] = None
+    # the ioprio value - class and level
+    ioprio: Optional[int] = None
+    # soft limits by rlimit
+    limits: dict[int, int] = field(default_factory=dict[int, int])
+
+    def __bool__(self) -> bool:
+        return self.nice is not None or self.affinity is not None or self.ioprio is not None or bool(self.limits)
+
+
+def parse_cpus(value: Any) -> set[int]:
+    """CPUs as a list like `0-3,8` (as for taskset -c) or a YAML list of CPU numbers"""
+    items = value if isinstance(value, list) else str(value).split(',')
+    cpus: set[int] = set()
+    for item in items:
+        first, _, last = str(item).strip().partition('-')
+        cpus.update(range(int(first), int(last or first) + 1))
+    if not cpus:
+        raise ValueError(f'no CPUs in {value!r}')
+    return cpus
+
+
+def parse_ionice(value: Any) -> int:
+    """`idle`, `best-effort` or `realtime`, optionally followed by `:level` (0 is the highest priority, 7 the lowest)"""
+    name, _, level = str(value).partition(':')
+    if name not in IOPRIO_CLASSES:
+        raise ValueError(f'unknown I/O class {name!r} - one of {", ".join(IOPRIO_CLASSES)}')
+    level_nr = int(level or (0 if name == 'idle' else 4))
+    if not 0 <= level_nr <= 7:
+        raise ValueError(f'I/O level {level_nr} is not in 0-7')
+    return IOPRIO_CLASSES[name] << _IOPRIO_CLASS_SHIFT | level_nr
+
+
+def parse_size(value: Any) -> int:
+    """Bytes from a number with an optional unit - e.g., 4096, 512M or 2GiB"""
+    if isinstance(value, int):
+        return value
+    match = _size_re.fullmatch(str(value).strip())
+    if match is None:
+        raise ValueError(f'invalid size {value!r}')
+    return int(float(match.group(1)) * _size_units[match.group(2).upper()])
+
+
+def parse_resources(settings: Mapping[str, Any]) -> Resources:
+    """Resources from the settings of the config (or the CLI) - ValueError if one is invalid or cannot be applied here"""
+    res = Resources()
+    for name, value in settings.items():
+        if value is None:
+            continue
+        try:
+            if name == 'nice':
+                res.nice = int(value)
+                if not -20 <= res.nice <= 19:
+                    raise ValueError(f'{res.nice} is not in -20-19')
+            elif name == 'affinity':
+                if not hasattr(os, 'sched_setaffinity'):
+                    raise ValueError(f'not supported on {sys.platform}')
+                res.affinity = parse_cpus(value)
+                unknown = res.affinity - os.sched_getaffinity(0)
+                if unknown:
+                    raise ValueError(f'CPUs {", ".join(map(str, sorted(unknown)))} are not available')
+            elif name == 'ionice':
+                if sys.platform != 'linux' or os.uname().machine not in _SYS_IOPRIO_SET:
+                    raise ValueError(f'not supported on {sys.platform} {os.uname().machine}')
+                res.ioprio = parse_ionice(value)
+            elif name in RLIMITS:
+                if not hasattr(resource, 'prlimit'):
+                    raise ValueError(f'not supported on {sys.platform}')
+                limit = parse_size(value) if name == 'memory' else int(value)
+                _, hard = resource.getrlimit(RLIMITS[name])
+                if hard != resource.RLIM_INFINITY and limit > hard:
+                    raise ValueError(f'{limit} exceeds the hard limit {hard}')
+                res.limits[RLIMITS[name]] = limit
+            else:
+                raise ValueError(f'unknown setting - one of {", ".join(SETTINGS)}')
+        except ValueError as e:
+            raise ValueError(f'{name}: {e}') from None
+
+    return res
+
+
+def _ioprio_set(pid: int, ioprio: int) -> None:
+    """ioprio_set(2) - there is no Python binding, so it is called by number through libc"""
+    import ctypes
+
+    libc = ctypes.CDLL(None, use_errno=True)
+    if libc.syscall(_SYS_IOPRIO_SET[os.uname().machine], _IOPRIO_WHO_PROCESS, pid, ioprio) != 0:
+        errno = ctypes.get_errno()
+        raise OSError(errno, os.strerror(errno))
+
+
+def apply(res: Resources, pid: int = 0) -> None:
+    """Apply res to the process pid (0 is this one) - OSError if a setting is refused, e.g., a lower nice level"""
+    if res.nice is not None:
+        os.setpriority(os.PRIO_PROCESS, pid, res.nice)
+    if res.affinity is not None:
+        os.sched_setaffinity(pid, res.affinity)
+    if res.ioprio is not None:
+        _ioprio_set(pid, res.ioprio)
+    for r, limit in res.limits.items():
+        # the soft limit only - the hard one is kept
+        _, hard = resource.prlimit(pid, r)
+        resource.prlimit(pid, r, (limit, hard))
@@ -4,13 +4,144 @@
 # ///
 
 import argparse
-import subprocess
+import fnmatch
+import glob
+import os
+import stat
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 
 parser = argparse.ArgumentParser()
-parser.add_argument('-i', '--items_to_delete', default='', required=True, metavar='items')
+parser.add_argument('-i', '--items_to_delete', default='', required=True, metavar='items', help='globs relative to the CWD - a trailing / only matches dirs')
+parser.add_argument('-p', '--patterns', default='__pycache__', help='globs of the dir names to delete anywhere in the tree')
+parser.add_argument('-x', '--prune', default='.git .venv node_modules', help='globs of the dir names not to descend into')
+parser.add_argument('-j', '--jobs', default=min(32, (os.cpu_count() or 1) * 4), type=int, help='subtrees to walk in parallel')
+parser.add_argument('-n', '--dry-run', default=False, action='store_true', help='only report what would be deleted')
+parser.add_argument('-v', '--verbose', default=False, action='store_true')
 args = parser.parse_args(sys.argv[1:])
 
-subprocess.call('find . -type d -name __pycache__ -exec rm -fr {} \\;', shell=True, text=True)
 
-subprocess.call(f'rm -fr {args.items_to_delete}', shell=True, text=True)
+@dataclass
+class Summary:
+    items: int = 0
+    files: int = 0
+    bytes: int = 0
+    errors: list[str] = field(default_factory=list[str])
+
+    def __iadd__(self, other: 'Summary') -> 'Summary':
+        self.items += other.items
+        self.files += other.files
+        self.bytes += other.bytes
+        self.errors += other.errors
+        return self
+
+
+def remove(path: str, summary: Summary) -> None:
+    """Delete path (a dir bottom up) - counting the files and bytes as it goes"""
+    try:
+        st = os.lstat(path)
+        if stat.S_ISDIR(st.st_mode):
+            with os.scandir(path) as it:
+                entries = list(it)
+            for e in entries:
+                remove(e.path, summary)
+            if not args.dry_run:
+                os.rmdir(path)
+        else:
+            summary.files += 1
+            summary.bytes += st.st_size
+            if not args.dry_run:
+                os.unlink(path)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        summary.errors.append(f'{path}: {e.strerror}')
+
+
+def delete(path: str) -> Summary:
+    summary = Summary(items=1)
+    if args.verbose or args.dry_run:
+        print(os.path.normpath(path))
+    remove(path, summary)
+    return summary
+
+
+def matches(name: str, globs: list[str]) -> bool:
+    return any(fnmatch.fnmatchcase(name, g) for g in globs)
+
+
+def walk(top: str, patterns: list[str], prune: list[str], skip: set[str]) -> Summary:
+    """Delete the dirs named like patterns under top - without descending into pruned ones"""
+    summary = Summary()
+    pending = [top]
+    while pending:
+        dir = pending.pop()
+        try:
+            with os.scandir(dir) as it:
+                subdirs = [e for e in it if e.is_dir(follow_symlinks=False)]
+        except OSError as e:
+            summary.errors.append(f'{dir}: {e.strerror}')
+            continue
+
+        for e in subdirs:
+            if e.path in skip or matches(e.name, prune):
+                continue
+            if matches(e.name, patterns):
+                summary += delete(e.path)
+            else:
+                pending.append(e.path)
+    return summary
+
+
+def expand(items: list[str]) -> list[str]:
+    """The paths matching the items - like the shell would, without a match an item is ignored"""
+    paths: dict[str, None] = {}
+    for item in items:
+        for path in glob.glob(item.rstrip('/') or item):
+            if not item.endswith('/') or os.path.isdir(path):
+                paths[os.path.normpath(path)] = None
+    return list(paths)
+
+
+def human(size: float) -> str:
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if size < 1024:
+            break
+        size /= 1024
+    return f'{size:.1f} {unit}' if unit != 'B' else f'{int(size)} B'
+
+
+patterns = args.patterns.split()
+prune = args.prune.split()
+items = expand(args.items_to_delete.split())
+
+summary = Summary()
+with ThreadPoolExecutor(max_workers=max(args.jobs, 1)) as pool:
+    futures = [pool.submit(delete, path) for path in items]
+
+    # the items are being deleted by other workers - the walk must not descend into them
+    skip = {os.path.join('.', p) for p in items}
+    top_dirs = []
+    with os.scandir('.') as it:
+        for e in it:
+            if not e.is_dir(follow_symlinks=False) or e.path in skip or matches(e.name, prune):
+                continue
+            if matches(e.name, patterns):
+                futures.append(pool.submit(delete, e.path))
+            else:
+                top_dirs.append(e.path)
+
+    # each top level subtree is walked by its own worker
+    futures += [pool.submit(walk, d, patterns, prune, skip) for d in top_dirs]
+
+    for f in futures:
+        summary += f.result()
+
+for error in summary.errors:
+    print(f'error: {error}', file=sys.stderr)
+
+verb = 'Would delete' if args.dry_run else 'Deleted'
+print(f'{verb} {summary.items} item(s) - {summary.files} file(s), {human(summary.bytes)}')
+
+sys.exit(1 if summary.errors else 0)
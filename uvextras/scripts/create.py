@@ -1,32 +1,127 @@
 # /// script
 # requires-python = ">=3.14"
-# dependencies = []
+# dependencies = ["packaging"]
 # ///
 
 import argparse
+import hashlib
+import json
 import os
+import shutil
 import subprocess
 import sys
+import tomllib
+from pathlib import Path
+from typing import Any, Optional
+
+from packaging.specifiers import InvalidSpecifier, SpecifierSet
+from packaging.version import InvalidVersion, Version
 
 parser = argparse.ArgumentParser()
+parser.add_argument('-f', '--force', default=False, action='store_true', help='re-create .venv even if it is up to date')
 parser.add_argument('-s', '--with-system', default=False, action='store_true')
 parser.add_argument('-v', '--verbose', default=False, action='store_true')
 args = parser.parse_args(sys.argv[1:])
 
+VENV = Path('.venv')
+# what .venv was last synced from - written by this script
+STAMP = VENV / '.uvextras-create.json'
+
 # prevent warning that VIRTUAL_ENV is different
-del os.environ['VIRTUAL_ENV']
-
-cmd = 'rm -fr .venv'
-if args.verbose:
-    print(f'{cmd}')
-subprocess.call(f'{cmd}', shell=True, text=True)
-
-cmd = f'uv venv{" --system-site-packages" if args.with_system else ""}'
-if args.verbose:
-    print(f'{cmd}')
-subprocess.call(f'{cmd}', shell=True, text=True)
-
-cmd = 'uv sync --frozen'
-if args.verbose:
-    print(f'{cmd}')
-subprocess.call(f'{cmd}', shell=True, text=True)
+os.environ.pop('VIRTUAL_ENV', None)
+
+
+def run(cmd: str) -> None:
+    if args.verbose:
+        print(f'{cmd}')
+    rc = subprocess.call(f'{cmd}', shell=True, text=True)
+    if rc != 0:
+        sys.exit(rc)
+
+
+def read_pyvenv_cfg() -> dict[str, str]:
+    try:
+        lines = (VENV / 'pyvenv.cfg').read_text().splitlines()
+    except OSError:
+        return {}
+    return {k.strip(): v.strip() for k, _, v in (ln.partition('=') for ln in lines) if v}
+
+
+def lock_digest() -> Optional[str]:
+    try:
+        with open('uv.lock', 'rb') as f:
+            return hashlib.file_digest(f, 'sha256').hexdigest()
+    except OSError:
+        return None
+
+
+def read_stamp() -> dict[str, Any]:
+    try:
+        return json.loads(STAMP.read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def requires_python() -> Optional[str]:
+    try:
+        with open('pyproject.toml', 'rb') as f:
+            return tomllib.load(f).get('project', {}).get('requires-python')
+    except (OSError, tomllib.TOMLDecodeError):
+        return None
+
+
+def satisfies(version: str, specifiers: str) -> bool:
+    """Whether version satisfies requires-python - one that cannot be read is reported and ignored"""
+    try:
+        # virtualenv writes the version_info as, e.g., 3.12.1.final.0
+        return SpecifierSet(specifiers).contains(Version('.'.join(version.split('.')[:3])), prereleases=True)
+    except (InvalidSpecifier, InvalidVersion) as e:
+        print(f'Ignoring requires-python {specifiers}: {e}')
+        return True
+
+
+def drift(cfg: dict[str, str]) -> Optional[str]:
+    """Why .venv has to be re-created - None if it can be reused"""
+    if not cfg:
+        return 'no .venv'
+
+    home = cfg.get('home')
+    if home is None or not os.path.isdir(home):
+        return f'python home {home} is gone'
+
+    version = cfg.get('version_info', cfg.get('version', ''))
+    try:
+        pinned = Path('.python-version').read_text().split()[0]
+    except (OSError, IndexError):
+        pinned = None
+    if pinned is not None:
+        if pinned[0].isdigit() and not (version == pinned or version.startswith(f'{pinned}.')):
+            return f'python {version} does not match .python-version {pinned}'
+    else:
+        # without a pin, uv picks a python that satisfies requires-python
+        requires = requires_python()
+        if requires is not None and not satisfies(version, requires):
+            return f'python {version} does not match requires-python {requires}'
+
+    with_system = cfg.get('include-system-site-packages', 'false').lower() == 'true'
+    if with_system != args.with_system:
+        return f'--with-system was {"set" if with_system else "not set"}'
+
+    return None
+
+
+reason = 'forced' if args.force else drift(read_pyvenv_cfg())
+if reason is not None:
+    print(f'Creating .venv - {reason}')
+    if args.verbose:
+        print('rm -fr .venv')
+    shutil.rmtree(VENV, ignore_errors=True)
+    run(f'uv venv{" --system-site-packages" if args.with_system else ""}')
+else:
+    digest = lock_digest()
+    if digest is not None and read_stamp().get('lock') == digest:
+        print('.venv is up to date')
+        sys.exit(0)
+
+run('uv sync --frozen')
+STAMP.write_text(json.dumps({'lock': lock_digest()}))
@@ -5,14 +5,47 @@
 
 import argparse
 import os
+import re
 import subprocess
 import sys
+import tomllib
 
 parser = argparse.ArgumentParser()
 parser.add_argument('--pkgs', default='autopep8 flake8', action='store')
+parser.add_argument('-f', '--force', default=False, action='store_true', help='add all pkgs even if already in the dev group')
 args = parser.parse_args(sys.argv[1:])
 
 # prevent warning that VIRTUAL_ENV is different
-del os.environ['VIRTUAL_ENV']
+os.environ.pop('VIRTUAL_ENV', None)
 
-subprocess.call(f'uv add --group dev {args.pkgs}', shell=True, text=True)
+
+def normalized_name(requirement: str) -> str:
+    """The distribution name of a requirement - normalized as in PEP 503"""
+    match = re.match(r'\s*([A-Za-z0-9][A-Za-z0-9._-]*)', requirement)
+    name = match.group(1) if match else requirement
+    return re.sub(r'[-_.]+', '-', name).lower()
+
+
+def dev_group() -> set[str]:
+    try:
+        with open('pyproject.toml', 'rb') as f:
+            pyproject = tomllib.load(f)
+    except (OSError, tomllib.TOMLDecodeError):
+        return set()
+
+    requirements = pyproject.get('dependency-groups', {}).get('dev', [])
+    requirements += pyproject.get('tool', {}).get('uv', {}).get('dev-dependencies', [])
+    # include-group tables are not requirements
+    return {normalized_name(r) for r in requirements if isinstance(r, str)}
+
+
+pkgs = args.pkgs.split()
+if not args.force:
+    present = dev_group()
+    pkgs = [p for p in pkgs if normalized_name(p) not in present]
+
+if not pkgs:
+    print('dev group is up to date')
+    sys.exit(0)
+
+sys.exit(subprocess.call(f'uv add --group dev {" ".join(pkgs)}', shell=True, text=True))
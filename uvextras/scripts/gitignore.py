@@ -4,25 +4,114 @@
 # ///
 
 import argparse
+import hashlib
 import os
 import subprocess
 import sys
+import tempfile
+from pathlib import Path
+from typing import Optional
 
 parser = argparse.ArgumentParser()
-parser.add_argument('-a', '--addons', default=None, type=str, action='store')
-parser.add_argument('-f', '--features', default='python', action='store')
+parser.add_argument('-a', '--addons', default=None, type=str, action='store', help='comma separated patterns appended after the features')
+parser.add_argument('-f', '--features', default='python', action='store', help='comma separated template names')
+parser.add_argument('-u', '--update', default=False, action='store_true', help='fetch the features with `git ignore` into the user store first')
 args = parser.parse_args(sys.argv[1:])
 
-if os.path.exists('.gitignore'):
-    os.unlink('.gitignore')
 
-cmd = f'git ignore {args.features}'
-subprocess.call(f'{cmd}', shell=True, text=True)
+def user_store() -> Path:
+    """Templates fetched with --update or added by hand - they take precedence over the bundled ones"""
+    if 'UVEX_CACHE_DIR' in os.environ:
+        return Path(os.environ['UVEX_CACHE_DIR']) / 'gitignore'
 
-with open(".gitignore", "a") as gi:
-    gi.write('\n')
+    xdg_cache = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return Path(xdg_cache) / 'uvextras' / 'gitignore'
 
-    if args.addons is not None:
-        print(f'{args.addons=}')
-        add_on_lines = [f'{ao}\n' for ao in args.addons.split(',')]
-        gi.writelines(add_on_lines)
+
+stores = [user_store(), Path(__file__).parent / 'gitignore-templates']
+
+
+def fetch(feature: str) -> Optional[str]:
+    """The template from `git ignore` - the alias writes .gitignore in the CWD or prints it"""
+    with tempfile.TemporaryDirectory() as tmp:
+        proc = subprocess.run(f'git ignore {feature}', shell=True, cwd=tmp, capture_output=True, text=True)
+        if proc.returncode != 0:
+            print(f'git ignore {feature} failed: {proc.stderr.strip()}', file=sys.stderr)
+            return None
+        path = Path(tmp) / '.gitignore'
+        return path.read_text() if path.exists() else proc.stdout
+
+
+def update(feature: str) -> None:
+    text = fetch(feature)
+    if text:
+        path = stores[0] / f'{feature}.gitignore'
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f'.{path.name}.{os.getpid()}')
+        tmp.write_text(text)
+        tmp.replace(path)
+
+
+def template(feature: str) -> Optional[str]:
+    for store in stores:
+        try:
+            return (store / f'{feature}.gitignore').read_text()
+        except OSError:
+            continue
+    return None
+
+
+def compose(sections: list[tuple[str, list[str]]]) -> str:
+    """The sections with repeated patterns left out - the first occurrence wins.
+
+    A pattern is only left out if it was seen since the last switch between ignoring and negated patterns - one in between
+    may have changed whether its paths are ignored, e.g., the second `*.log` in `*.log`, `!keep.log`, `*.log` is kept.
+    """
+    seen: set[str] = set()
+    negated = False
+    lines: list[str] = []
+    for title, section in sections:
+        lines += ['', f'### {title} ###']
+        for line in section:
+            pattern = line.strip()
+            if pattern and not pattern.startswith('#'):
+                if pattern in seen:
+                    continue
+                if pattern.startswith('!') != negated:
+                    negated = not negated
+                    seen.clear()
+                seen.add(pattern)
+            # at most one blank line in a row
+            if pattern or lines[-1]:
+                lines.append(line.rstrip())
+
+    return '\n'.join(lines).strip('\n') + '\n'
+
+
+features = [f.strip() for f in args.features.split(',') if f.strip()]
+if args.update:
+    for feature in features:
+        update(feature)
+
+sections = []
+versions = []
+for feature in features:
+    text = template(feature)
+    if text is None:
+        print(f'No template for {feature} in {", ".join(str(s) for s in stores)} - try --update', file=sys.stderr)
+        sys.exit(1)
+
+    versions.append(f'{feature}@{hashlib.sha256(text.encode()).hexdigest()[:12]}')
+    sections.append((feature, text.splitlines()))
+
+if args.addons is not None:
+    sections.append(('addons', [a.strip() for a in args.addons.split(',')]))
+
+text = f'# generated by `uvextras run gitignore` from {" ".join(versions)}\n\n' + compose(sections)
+
+gitignore = Path('.gitignore')
+if gitignore.exists() and gitignore.read_text() == text:
+    print('.gitignore is up to date')
+else:
+    gitignore.write_text(text)
+    print(f'.gitignore written from {" ".join(versions)}')
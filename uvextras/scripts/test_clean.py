@@ -0,0 +1,63 @@
+import subprocess
+import sys
+from pathlib import Path
+
+clean_py = Path(__file__).parent / 'clean.py'
+
+
+def clean(cwd: Path, *args: str) -> subprocess.CompletedProcess[str]:
+    # the script parses sys.argv when it is loaded - run it as uvextras does
+    return subprocess.run([sys.executable, str(clean_py), *args], cwd=cwd, capture_output=True, text=True)
+
+
+def make_tree(root: Path) -> None:
+    for dir in ('build', 'pkg/__pycache__', 'pkg/sub/__pycache__', '.venv/lib/__pycache__', '.git/__pycache__'):
+        (root / dir).mkdir(parents=True)
+        (root / dir / 'f.pyc').write_bytes(b'x' * 10)
+
+
+def test_clean_deletes_items_and_patterns_without_descending_into_pruned_dirs(tmp_path) -> None:
+    make_tree(tmp_path)
+
+    result = clean(tmp_path, '-i', 'build/ missing/')
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.splitlines()[-1] == 'Deleted 3 item(s) - 3 file(s), 30 B'
+
+    assert not (tmp_path / 'build').exists()
+    assert not (tmp_path / 'pkg' / '__pycache__').exists()
+    assert not (tmp_path / 'pkg' / 'sub' / '__pycache__').exists()
+    assert (tmp_path / 'pkg' / 'sub').is_dir()
+    assert (tmp_path / '.venv' / 'lib' / '__pycache__' / 'f.pyc').exists()
+    assert (tmp_path / '.git' / '__pycache__' / 'f.pyc').exists()
+
+
+def test_clean_dry_run_counts_without_deleting(tmp_path) -> None:
+    make_tree(tmp_path)
+
+    result = clean(tmp_path, '-i', 'build/', '--dry-run')
+    assert result.returncode == 0, result.stderr
+    lines = result.stdout.splitlines()
+    assert sorted(lines[:-1]) == ['build', 'pkg/__pycache__', 'pkg/sub/__pycache__']
+    assert lines[-1] == 'Would delete 3 item(s) - 3 file(s), 30 B'
+    assert (tmp_path / 'build' / 'f.pyc').exists()
+    assert (tmp_path / 'pkg' / '__pycache__' / 'f.pyc').exists()
+
+
+def test_clean_does_not_follow_symlinks(tmp_path) -> None:
+    outside = tmp_path / 'outside'
+    (outside / '__pycache__').mkdir(parents=True)
+    (outside / '__pycache__' / 'f.pyc').write_bytes(b'x')
+    (outside / 'keep.txt').write_text('keep')
+    project = tmp_path / 'project'
+    (project / 'build').mkdir(parents=True)
+    (project / 'build' / 'link').symlink_to(outside, target_is_directory=True)
+    (project / 'linked').symlink_to(outside, target_is_directory=True)
+
+    result = clean(project, '-i', 'build/')
+    assert result.returncode == 0, result.stderr
+    # the link in build is deleted, not what it points to - and the walk does not go through `linked`
+    assert result.stdout.startswith('Deleted 1 item(s) - 1 file(s), ')
+    assert not (project / 'build').exists()
+    assert (outside / 'keep.txt').read_text() == 'keep'
+    assert (outside / '__pycache__' / 'f.pyc').exists()
+    assert (project / 'linked').is_symlink()
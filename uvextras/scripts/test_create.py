@@ -0,0 +1,90 @@
+import hashlib
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+create_py = Path(__file__).parent / 'create.py'
+
+
+@pytest.fixture
+def project(monkeypatch, tmp_path) -> Path:
+    """A project with a synced .venv and a fake `uv` on the PATH that logs its args to uv.log"""
+    bin = tmp_path / 'bin'
+    bin.mkdir()
+    (bin / 'uv').write_text(f'#!/bin/sh\necho "$*" >> {tmp_path}/uv.log\n[ "$1" = venv ] && mkdir -p .venv\nexit 0\n')
+    (bin / 'uv').chmod(0o755)
+    monkeypatch.setenv('PATH', f'{bin}{os.pathsep}{os.environ["PATH"]}')
+
+    project = tmp_path / 'project'
+    (project / '.venv').mkdir(parents=True)
+    (project / 'uv.lock').write_text('version = 1\n')
+    write_pyvenv_cfg(project, home=str(tmp_path), version='3.14.2')
+    lock = hashlib.sha256(b'version = 1\n').hexdigest()
+    (project / '.venv' / '.uvextras-create.json').write_text(json.dumps({'lock': lock}))
+    return project
+
+
+def write_pyvenv_cfg(project: Path, home: str, version: str) -> None:
+    (project / '.venv' / 'pyvenv.cfg').write_text(f'home = {home}\ninclude-system-site-packages = false\nversion_info = {version}\n')
+
+
+def create(project: Path, *args: str) -> tuple[str, list[str]]:
+    """The output of the script and the uv commands it ran"""
+    # the script parses sys.argv when it is loaded - run it as uvextras does
+    result = subprocess.run([sys.executable, str(create_py), *args], cwd=project, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    log = project.parent / 'uv.log'
+    return result.stdout.strip(), log.read_text().splitlines() if log.exists() else []
+
+
+def test_create_reuses_an_up_to_date_venv(project) -> None:
+    assert create(project) == ('.venv is up to date', [])
+
+
+def test_create_syncs_when_uv_lock_changed(project) -> None:
+    (project / 'uv.lock').write_text('version = 2\n')
+    assert create(project) == ('', ['sync --frozen'])
+    # synced from the new lock
+    assert create(project) == ('.venv is up to date', ['sync --frozen'])
+
+
+@pytest.mark.parametrize('setup, reason', [
+    (lambda p: write_pyvenv_cfg(p, home=str(p / 'gone'), version='3.14.2'), 'python home {}/gone is gone'),
+    (lambda p: (p / '.python-version').write_text('3.13\n'), 'python 3.14.2 does not match .python-version 3.13'),
+    (lambda p: (p / 'pyproject.toml').write_text('[project]\nrequires-python = ">=3.10,<3.14"\n'),
+     'python 3.14.2 does not match requires-python >=3.10,<3.14'),
+])
+def test_create_recreates_a_drifted_venv(project, setup, reason) -> None:
+    setup(project)
+    assert create(project) == (f'Creating .venv - {reason.format(project)}', ['venv', 'sync --frozen'])
+
+
+@pytest.mark.parametrize('requires, drifted', [
+    ('==3.14.*', False),
+    ('~=3.14.1', False),
+    ('>=3.12,!=3.13.*', False),
+    ('>=3.14.3', True),
+    ('~=3.13.0', True),
+    ('==3.13.*', True),
+])
+def test_create_checks_requires_python(project, requires, drifted) -> None:
+    (project / 'pyproject.toml').write_text(f'[project]\nrequires-python = "{requires}"\n')
+    reason = f'Creating .venv - python 3.14.2 does not match requires-python {requires}'
+    assert create(project) == ((reason, ['venv', 'sync --frozen']) if drifted else ('.venv is up to date', []))
+
+
+def test_create_keeps_a_venv_matching_the_python_pins(project) -> None:
+    (project / 'pyproject.toml').write_text('[project]\nrequires-python = "==3.14.*"\n')
+    assert create(project) == ('.venv is up to date', [])
+    # .python-version wins over requires-python
+    (project / '.python-version').write_text('3.14\n')
+    (project / 'pyproject.toml').write_text('[project]\nrequires-python = "<3.14"\n')
+    assert create(project) == ('.venv is up to date', [])
+
+
+def test_create_force_recreates_the_venv(project) -> None:
+    assert create(project, '--force') == ('Creating .venv - forced', ['venv', 'sync --frozen'])
@@ -0,0 +1,48 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+enable_dev_py = Path(__file__).parent / 'enable-dev.py'
+
+
+@pytest.fixture
+def project(monkeypatch, tmp_path) -> Path:
+    """A project with a dev group and a fake `uv` on the PATH that logs its args to uv.log"""
+    bin = tmp_path / 'bin'
+    bin.mkdir()
+    (bin / 'uv').write_text(f'#!/bin/sh\necho "$*" >> {tmp_path}/uv.log\n')
+    (bin / 'uv').chmod(0o755)
+    monkeypatch.setenv('PATH', f'{bin}{os.pathsep}{os.environ["PATH"]}')
+
+    project = tmp_path / 'project'
+    project.mkdir()
+    (project / 'pyproject.toml').write_text(
+        '[dependency-groups]\ndev = ["pytest>=8", {include-group = "lint"}]\nlint = ["flake8"]\n\n'
+        '[tool.uv]\ndev-dependencies = ["Types_PyYAML"]\n'
+    )
+    return project
+
+
+def enable_dev(project: Path, *args: str) -> tuple[str, list[str]]:
+    """The output of the script and the uv commands it ran"""
+    # the script parses sys.argv when it is loaded - run it as uvextras does
+    result = subprocess.run([sys.executable, str(enable_dev_py), *args], cwd=project, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    log = project.parent / 'uv.log'
+    return result.stdout.strip(), log.read_text().splitlines() if log.exists() else []
+
+
+def test_enable_dev_only_adds_the_missing_pkgs(project) -> None:
+    # names are compared normalized - flake8 is only in an included group
+    assert enable_dev(project, '--pkgs', 'pytest mypy types-pyyaml flake8') == ('', ['add --group dev mypy flake8'])
+
+
+def test_enable_dev_does_not_run_uv_when_the_dev_group_is_up_to_date(project) -> None:
+    assert enable_dev(project, '--pkgs', 'PyTest types.pyyaml') == ('dev group is up to date', [])
+
+
+def test_enable_dev_force_adds_all_pkgs(project) -> None:
+    assert enable_dev(project, '--pkgs', 'pytest mypy', '--force') == ('', ['add --group dev pytest mypy'])
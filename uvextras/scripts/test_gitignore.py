@@ -0,0 +1,60 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+gitignore_py = Path(__file__).parent / 'gitignore.py'
+
+
+@pytest.fixture
+def project(monkeypatch, tmp_path) -> Path:
+    """A project and a user store with the templates a and b"""
+    store = tmp_path / 'cache' / 'gitignore'
+    store.mkdir(parents=True)
+    (store / 'a.gitignore').write_text('# a\n*.pyc\n\n\nbuild/\n*.log\n!keep.log\n')
+    (store / 'b.gitignore').write_text('# b\nbuild/\n*.log\n.env\n*.pyc\n')
+    monkeypatch.setenv('UVEX_CACHE_DIR', str(tmp_path / 'cache'))
+
+    project = tmp_path / 'project'
+    project.mkdir()
+    return project
+
+
+def gitignore(project: Path, *args: str) -> str:
+    # the script parses sys.argv when it is loaded - run it as uvextras does
+    result = subprocess.run([sys.executable, str(gitignore_py), *args], cwd=project, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    return result.stdout.strip()
+
+
+def test_gitignore_composes_the_features_and_addons(project) -> None:
+    gitignore(project, '--features', 'a, b', '--addons', '*.pyc, .idea/')
+
+    header, text = (project / '.gitignore').read_text().split('\n\n', 1)
+    assert header.startswith('# generated by `uvextras run gitignore` from a@')
+    # at most one blank line in a row - the patterns repeated since the last negation are left out
+    assert text == (
+        '### a ###\n# a\n*.pyc\n\nbuild/\n*.log\n!keep.log\n\n'
+        '### b ###\n# b\nbuild/\n*.log\n.env\n*.pyc\n\n'
+        '### addons ###\n.idea/\n'
+    )
+
+
+def test_gitignore_leaves_out_patterns_repeated_within_a_run(project) -> None:
+    gitignore(project, '--features', 'b', '--addons', '.env, *.log, !a.log, !b.log, !a.log, *.log, .env')
+
+    # .env and *.log of b are left out, .env after the negations is kept - whether a negation matters is not checked
+    text = (project / '.gitignore').read_text()
+    assert text.split('### addons ###\n')[1] == '!a.log\n!b.log\n*.log\n.env\n'
+
+
+def test_gitignore_writes_only_on_change(project) -> None:
+    assert gitignore(project, '--features', 'a').startswith('.gitignore written from a@')
+    written = (project / '.gitignore').stat().st_mtime_ns
+
+    assert gitignore(project, '--features', 'a') == '.gitignore is up to date'
+    assert (project / '.gitignore').stat().st_mtime_ns == written
+
+    assert gitignore(project, '--features', 'a,b').startswith('.gitignore written from a@')
+    assert '### b ###' in (project / '.gitignore').read_text()
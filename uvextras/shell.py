@@ -1,7 +1,10 @@
 
 import subprocess
 
+from uvextras import timings
 
-def shell_cli_output(cmd: str, redirect_stderr=False) -> str:
+
+def shell_cli_output(cmd: str, redirect_stderr=False, timeout: float | None = None) -> str:
     stderr = subprocess.STDOUT if redirect_stderr else None
-    return subprocess.check_output(cmd, stderr=stderr, shell=True, encoding='utf-8', text=True).strip()
+    with timings.span('shell', 'shell', cmd=cmd):
+        return subprocess.check_output(cmd, stderr=stderr, shell=True, encoding='utf-8', text=True, timeout=timeout).strip()
@@ -0,0 +1,81 @@
+"""Project local state kept in the `.uvextras/state` dir"""
+
+import glob
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Optional
+
+from uvextras.config import UVEX_LOCALDIR, AppConfigEnvVarDict, AppConfigScript
+
+
+def state_dir(envvars: AppConfigEnvVarDict, create: bool = True) -> Path:
+    """The state dir of the project - created on demand and ignored by git"""
+    local_dir = envvars[UVEX_LOCALDIR] or os.path.join(os.getcwd(), '.uvextras')
+    path = Path(local_dir) / 'state'
+
+    if create and not path.exists():
+        path.mkdir(parents=True, exist_ok=True)
+        (path / '.gitignore').write_text('*\n')
+
+    return path
+
+
+def expand_globs(patterns: list[str], root: Optional[str] = None) -> list[str]:
+    """Sorted, de-duplicated list of the files matching patterns (relative to root)"""
+    files = {
+        f
+        for pattern in patterns
+        for f in glob.glob(pattern, root_dir=root, recursive=True)
+        if os.path.isfile(os.path.join(root or '', f))
+    }
+    return sorted(files)
+
+
+def script_stamp(script: AppConfigScript, cmd: str, script_path: Optional[Path], root: Optional[str] = None) -> str:
+    """Content hash of everything that determines the result of running the script"""
+    digest = hashlib.sha256()
+    digest.update(json.dumps({'cmd': cmd, 'env': script.env}, sort_keys=True, default=str).encode('utf-8'))
+
+    files = expand_globs(script.inputs, root)
+    if script_path is not None:
+        files.append(str(script_path))
+
+    for f in files:
+        digest.update(f.encode('utf-8') + b'\0')
+        try:
+            with open(os.path.join(root or '', f), 'rb') as fd:
+                digest.update(hashlib.file_digest(fd, 'sha256').digest())
+        except OSError:
+            digest.update(b'\0')
+
+    return digest.hexdigest()
+
+
+def outputs_exist(script: AppConfigScript, root: Optional[str] = None) -> bool:
+    return all(glob.glob(pattern, root_dir=root, recursive=True) for pattern in script.outputs)
+
+
+def _stamp_path(envvars: AppConfigEnvVarDict, name: str, create: bool = False) -> Path:
+    return state_dir(envvars, create) / 'stamps' / name.replace('/', '%')
+
+
+def read_stamp(envvars: AppConfigEnvVarDict, name: str) -> Optional[str]:
+    # only checking must not leave a state dir behind
+    try:
+        return _stamp_path(envvars, name).read_text().strip()
+    except OSError:
+        return None
+
+
+def write_stamp(envvars: AppConfigEnvVarDict, name: str, stamp: str) -> None:
+    try:
+        path = _stamp_path(envvars, name, create=True)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f'.{path.name}.{os.getpid()}')
+        tmp.write_text(f'{stamp}\n')
+        os.replace(tmp, path)
+    except OSError as e:
+        logging.warning(f'could not record stamp for {name}: {e}')
@@ -0,0 +1,104 @@
+import argparse
+import json
+import os
+
+import pytest
+
+from uvextras.artifacts import DEFAULT_MAX_MIB, ArtifactStore, artifact_key, artifact_store, output_files
+from uvextras.config import AppConfig
+from uvextras.context import AppContext
+
+
+def make_script(**kwargs):
+    config = AppConfig.from_yaml({'scripts': [{'name': 'build', 'cmd': 'make', 'use-python': False} | kwargs]})
+    return config.find_script('build')
+
+
+def test_artifact_key_depends_on_inputs_and_declaration(tmp_path) -> None:
+    (tmp_path / 'in.txt').write_text('a')
+    script = make_script(inputs=['*.txt'])
+
+    key = artifact_key(script, [], None, str(tmp_path))
+    assert artifact_key(script, [], None, str(tmp_path)) == key
+    assert artifact_key(script, ['-x'], None, str(tmp_path)) != key
+    assert artifact_key(make_script(inputs=['*.txt'], env={'A': '1'}), [], None, str(tmp_path)) != key
+
+    (tmp_path / 'in.txt').write_text('b')
+    assert artifact_key(script, [], None, str(tmp_path)) != key
+
+
+def test_store_restores_outputs_by_copy_or_link(tmp_path) -> None:
+    src = tmp_path / 'src'
+    (src / 'dist' / 'sub').mkdir(parents=True)
+    (src / 'dist' / 'sub' / 'a.whl').write_text('wheel')
+    os.chmod(src / 'dist' / 'sub' / 'a.whl', 0o444)
+    (src / 'report.xml').write_text('report')
+    os.chmod(src / 'report.xml', 0o600)
+    script = make_script(outputs=['dist/', 'report.xml'])
+
+    files = output_files(script, str(src))
+    assert files == ['dist/sub/a.whl', 'report.xml']
+
+    store = ArtifactStore(tmp_path / 'store')
+    assert not store.restore('k', str(tmp_path / 'copy'))
+    store.save('k', files, str(src))
+
+    assert store.restore('k', str(tmp_path / 'copy'))
+    assert (tmp_path / 'copy' / 'dist' / 'sub' / 'a.whl').read_text() == 'wheel'
+    assert os.stat(tmp_path / 'copy' / 'report.xml').st_mode & 0o777 == 0o600
+
+    # only the read-only output is linked
+    linked = ArtifactStore(tmp_path / 'store', link=True)
+    assert linked.restore('k', str(tmp_path / 'link'))
+    assert os.stat(tmp_path / 'link' / 'dist' / 'sub' / 'a.whl').st_nlink == 2
+    assert os.stat(tmp_path / 'link' / 'report.xml').st_nlink == 1
+    assert os.stat(tmp_path / 'link' / 'report.xml').st_mode & 0o777 == 0o600
+
+
+def test_writing_a_restored_output_does_not_change_the_store(tmp_path) -> None:
+    src = tmp_path / 'src'
+    src.mkdir()
+    (src / 'report.xml').write_text('report')
+    (src / 'a.whl').write_text('wheel')
+    os.chmod(src / 'a.whl', 0o444)
+
+    store = ArtifactStore(tmp_path / 'store', link=True)
+    store.save('k', ['a.whl', 'report.xml'], str(src))
+    assert store.restore('k', str(tmp_path / 'out'))
+
+    (tmp_path / 'out' / 'report.xml').write_text('changed')
+    if os.geteuid() != 0:
+        # root may write to the read-only link
+        with pytest.raises(PermissionError):
+            (tmp_path / 'out' / 'a.whl').write_text('changed')
+
+    assert store.restore('k', str(tmp_path / 'again'))
+    assert (tmp_path / 'again' / 'report.xml').read_text() == 'report'
+    assert (tmp_path / 'again' / 'a.whl').read_text() == 'wheel'
+    for sha in (e['sha256'] for e in json.loads(store._manifest('k').read_text())['files']):
+        assert os.stat(store._object(sha)).st_mode & 0o777 == 0o444
+
+
+def test_artifact_store_ignores_an_invalid_size(monkeypatch, tmp_path, caplog) -> None:
+    monkeypatch.setenv('UVEX_ARTIFACT_CACHE_SIZE', '5G')
+    args = argparse.Namespace(artifacts=str(tmp_path / 'store'), artifacts_link=False, verbose=False)
+    store = artifact_store(AppContext(args, AppConfig.from_yaml({})))
+
+    assert store is not None and store.max_bytes == DEFAULT_MAX_MIB * 1024 * 1024
+    assert 'UVEX_ARTIFACT_CACHE_SIZE=5G' in caplog.text
+
+
+def test_store_evicts_least_recently_used(tmp_path) -> None:
+    src = tmp_path / 'src'
+    src.mkdir()
+    store = ArtifactStore(tmp_path / 'store', max_bytes=250)
+
+    for i, key in enumerate(('old', 'used', 'new'), 1):
+        (src / f'{key}.bin').write_bytes(bytes([i]) * 100)
+        store.save(key, [f'{key}.bin'], str(src))
+        # the mtime of a manifest is when it was last used
+        os.utime(store._manifest(key), (i, i))
+
+    assert not store.restore('old', str(tmp_path / 'out'))
+    assert store.restore('used', str(tmp_path / 'out'))
+    assert store.restore('new', str(tmp_path / 'out'))
@@ -0,0 +1,45 @@
+import datetime
+
+from uvextras.cache import cache_key, file_stamp, read_json, write_json
+
+
+def test_write_json_round_trips(tmp_path) -> None:
+    path = tmp_path / 'sub' / 'data.json'
+
+    write_json(path, {'a': [1, 2]})
+
+    assert read_json(path) == {'a': [1, 2]}
+    assert [p.name for p in path.parent.iterdir()] == ['data.json']
+
+
+def test_write_json_skips_data_json_cannot_encode(tmp_path) -> None:
+    path = tmp_path / 'data.json'
+
+    write_json(path, {'since': datetime.date(2024, 1, 1)})
+
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_read_json_returns_none_if_corrupt(tmp_path) -> None:
+    path = tmp_path / 'data.json'
+    path.write_text('{not json')
+
+    assert read_json(path) is None
+    assert read_json(tmp_path / 'missing.json') is None
+
+
+def test_file_stamp_changes_with_content(tmp_path) -> None:
+    path = tmp_path / 'file.txt'
+    assert file_stamp(path) is None
+
+    path.write_text('a')
+    before = file_stamp(path)
+    path.write_text('abc')
+
+    assert before is not None
+    assert file_stamp(path) != before
+
+
+def test_cache_key_is_stable() -> None:
+    assert cache_key('a', [1, 2], None) == cache_key('a', [1, 2], None)
+    assert cache_key('a', [1, 2]) != cache_key('a', [2, 1])
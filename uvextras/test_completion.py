@@ -0,0 +1,123 @@
+import argparse
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import uvextras.config as config_module
+from uvextras.cli import build_parser
+from uvextras.completion import GLOBAL_OPTIONS, VERB_OPTIONS, VERBS, candidates, load_index
+
+index = {
+    'scripts': [
+        {'name': 'clean', 'desc': 'cleans artifacts', 'options': ['--items_to_delete'], 'use_python': True},
+        {'name': 'check', 'desc': 'runs the checks', 'options': [], 'use_python': False},
+    ]
+}
+
+
+def complete(line: str) -> list[str]:
+    words = line.split(' ')
+    return [c for c, _ in candidates(words, len(words) - 1, lambda _: index)]
+
+
+def options_of(parser: argparse.ArgumentParser) -> dict[str, bool]:
+    return {o: a.nargs != 0 for a in parser._actions for o in a.option_strings}
+
+
+def test_options_match_the_parser() -> None:
+    parser = build_parser('')
+    verbs = next(a for a in parser._actions if isinstance(a, argparse._SubParsersAction))
+
+    assert options_of(parser) == GLOBAL_OPTIONS
+    assert {a.dest: a.help for a in verbs._choices_actions} == VERBS
+    assert {verb: options_of(p) for verb, p in verbs.choices.items()} == VERB_OPTIONS
+
+
+def test_candidates() -> None:
+    assert complete('uvextras ') == list(VERBS)
+    assert complete('uvextras --refresh r') == ['run']
+    assert complete('uvextras --tr') == ['--trace']
+    assert complete('uvextras -f ') == []
+    assert complete('uvextras run c') == ['clean', 'check']
+    assert complete('uvextras run -j 2 cl') == ['clean']
+    assert complete('uvextras run --wa') == ['--watch']
+    assert complete('uvextras run clean -- --it') == ['--items_to_delete']
+    assert complete('uvextras run clean ') == []
+    assert complete('uvextras warm clean ') == []
+    assert complete('uvextras warm ') == ['clean']
+    assert complete('uvextras completion ') == ['bash', 'zsh', 'fish']
+
+
+def test_candidates_load_the_index_of_the_config_given_with_f() -> None:
+    for line, expected in [
+        ('uvextras run ', None), ('uvextras -f a.yaml run ', 'a.yaml'), ('uvextras --trace x --file a.yaml run ', 'a.yaml'),
+        ('uvextras --file=a.yaml warm ', 'a.yaml'), ('uvextras -f a.yaml warm -j 2 ', 'a.yaml'),
+    ]:
+        load = MagicMock(return_value=index)
+        words = line.split(' ')
+        candidates(words, len(words) - 1, load)
+        load.assert_called_once_with(expected)
+
+
+def test_index_is_written_again_when_scripts_change(tmp_path, monkeypatch) -> None:
+    local_dir = tmp_path / '.uvextras'
+    (local_dir / 'scripts').mkdir(parents=True)
+    (local_dir / 'uvextras.yaml').write_text('scripts:\n  - name: hello\n    cmd: echo hello\n    use-python: false\n    desc: greets\n')
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv('PWD', str(tmp_path))
+    monkeypatch.setenv('UVEX_CACHE_DIR', str(tmp_path / 'cache'))
+
+    first = load_index()
+    assert first is not None
+    assert {'name': 'hello', 'desc': 'greets', 'options': [], 'use_python': False} in first['scripts']
+
+    (local_dir / 'scripts' / 'lint.py').write_text('')
+    assert 'lint' in [s['name'] for s in load_index()['scripts']]
+
+
+def test_index_is_written_again_when_the_config_locations_change(tmp_path, monkeypatch) -> None:
+    for name in ('a', 'b'):
+        (tmp_path / name / 'scripts').mkdir(parents=True)
+        (tmp_path / name / 'scripts' / f'{name}.py').write_text('')
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv('PWD', str(tmp_path))
+    monkeypatch.setenv('UVEX_CACHE_DIR', str(tmp_path / 'cache'))
+    monkeypatch.setenv('UVEX_LOCAL', str(tmp_path / 'a'))
+    # checking the index must not spawn `uv`
+    monkeypatch.setattr(config_module, 'shell_cli_output', MagicMock(side_effect=AssertionError('uv was run')))
+
+    def load_index_in_new_process():
+        # binding exports the env vars that were not set - the shell completes in a new process each time
+        # set first, so that monkeypatch removes them again after the test
+        for name in ('UVEX_CONFIG', 'UVEX_HOME', 'UVEX_SCRIPTS', 'UVEX_LOCAL_CONFIG', 'UVEX_LOCAL_SCRIPTS'):
+            monkeypatch.setenv(name, '')
+            monkeypatch.delenv(name)
+        return load_index()
+
+    index = load_index_in_new_process()
+    assert index is not None and index['binds']['uvexlocaldir'] == str(tmp_path / 'a')
+    assert 'a' in [s['name'] for s in index['scripts']]
+    assert load_index_in_new_process() == index
+
+    # the files of the index are unchanged - but they are no longer those of the config
+    monkeypatch.setenv('UVEX_LOCAL', str(tmp_path / 'b'))
+    names = [s['name'] for s in load_index_in_new_process()['scripts']]
+    assert 'b' in names and 'a' not in names
+
+
+def test_index_is_that_of_the_config_given_with_f(tmp_path, monkeypatch) -> None:
+    default = Path(config_module.__file__).parent / 'uvextras.yaml'
+    other = default.read_text().replace('scripts:\n', 'scripts:\n  - name: other\n    cmd: echo other\n    use-python: false\n    desc: other\n', 1)
+    (tmp_path / 'other.yaml').write_text(other)
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv('PWD', str(tmp_path))
+    monkeypatch.setenv('UVEX_CACHE_DIR', str(tmp_path / 'cache'))
+    # binding exports the env vars - set first, so that monkeypatch removes them again after the test
+    for name in ('UVEX_CONFIG', 'UVEX_HOME', 'UVEX_SCRIPTS', 'UVEX_LOCAL', 'UVEX_LOCAL_CONFIG', 'UVEX_LOCAL_SCRIPTS'):
+        monkeypatch.setenv(name, '')
+        monkeypatch.delenv(name)
+
+    assert 'other' not in [s['name'] for s in load_index()['scripts']]
+    assert 'other' in [s['name'] for s in load_index('other.yaml')['scripts']]
@@ -1,8 +1,10 @@
+import datetime
 import os
 from contextlib import contextmanager
 from unittest.mock import MagicMock
 
-from uvextras.config import AppConfigEnvVar, AppConfigEnvVarDict, resolve_envvar
+import uvextras.config as config_module
+from uvextras.config import AppConfig, AppConfigEnvVar, AppConfigEnvVarDict, resolve_envvar, uv_locations
 
 @contextmanager
 def temp_envvar(key: str, value: str):
@@ -78,6 +80,7 @@ def test_AppConfigEnvVarDict_uses_bound(monkeypatch) -> None:
     ev = AppConfigEnvVar(bind='config_module_file', name='OVERRIDE', resolve=['$PWD/uvextras/test_config.py'])
 
     evd = AppConfigEnvVarDict([ev])
+    _ = evd[ev.bind]
     assert ev.bind in evd._bound
 
     # verify that resolve_envvar was not called by mocking os.environ.keys() that is used by it
@@ -89,3 +92,145 @@ def test_AppConfigEnvVarDict_uses_bound(monkeypatch) -> None:
     mock_resolve.assert_not_called()
 
     assert bound_val == __file__
+
+
+def test_AppConfigEnvVarDict_binds_on_demand_with_dependencies(monkeypatch, tmp_path) -> None:
+    monkeypatch.setattr(os, 'environ', dict(os.environ))
+    (tmp_path / 'scripts').mkdir()
+
+    home = AppConfigEnvVar(bind='uvexhome', name='TEST_UVEX_HOME', resolve=[str(tmp_path)])
+    scripts = AppConfigEnvVar(bind='uvexscripts', name='TEST_UVEX_SCRIPTS', resolve=['$TEST_UVEX_HOME/scripts'])
+
+    evd = AppConfigEnvVarDict([scripts, home])
+    assert evd._bound == {}
+
+    assert evd['uvexscripts'] == str(tmp_path / 'scripts')
+    assert set(evd._bound) == {'uvexhome', 'uvexscripts'}
+
+
+def test_uv_locations_cached_on_disk(monkeypatch, tmp_path) -> None:
+    calls = []
+
+    def fake_shell_cli_output(cmd: str, redirect_stderr=False) -> str:
+        calls.append(cmd)
+        return f'/fake/{cmd.split()[1]}'
+
+    monkeypatch.setenv('UVEX_CACHE_DIR', str(tmp_path))
+    monkeypatch.setattr(config_module, 'shell_cli_output', fake_shell_cli_output)
+    monkeypatch.setattr(config_module, 'shutil', MagicMock(which=MagicMock(return_value=__file__)))
+
+    monkeypatch.setattr(config_module, '_uv_locations', None)
+    first = uv_locations()
+
+    monkeypatch.setattr(config_module, '_uv_locations', None)
+    second = uv_locations()
+
+    assert first == second == {'uv_python_install_dir': '/fake/python', 'uv_tool_dir': '/fake/tool'}
+    assert calls == ['uv python dir', 'uv tool dir']
+
+    # not even the in-process memo is used
+    uv_locations(refresh=True)
+
+    assert len(calls) == 4
+
+
+def test_load_config_uses_snapshot_until_sources_change(monkeypatch, tmp_path) -> None:
+    monkeypatch.setattr(os, 'environ', dict(os.environ))
+    for name in ('UVEX_HOME', 'UVEX_SCRIPTS', 'UVEX_LOCAL', 'UVEX_LOCAL_CONFIG', 'UVEX_LOCAL_SCRIPTS'):
+        os.environ.pop(name, None)
+    os.environ['UVEX_CACHE_DIR'] = str(tmp_path / 'cache')
+    os.environ['PWD'] = str(tmp_path)
+    monkeypatch.chdir(tmp_path)
+
+    parsed = []
+    load_config_for = config_module.load_config_for
+
+    def counting_load_config_for(file: str, refresh: bool = False):
+        parsed.append(file)
+        return load_config_for(file, refresh)
+
+    monkeypatch.setattr(config_module, 'load_config_for', counting_load_config_for)
+
+    # each load runs as if in a new process - binding exports the env vars
+    base_environ = dict(os.environ)
+
+    def load_config():
+        monkeypatch.setattr(os, 'environ', dict(base_environ))
+        return config_module.load_config()
+
+    first = load_config()
+    second = load_config()
+
+    assert len(parsed) == 1
+    assert list(second.scripts) == list(first.scripts)
+
+    # creating a local config invalidates the snapshot
+    (tmp_path / '.uvextras' / 'scripts').mkdir(parents=True)
+    (tmp_path / '.uvextras' / 'uvextras.yaml').write_text('scripts:\n  - name: hello\n    cmd: echo hello\n    use-python: false\n')
+
+    third = load_config()
+
+    assert len(parsed) == 3
+    assert third.find_script('hello') is not None
+
+    # as does adding a local script
+    (tmp_path / '.uvextras' / 'scripts' / 'lint.py').write_text('')
+
+    fourth = load_config()
+
+    assert len(parsed) == 5
+    assert fourth.find_script('lint') is not None
+    assert load_config().find_script('lint') is not None
+    assert len(parsed) == 5
+
+
+def test_load_config_without_snapshot_for_values_json_cannot_encode(monkeypatch, tmp_path) -> None:
+    monkeypatch.setattr(os, 'environ', dict(os.environ))
+    for name in ('UVEX_HOME', 'UVEX_SCRIPTS', 'UVEX_LOCAL', 'UVEX_LOCAL_CONFIG', 'UVEX_LOCAL_SCRIPTS'):
+        os.environ.pop(name, None)
+    os.environ['UVEX_CACHE_DIR'] = str(tmp_path / 'cache')
+    os.environ['PWD'] = str(tmp_path)
+    monkeypatch.chdir(tmp_path)
+
+    # YAML loads the value as a date
+    (tmp_path / '.uvextras').mkdir()
+    (tmp_path / '.uvextras' / 'uvextras.yaml').write_text('scripts:\n  - name: hello\n    cmd: echo\n    env:\n      SINCE: 2024-01-01\n')
+
+    config = config_module.load_config()
+
+    assert config.find_script('hello').env == {'SINCE': datetime.date(2024, 1, 1)}
+    assert not list((tmp_path / 'cache' / 'config').glob('*.tmp'))
+    _, config_file = resolve_envvar(AppConfigEnvVarDict.config_ev())
+    assert not config_module.snapshot_file(config_file).exists()
+
+
+def test_load_config_merges_levels_up_to_repo_root(monkeypatch, tmp_path) -> None:
+    repo = tmp_path / 'repo'
+    pkg = repo / 'packages' / 'pkg'
+    for d in (repo / '.git', repo / '.uvextras' / 'scripts', pkg / '.uvextras' / 'scripts'):
+        d.mkdir(parents=True)
+    (repo / '.uvextras' / 'uvextras.yaml').write_text('scripts:\n  - name: fmt\n    cmd: ruff format\n    use-python: false\n')
+    (repo / '.uvextras' / 'scripts' / 'lint.py').write_text('')
+    (repo / '.uvextras' / 'scripts' / 'test.py').write_text('')
+    (pkg / '.uvextras' / 'scripts' / 'lint.py').write_text('')
+
+    monkeypatch.setattr(os, 'environ', dict(os.environ))
+    for name in ('UVEX_HOME', 'UVEX_SCRIPTS', 'UVEX_LOCAL', 'UVEX_LOCAL_CONFIG', 'UVEX_LOCAL_SCRIPTS'):
+        os.environ.pop(name, None)
+    os.environ['UVEX_CACHE_DIR'] = str(tmp_path / 'cache')
+    os.environ['PWD'] = str(pkg)
+    monkeypatch.chdir(pkg)
+
+    config = config_module.load_config(refresh=True)
+
+    assert config.find_script('fmt') is not None
+    assert config.find_script('lint').scripts_dir == str(pkg / '.uvextras' / 'scripts')
+    assert config.find_script('test').path(config.envvars) == repo / '.uvextras' / 'scripts' / 'test.py'
+
+
+def test_from_yaml_treats_empty_resources_as_none() -> None:
+    # `resources:` without settings is None in YAML
+    config = AppConfig.from_yaml({'resources': None, 'scripts': [{'name': 'build', 'resources': None}]})
+
+    assert config.resources == {}
+    assert config.find_script('build').resources == {}
@@ -0,0 +1,39 @@
+import logging
+
+from uvextras.history import ScriptRun, load_runs, percentile, script_stats
+
+
+def runs(*walls: float, exit_code: int = 0) -> list[ScriptRun]:
+    return [ScriptRun('test', started=i, wall=w, exit_code=exit_code, cmd_hash='a') for i, w in enumerate(walls)]
+
+
+def test_percentile_interpolates() -> None:
+    assert percentile([3.0], 95) == 3.0
+    assert percentile([4.0, 1.0, 3.0, 2.0], 50) == 2.5
+    assert percentile([float(i) for i in range(101)], 95) == 95.0
+
+
+def test_script_stats_flags_regression() -> None:
+    stats = script_stats('test', runs(1.0, 1.1, 0.9, 1.0, 1.6, 1.5, 1.7), window=3, threshold=0.2)
+
+    assert stats.runs == 7 and stats.failed == 0
+    assert stats.max == 1.7
+    assert stats.trend is not None and round(stats.trend, 2) == 0.6
+    assert stats.regressed
+
+
+def test_script_stats_ignores_failures_and_needs_enough_runs() -> None:
+    stats = script_stats('test', runs(1.0, 1.0, 5.0) + runs(9.0, exit_code=1), window=3)
+
+    assert stats.failed == 1
+    assert stats.max == 5.0
+    assert stats.trend is None and not stats.regressed
+
+
+def test_load_runs_logs_a_history_it_cannot_read(tmp_path, caplog) -> None:
+    path = tmp_path / 'history.sqlite'
+    path.write_bytes(b'not a db' * 100)
+
+    with caplog.at_level(logging.WARNING):
+        assert load_runs(path) == {}
+    assert f'could not read the history {path}' in caplog.text
@@ -0,0 +1,33 @@
+import resource
+
+import pytest
+
+from uvextras.resources import IOPRIO_CLASSES, parse_cpus, parse_ionice, parse_resources, parse_size
+
+
+def test_parse_cpus() -> None:
+    assert parse_cpus('0-2,5') == {0, 1, 2, 5}
+    assert parse_cpus([1, 3]) == {1, 3}
+    assert parse_cpus(0) == {0}
+
+
+def test_parse_ionice_and_size() -> None:
+    assert parse_ionice('idle') == IOPRIO_CLASSES['idle'] << 13
+    assert parse_ionice('best-effort:7') == IOPRIO_CLASSES['best-effort'] << 13 | 7
+    assert parse_size('512M') == 512 * 1024**2
+    assert parse_size('2GiB') == 2 * 1024**3
+    assert parse_size(4096) == 4096
+
+
+def test_parse_resources() -> None:
+    res = parse_resources({'nice': 10, 'open-files': '64', 'memory': None})
+
+    assert res.nice == 10
+    assert res.limits == {resource.RLIMIT_NOFILE: 64}
+    assert not parse_resources({})
+
+
+@pytest.mark.parametrize('settings', [{'nice': 20}, {'ionice': 'fast'}, {'memory': 'lots'}, {'priority': 1}])
+def test_parse_resources_rejects_invalid_settings(settings) -> None:
+    with pytest.raises(ValueError, match=next(iter(settings))):
+        parse_resources(settings)
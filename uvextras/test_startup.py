@@ -0,0 +1,79 @@
+import subprocess
+import sys
+from pathlib import Path
+
+# modules newly imported by `uvextras run` - raise deliberately when a new import is justified
+RUN_MODULE_BUDGET = 60
+
+_measure = '''
+import os
+import sys
+
+before = set(sys.modules)
+
+
+def write_modules():
+    with open(sys.argv[-1], 'w') as f:
+        f.write('\\n'.join(sorted(set(sys.modules) - before)))
+
+
+# the script replaces the process - record the modules right before
+_execvpe = os.execvpe
+
+
+def execvpe(*args):
+    write_modules()
+    _execvpe(*args)
+
+
+os.execvpe = execvpe
+
+from uvextras import entrypoint
+
+try:
+    entrypoint()
+finally:
+    write_modules()
+'''
+
+
+def run_modules(tmp_path: Path, args: tuple[str, ...] = ('run', 'noop', '--')) -> list[str]:
+    local_dir = tmp_path / '.uvextras'
+    local_dir.mkdir()
+    (local_dir / 'uvextras.yaml').write_text('scripts:\n  - name: noop\n    cmd: "true"\n    use-python: false\n')
+
+    out = tmp_path / 'modules.txt'
+    env = {
+        'HOME': str(tmp_path),
+        'PATH': '/usr/bin:/bin',
+        'PWD': str(tmp_path),
+        'PYTHONPATH': str(Path(__file__).parent.parent),
+        'UVEX_CACHE_DIR': str(tmp_path / 'cache'),
+    }
+    # the trailing arg is passed on to the script - it is where the module list is written
+    # the first run populates the caches - the second is the one that counts
+    for _ in range(2):
+        subprocess.run([sys.executable, '-c', _measure, *args, str(out)], cwd=tmp_path, env=env, check=True)
+
+    return out.read_text().splitlines()
+
+
+def test_run_does_not_import_rich_or_yaml(tmp_path) -> None:
+    modules = run_modules(tmp_path)
+
+    assert 'uvextras.commands.run' in modules
+    assert not [m for m in modules if m.split('.')[0] in ('rich', 'yaml')]
+    assert 'uvextras.commands.info' not in modules
+
+
+def test_run_module_budget(tmp_path) -> None:
+    modules = run_modules(tmp_path)
+
+    assert len(modules) <= RUN_MODULE_BUDGET, f'{len(modules)} modules imported'
+
+
+def test_complete_does_not_import_rich_or_yaml(tmp_path) -> None:
+    modules = run_modules(tmp_path, ('__complete', '2', 'uvextras', 'run', 'no'))
+
+    assert 'uvextras.completion' in modules
+    assert not [m for m in modules if m.split('.')[0] in ('rich', 'yaml')]
@@ -0,0 +1,14 @@
+from uvextras.config import AppConfig
+from uvextras.state import read_stamp, write_stamp
+
+
+def test_only_writing_a_stamp_creates_the_state_dir(monkeypatch, tmp_path) -> None:
+    monkeypatch.chdir(tmp_path)
+    envvars = AppConfig.from_yaml({}).envvars
+
+    assert read_stamp(envvars, 'build') is None
+    assert not (tmp_path / '.uvextras').exists()
+
+    write_stamp(envvars, 'build', 'abc')
+    assert read_stamp(envvars, 'build') == 'abc'
+    assert (tmp_path / '.uvextras' / 'state' / '.gitignore').exists()
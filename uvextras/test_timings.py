@@ -0,0 +1,39 @@
+import io
+import json
+
+from uvextras import timings
+
+
+def test_span_records_nothing_when_disabled(monkeypatch) -> None:
+    monkeypatch.setattr(timings, '_enabled', False)
+    monkeypatch.setattr(timings, '_spans', [])
+
+    with timings.span('phase') as args:
+        args['result'] = 1
+
+    assert timings._spans == []
+
+
+def test_report_prints_nested_spans_and_writes_trace(monkeypatch, tmp_path) -> None:
+    trace = tmp_path / 'trace.json'
+    monkeypatch.setattr(timings, '_enabled', False)
+    monkeypatch.setattr(timings, '_trace_file', None)
+    monkeypatch.setattr(timings, '_spans', [])
+    timings.enable(trace_file=str(trace))
+
+    with timings.span('outer'):
+        with timings.span('inner', 'script', cmd='true') as args:
+            args['exit_code'] = 0
+
+    out = io.StringIO()
+    timings.report(file=out)
+
+    lines = out.getvalue().splitlines()
+    assert lines[1].endswith('  outer')
+    assert lines[2].endswith('    inner  cmd=true exit_code=0')
+    assert 'script: ' in lines[3]
+
+    events = json.loads(trace.read_text())['traceEvents']
+    assert [(e['name'], e['cat'], e['ph']) for e in events] == [('outer', 'uvextras', 'X'), ('inner', 'script', 'X')]
+    assert events[1]['args'] == {'cmd': 'true', 'exit_code': '0'}
+    assert timings._spans == []
@@ -0,0 +1,44 @@
+import sys
+
+import pytest
+
+from uvextras.watch import ALWAYS_IGNORED, InotifyWatcher, PathFilter, PollingWatcher, wait_for_changes
+
+
+def test_path_filter_applies_globs_and_ignores() -> None:
+    filter = PathFilter(['src/**/*.py', 'pyproject.toml'], ALWAYS_IGNORED + ['build/', '*.egg-info/', 'coverage.xml'])
+
+    assert filter.matches('src/pkg/mod.py')
+    assert filter.matches('pyproject.toml')
+    assert not filter.matches('src/pkg/data.txt')
+    assert not filter.matches('src/__pycache__/mod.py')
+    assert not filter.matches('build/src/mod.py')
+    assert filter.ignores_dir('pkg.egg-info')
+    assert filter.ignores_dir('.uvextras/state')
+    assert PathFilter([], ['coverage.xml']).matches('README.md')
+    assert not PathFilter([], ['coverage.xml']).matches('coverage.xml')
+
+
+watchers = [PollingWatcher]
+if sys.platform == 'linux':
+    watchers.append(InotifyWatcher)
+
+
+@pytest.mark.parametrize('watcher_type', watchers)
+def test_watcher_reports_changes_in_new_dirs(watcher_type, tmp_path) -> None:
+    (tmp_path / 'build').mkdir()
+    watcher = watcher_type(str(tmp_path), PathFilter(['**/*.py'], ['build/']))
+    try:
+        assert watcher.wait(0.1) == set()
+
+        (tmp_path / 'pkg' / 'sub').mkdir(parents=True)
+        (tmp_path / 'pkg' / 'sub' / 'mod.py').write_text('a = 1\n')
+        (tmp_path / 'build' / 'out.py').write_text('')
+        (tmp_path / 'notes.txt').write_text('')
+
+        assert wait_for_changes(watcher, debounce=0.6, timeout=2) == {'pkg/sub/mod.py'}
+
+        (tmp_path / 'pkg' / 'sub' / 'mod.py').write_text('a = 2\n')
+        assert wait_for_changes(watcher, debounce=0.6, timeout=2) == {'pkg/sub/mod.py'}
+    finally:
+        watcher.close()
@@ -0,0 +1,14 @@
+from uvextras.workspace import workspace_members, workspace_root
+
+
+def test_workspace_members_from_root_pyproject(tmp_path) -> None:
+    (tmp_path / 'pyproject.toml').write_text(
+        '[project]\nname = "root"\n\n[tool.uv.workspace]\nmembers = ["packages/*"]\nexclude = ["packages/old"]\n'
+    )
+    for name in ('b', 'a', 'old', 'docs'):
+        (tmp_path / 'packages' / name).mkdir(parents=True)
+        if name != 'docs':
+            (tmp_path / 'packages' / name / 'pyproject.toml').write_text(f'[project]\nname = "{name}"\n')
+
+    assert workspace_root(tmp_path / 'packages' / 'a') == tmp_path
+    assert workspace_members(tmp_path) == [tmp_path, tmp_path / 'packages' / 'a', tmp_path / 'packages' / 'b']
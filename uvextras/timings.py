@@ -0,0 +1,127 @@
+"""Spans recorded for each phase of an invocation - enabled by `--timings` / `--trace` or $UVEX_TIMINGS / $UVEX_TRACE"""
+
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Iterator, Optional, TextIO
+
+
+@dataclass
+class Span:
+    name: str
+    category: str
+    start_ns: int
+    end_ns: int = 0
+    tid: int = 0
+    args: dict[str, Any] = field(default_factory=dict[str, Any])
+
+    @property
+    def duration_ms(self) -> float:
+        return (self.end_ns - self.start_ns) / 1_000_000
+
+
+_origin_ns = 0
+_spans: list[Span] = []
+_lock = threading.Lock()
+
+_enabled = False
+_trace_file: Optional[str] = None
+
+
+def reset() -> None:
+    """Start over from the env - at import and e.g., in a process forked to serve a request"""
+    global _origin_ns, _enabled, _trace_file
+
+    _origin_ns = time.perf_counter_ns()
+    _spans.clear()
+    _enabled = bool(os.environ.get('UVEX_TIMINGS') or os.environ.get('UVEX_TRACE'))
+    _trace_file = os.environ.get('UVEX_TRACE') or None
+
+
+reset()
+
+
+def enable(trace_file: Optional[str] = None) -> None:
+    global _enabled, _trace_file
+
+    _enabled = True
+    _trace_file = trace_file or _trace_file
+
+
+def enabled() -> bool:
+    return _enabled
+
+
+@contextmanager
+def span(name: str, category: str = 'uvextras', **args: Any) -> Iterator[dict[str, Any]]:
+    """Record the duration of the with block. Results (e.g., an exit code) may be added to the yielded args."""
+    if not _enabled:
+        yield args
+        return
+
+    s = Span(name=name, category=category, start_ns=time.perf_counter_ns(), tid=threading.get_ident(), args=args)
+    try:
+        yield s.args
+    finally:
+        s.end_ns = time.perf_counter_ns()
+        with _lock:
+            _spans.append(s)
+
+
+def report(file: TextIO = sys.stderr) -> None:
+    """Print the summary and write the trace file, if requested. Called once just before the process ends or execs."""
+    if not _enabled or not _spans:
+        return
+
+    spans = sorted(_spans, key=lambda s: (s.start_ns, -s.end_ns))
+    total_ms = (time.perf_counter_ns() - _origin_ns) / 1_000_000
+
+    print(f'uvextras timings - {total_ms:.1f} ms since start', file=file)
+
+    # indent spans nested in another span of the same thread, count them once in the category totals
+    open_spans: dict[int, list[Span]] = {}
+    by_category: dict[str, float] = {}
+    for s in spans:
+        stack = open_spans.setdefault(s.tid, [])
+        while stack and stack[-1].end_ns <= s.start_ns:
+            stack.pop()
+
+        args = ' '.join(f'{k}={v}' for k, v in s.args.items())
+        print(f'{s.duration_ms:10.2f} ms  {"  " * len(stack)}{s.name}  {args}'.rstrip(), file=file)
+
+        if all(o.category != s.category for o in stack):
+            by_category[s.category] = by_category.get(s.category, 0.0) + s.duration_ms
+        stack.append(s)
+
+    print('  '.join(f'{c}: {ms:.1f} ms' for c, ms in by_category.items()), file=file)
+
+    if _trace_file:
+        write_trace(_trace_file, spans)
+
+    _spans.clear()
+
+
+def write_trace(path: str, spans: list[Span]) -> None:
+    """Write the spans in the Chrome trace event format - open with chrome://tracing or https://ui.perfetto.dev"""
+    import json
+
+    pid = os.getpid()
+    events = [
+        {
+            'name': s.name,
+            'cat': s.category,
+            'ph': 'X',
+            'ts': (s.start_ns - _origin_ns) / 1000,
+            'dur': (s.end_ns - s.start_ns) / 1000,
+            'pid': pid,
+            'tid': s.tid,
+            'args': {k: str(v) for k, v in s.args.items()},
+        }
+        for s in spans
+    ]
+
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
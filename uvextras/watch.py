@@ -0,0 +1,221 @@
+"""File change detection for `uvextras run --watch` - inotify on Linux, polling elsewhere"""
+
+import fnmatch
+import glob
+import logging
+import os
+import re
+import select
+import struct
+import sys
+import time
+from typing import Optional, Protocol
+
+# dirs that never hold inputs - and the state dir that `run` itself writes to
+ALWAYS_IGNORED = ['.git/', '.venv/', '__pycache__/', '.uvextras/state/']
+
+
+class Watcher(Protocol):
+    def wait(self, timeout: Optional[float]) -> set[str]:
+        """The paths (relative to the root) changed since the last call - empty if none changed within timeout"""
+        ...
+
+    def close(self) -> None: ...
+
+
+class PathFilter:
+    """Which paths are watched - those matching the globs (all if none) and not ignored"""
+
+    def __init__(self, globs: list[str], ignore: list[str]) -> None:
+        self._globs = [re.compile(glob.translate(g, recursive=True, include_hidden=True)) for g in globs]
+        # a pattern ending with / only matches dirs, others match any path component
+        self._ignore_dirs = [p.rstrip('/') for p in ignore if p.endswith('/')]
+        self._ignore = [p for p in ignore if not p.endswith('/')]
+
+    def ignores_dir(self, rel_dir: str) -> bool:
+        name = os.path.basename(rel_dir)
+        return any(fnmatch.fnmatch(name, p) or fnmatch.fnmatch(rel_dir, p) for p in self._ignore_dirs + self._ignore)
+
+    def matches(self, rel_path: str) -> bool:
+        parts = rel_path.split(os.sep)
+        for i in range(1, len(parts)):
+            if self.ignores_dir(os.sep.join(parts[:i])):
+                return False
+        if any(fnmatch.fnmatch(parts[-1], p) or fnmatch.fnmatch(rel_path, p) for p in self._ignore):
+            return False
+
+        return not self._globs or any(g.match(rel_path) for g in self._globs)
+
+
+def walk_dirs(root: str, filter: PathFilter, start: str = '') -> list[str]:
+    """start and its sub dirs, relative to root, without descending into ignored ones"""
+    dirs = [start]
+    pending = [start]
+    while pending:
+        rel = pending.pop()
+        try:
+            with os.scandir(os.path.join(root, rel)) as it:
+                for e in it:
+                    if e.is_dir(follow_symlinks=False):
+                        sub = os.path.join(rel, e.name)
+                        if not filter.ignores_dir(sub):
+                            dirs.append(sub)
+                            pending.append(sub)
+        except OSError:
+            continue
+    return dirs
+
+
+class PollingWatcher:
+    """Compares the (mtime, size) of the files under root every interval seconds"""
+
+    def __init__(self, root: str, filter: PathFilter, interval: float = 0.5) -> None:
+        self.root = root
+        self.filter = filter
+        self.interval = interval
+        self._stamps = self._scan()
+
+    def _scan(self) -> dict[str, tuple[int, int]]:
+        stamps = {}
+        for rel in walk_dirs(self.root, self.filter):
+            try:
+                with os.scandir(os.path.join(self.root, rel)) as it:
+                    for e in it:
+                        if e.is_file(follow_symlinks=False):
+                            st = e.stat(follow_symlinks=False)
+                            stamps[os.path.join(rel, e.name)] = (st.st_mtime_ns, st.st_size)
+            except OSError:
+                continue
+        return stamps
+
+    def wait(self, timeout: Optional[float]) -> set[str]:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            stamps = self._scan()
+            changed = {p for p in stamps.keys() | self._stamps.keys() if stamps.get(p) != self._stamps.get(p)}
+            self._stamps = stamps
+
+            changed = {p for p in changed if self.filter.matches(p)}
+            if changed:
+                return changed
+
+            if deadline is not None and time.monotonic() >= deadline:
+                return set()
+            time.sleep(self.interval if deadline is None else min(self.interval, max(deadline - time.monotonic(), 0)))
+
+    def close(self) -> None:
+        pass
+
+
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_ISDIR = 0x40000000
+IN_Q_OVERFLOW = 0x00004000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+_event = struct.Struct('iIII')
+_mask = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+
+
+class InotifyWatcher:
+    """Watches each dir under root with inotify - new dirs are watched as they are created"""
+
+    def __init__(self, root: str, filter: PathFilter) -> None:
+        import ctypes
+
+        self.root = root
+        self.filter = filter
+        self._libc = ctypes.CDLL(None, use_errno=True)
+        self._fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+
+        self._dirs: dict[int, str] = {}
+        for rel in walk_dirs(root, filter):
+            self._add(rel)
+
+    def _add(self, rel: str) -> None:
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(os.path.join(self.root, rel)), _mask)
+        if wd >= 0:
+            self._dirs[wd] = rel
+
+    def _add_tree(self, rel: str) -> set[str]:
+        """Watch a new dir and its sub dirs - returns the files already created in them"""
+        files = set()
+        for sub in walk_dirs(self.root, self.filter, rel):
+            self._add(sub)
+            try:
+                with os.scandir(os.path.join(self.root, sub)) as it:
+                    files |= {os.path.join(sub, e.name) for e in it if e.is_file(follow_symlinks=False)}
+            except OSError:
+                continue
+        return {f for f in files if self.filter.matches(f)}
+
+    def _read(self) -> set[str]:
+        changed = set()
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return changed
+
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, size = _event.unpack_from(data, offset)
+            name = data[offset + _event.size : offset + _event.size + size].rstrip(b'\0').decode(errors='surrogateescape')
+            offset += _event.size + size
+
+            if mask & IN_Q_OVERFLOW:
+                # events were lost - assume everything changed
+                changed.add('')
+                continue
+
+            rel = os.path.join(self._dirs.get(wd, ''), name)
+            if mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO) and not self.filter.ignores_dir(rel):
+                    changed |= self._add_tree(rel)
+                continue
+
+            if self.filter.matches(rel):
+                changed.add(rel)
+
+        return changed
+
+    def wait(self, timeout: Optional[float]) -> set[str]:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = None if deadline is None else max(deadline - time.monotonic(), 0)
+            ready, _, _ = select.select([self._fd], [], [], remaining)
+            if not ready:
+                return set()
+
+            changed = self._read()
+            if changed:
+                return changed
+
+    def close(self) -> None:
+        os.close(self._fd)
+
+
+def make_watcher(root: str, globs: list[str], ignore: list[str]) -> Watcher:
+    filter = PathFilter(globs, ALWAYS_IGNORED + ignore)
+    if sys.platform == 'linux':
+        try:
+            return InotifyWatcher(root, filter)
+        except (OSError, AttributeError) as e:
+            logging.debug(f'inotify is not available, polling: {e}')
+    return PollingWatcher(root, filter)
+
+
+def wait_for_changes(watcher: Watcher, debounce: float, timeout: Optional[float] = None) -> set[str]:
+    """The changes once no more arrived for debounce seconds - a save often is a burst of writes"""
+    changed = watcher.wait(timeout)
+    while changed:
+        more = watcher.wait(debounce)
+        if not more:
+            break
+        changed |= more
+    return changed
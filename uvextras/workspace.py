@@ -0,0 +1,46 @@
+"""uv workspace members - as declared in `[tool.uv.workspace]` of the root `pyproject.toml`"""
+
+import glob
+import os
+import tomllib
+from pathlib import Path
+from typing import Any, Optional
+
+
+def _pyproject(dir: Path) -> dict[str, Any]:
+    try:
+        with open(dir / 'pyproject.toml', 'rb') as f:
+            return tomllib.load(f)
+    except (OSError, tomllib.TOMLDecodeError):
+        return {}
+
+
+def _workspace(pyproject: dict[str, Any]) -> Optional[dict[str, Any]]:
+    return pyproject.get('tool', {}).get('uv', {}).get('workspace')
+
+
+def workspace_root(start: Path) -> Optional[Path]:
+    """The nearest dir from start up whose pyproject.toml declares a workspace"""
+    for dir in (start, *start.parents):
+        if _workspace(_pyproject(dir)) is not None:
+            return dir
+    return None
+
+
+def workspace_members(root: Path) -> list[Path]:
+    """The member dirs - those matching members and not exclude that have a pyproject.toml.
+
+    Like for uv, the root is a member too when it has a `[project]` table.
+    """
+    pyproject = _pyproject(root)
+    workspace = _workspace(pyproject) or {}
+
+    def expand(patterns: list[str]) -> set[str]:
+        return {os.path.normpath(p) for pattern in patterns for p in glob.glob(pattern, root_dir=root)}
+
+    excluded = expand(workspace.get('exclude', []))
+    members = {m for m in expand(workspace.get('members', [])) - excluded if (root / m / 'pyproject.toml').is_file()}
+    if 'project' in pyproject:
+        members.add('.')
+
+    return [root / m if m != '.' else root for m in sorted(members)]